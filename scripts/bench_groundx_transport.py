@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""Before/after latency for the pooled GroundX transport.
+
+Starts a local stand-in for the GroundX search endpoint and runs the same
+searches through the SDK twice:
+
+  before: a fresh GroundX client per search (a new connection every time,
+          as when each tool / script built its own client)
+  after:  create_groundx_client() on the shared keep-alive pool
+
+The stand-in has no TLS certificate, so --handshake-ms adds a delay to
+every newly accepted connection to stand in for the TLS handshake round
+trips a real endpoint costs.
+
+    python scripts/bench_groundx_transport.py --requests 200 --handshake-ms 30
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+from groundx import GroundX
+
+# Repository root, so src.snl_poc imports work when the script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.snl_poc.tools.groundx_client import create_groundx_client, create_http_client
+
+SEARCH_BODY = json.dumps({
+    "search": {
+        "count": 1,
+        "query": "who is the ceo?",
+        "results": [{"text": "Stand-in chunk text.", "score": 42.0, "documentId": "doc-1"}],
+    }
+}).encode()
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    handshake_delay = 0.0
+    connections = 0
+    _lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with _StandInHandler._lock:
+            _StandInHandler.connections += 1
+        time.sleep(self.handshake_delay)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(SEARCH_BODY)))
+        self.end_headers()
+        self.wfile.write(SEARCH_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(handshake_ms: float):
+    _StandInHandler.handshake_delay = handshake_ms / 1000.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api"
+
+
+def run(search, n: int, concurrency: int):
+    def one(_):
+        start = time.perf_counter()
+        search()
+        return time.perf_counter() - start
+
+    _StandInHandler.connections = 0
+    wall_start = time.perf_counter()
+    if concurrency == 1:
+        latencies = [one(i) for i in range(n)]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(one, range(n)))
+    wall = time.perf_counter() - wall_start
+    return np.array(latencies) * 1000, wall, _StandInHandler.connections
+
+
+def report(label: str, latencies, wall: float, connections: int, n: int) -> None:
+    print(
+        f"{label:<8} p50 {np.percentile(latencies, 50):7.2f} ms  p95 {np.percentile(latencies, 95):7.2f} ms  "
+        f"{n / wall:7.1f} req/s  connections opened: {connections}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=30.0, help="Simulated TLS handshake cost per new connection")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.handshake_ms)
+    print(f"Stand-in at {base_url}, {args.requests} searches, simulated handshake {args.handshake_ms:.0f} ms")
+
+    def before():
+        client = GroundX(api_key="bench", base_url=base_url)
+        client.search.content(id=1, query="who is the ceo?", n=4)
+        client._client_wrapper.httpx_client.httpx_client.close()
+
+    pooled = create_groundx_client(api_key="bench", base_url=base_url, http_client=create_http_client())
+
+    def after():
+        pooled.search.content(id=1, query="who is the ceo?", n=4)
+
+    for concurrency in args.concurrency:
+        print(f"\n== concurrency {concurrency} ==")
+        report("before", *run(before, args.requests, concurrency), args.requests)
+        report("after", *run(after, args.requests, concurrency), args.requests)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""Equivalence check and parse-throughput benchmark for the HTML parser backends.
+
+Every page is parsed with each installed backend (see
+src/snl_poc/scraping/html_parser.py) and run through the ITNBScraper
+page-type extractor. The extracted JSON must match the html.parser
+result; differing fields are listed per page and the exit status is 1.
+
+Pages come from saved ITNB HTML: the fixtures in scripts/fixtures/itnb_html,
+the crawler's HTTP cache and HTML archive, and any *.html or *.body files
+in --html-dir (the URL is read from the *.json next to each file). Without
+saved pages, --synthetic generates ITNB-like pages. --save-fixtures copies
+the crawled pages into the fixtures directory so they can be committed
+and the check re-run on the same real pages.
+
+    python scripts/bench_html_parsers.py
+    python scripts/bench_html_parsers.py --html-dir src/snl_poc/scraping/scrape_out --repeat 5
+    python scripts/bench_html_parsers.py --save-fixtures 10
+    python scripts/bench_html_parsers.py --synthetic 50
+"""
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+SCRAPING_DIR = Path(__file__).resolve().parent.parent / "src" / "snl_poc" / "scraping"
+# Real ITNB pages committed for the equivalence check (<stem>.html + <stem>.json with the URL)
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "itnb_html"
+# The scraping scripts import their siblings directly (from itnb_site import ...)
+sys.path.insert(0, str(SCRAPING_DIR))
+
+from html_archive import HTMLArchive  # noqa: E402
+from html_parser import available_backends, parse_html  # noqa: E402
+from itnb_site import BASE_URL, page_file_stem  # noqa: E402
+
+crawler = importlib.import_module("crawl-itnb")
+scraper_module = importlib.import_module("scrape-itnb")
+
+
+def load_pages(html_dirs):
+    """(url, html bytes) for every saved page."""
+    pages = []
+    for html_dir in html_dirs:
+        html_dir = Path(html_dir)
+        if not html_dir.is_dir():
+            continue
+        for page_file in sorted(html_dir.glob("*.body")) + sorted(html_dir.glob("*.html")):
+            try:
+                url = json.loads(page_file.with_suffix(".json").read_text(encoding="utf-8"))["url"]
+            except (OSError, ValueError, KeyError):
+                url = f"{BASE_URL}/en/{page_file.stem}"
+            pages.append((url, page_file.read_bytes()))
+    return pages
+
+
+def archived_pages():
+    """(url, html bytes) of the latest version of every page in the HTML archive."""
+    archive = HTMLArchive()
+    if not archive.data_path.exists():
+        return []
+    return [(page.url, page.content) for page in archive.iter_pages() if page.status_code == 200]
+
+
+def save_fixtures(pages, limit):
+    """Write up to `limit` pages, one per URL, to FIXTURES_DIR. Returns the number written."""
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for url, html in dict(pages).items():
+        if written == limit:
+            break
+        stem = page_file_stem(url)
+        (FIXTURES_DIR / f"{stem}.html").write_bytes(html)
+        (FIXTURES_DIR / f"{stem}.json").write_text(json.dumps({"url": url}, indent=2) + "\n", encoding="utf-8")
+        written += 1
+    return written
+
+
+def synthetic_pages(count, sections):
+    """ITNB-like pages: navigation, hero, feature lists, specs, pricing, footer."""
+    kinds = ["products-and-services/sovereign-cloud", "solutions/industries/banking", "company/about-itnb",
+             "ecosystem/partner-network", "news", "company/about-itnb/certificates-and-compliance"]
+    pages = []
+    for i in range(count):
+        nav = "".join(f'<li><a href="/en/{k}">{k.title()}</a></li>' for k in kinds)
+        body = [f'<header class="site-header"><nav class="main-nav"><ul>{nav}</ul></nav></header>',
+                f'<section class="hero-banner"><h1>Sovereign AI {i}</h1><p>Swiss infrastructure for regulated data.</p>'
+                '<a class="btn btn-primary" href="/en/contact">Contact us</a></section>']
+        for s in range(sections):
+            body.append(
+                f'<section class="service-block"><h2>Features of service {s}</h2>'
+                f'<ul><li>Feature {s}.1 with ISO 27001 certified hosting</li><li>Feature {s}.2</li></ul>'
+                f'<h3>Benefits</h3><ul><li>Benefit {s}</li></ul>'
+                f'<p>Technical specification: {s * 4} vCPU, requirement of TLS 1.3. Pricing from CHF {s * 10} per month.</p>'
+                f'<div class="partner-logos"><img alt="Partner {s}" src="/p{s}.png"><h4>Partner {s}</h4></div>'
+                f'<article class="news-post"><h3>Challenge {s}</h3><span class="date">2024-0{s % 9 + 1}-01</span>'
+                f'<p>{"Sovereign cloud infrastructure service. " * 8}</p></article>'
+                f'<a href="/en/learn-more-{s}">Learn more</a></section>')
+        body.append('<footer class="site-footer"><a href="mailto:info@itnb.ch">Mail</a><a href="tel:+41000">Call</a></footer>')
+        html = (f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>ITNB page {i}</title>'
+                f'<meta name="description" content="Page {i}"></head><body><main>{"".join(body)}</main></body></html>')
+        pages.append((f"{BASE_URL}/en/{kinds[i % len(kinds)]}", html.encode("utf-8")))
+    return pages
+
+
+def extract(scraper, url, html, backend):
+    soup = parse_html(html, backend)
+    return scraper.scrape_page_by_type(url, crawler.categorize_page_type(url, soup), soup)
+
+
+def diff_fields(expected, actual):
+    keys = sorted(set(expected) | set(actual))
+    return [k for k in keys if expected.get(k) != actual.get(k)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--html-dir", action="append", default=None,
+                        help="Directory with saved pages (*.body from the HTTP cache, *.html); repeatable")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate this many synthetic pages")
+    parser.add_argument("--sections", type=int, default=20, help="Content sections per synthetic page")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the pages per backend")
+    parser.add_argument("--save-fixtures", type=int, default=0, metavar="N",
+                        help="Copy N crawled pages (HTML archive, HTTP cache) to scripts/fixtures/itnb_html and exit")
+    args = parser.parse_args()
+
+    if args.save_fixtures:
+        crawled = archived_pages() + load_pages([SCRAPING_DIR / "http_cache"])
+        written = save_fixtures(crawled, args.save_fixtures)
+        print(f"Saved {written} pages to {FIXTURES_DIR}")
+        sys.exit(0 if written else 2)
+
+    if args.synthetic:
+        pages = synthetic_pages(args.synthetic, args.sections)
+    elif args.html_dir:
+        pages = load_pages(args.html_dir)
+    else:
+        saved = load_pages([FIXTURES_DIR, SCRAPING_DIR / "http_cache", SCRAPING_DIR / "scrape_out"]) + archived_pages()
+        # The same page is often both cached and archived: check it once
+        pages = list(dict(saved).items())
+    if not pages:
+        print("No saved HTML found: run crawl-itnb.py first (it fills the HTTP cache and the HTML archive) "
+              "or pass --synthetic N")
+        sys.exit(2)
+
+    backends = available_backends()
+    total_mb = sum(len(html) for _, html in pages) / 1e6
+    print(f"{len(pages)} pages, {total_mb:.2f} MB, backends: {', '.join(backends)}")
+
+    scraper = scraper_module.ITNBScraper(use_cache=False, parser="html.parser")
+    reference = [extract(scraper, url, html, "html.parser") for url, html in pages]
+
+    mismatches = 0
+    print(f"\n{'backend':<12} {'parse pages/s':>14} {'parse MB/s':>11} {'parse+extract pages/s':>22} {'identical':>10}")
+    for backend in backends:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, html in pages:
+                parse_html(html, backend)
+        parse_seconds = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results = [extract(scraper, url, html, backend) for url, html in pages]
+        total_seconds = (time.perf_counter() - start) / args.repeat
+
+        differing = [(url, diff_fields(ref, res)) for (url, _), ref, res in zip(pages, reference, results) if ref != res]
+        mismatches += len(differing)
+        print(f"{backend:<12} {len(pages) / parse_seconds:>14.1f} {total_mb / parse_seconds:>11.2f} "
+              f"{len(pages) / total_seconds:>22.1f} {len(pages) - len(differing):>6}/{len(pages)}")
+        for url, fields in differing:
+            print(f"    differs from html.parser: {url}: {', '.join(fields)}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""Extraction time per page for the ITNBScraper page-type extractors.
+
+Parses large synthetic ITNB-like pages once and times every page-type
+extractor on the parsed soup, so parse time is not included. With
+--against REV, the extractors of scrape-itnb.py at that git revision
+(e.g. the last one before the one-pass PageIndex) are timed on the same
+pages, and the script checks that both produce identical JSON.
+
+    python scripts/bench_page_extractor.py --sections 200 --against <rev>
+"""
+import argparse
+import importlib
+import importlib.util
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_html_parsers import SCRAPING_DIR, synthetic_pages  # noqa: E402
+from html_parser import parse_html  # noqa: E402
+
+PAGE_TYPES = ["homepage", "product_service", "solution", "company", "partner", "news", "general"]
+# URLs that switch on the URL-dependent branches (team, certificates, contact, success stories)
+TYPE_URLS = {
+    "homepage": "https://www.itnb.ch/en",
+    "product_service": "https://www.itnb.ch/en/products-and-services/sovereign-cloud",
+    "solution": "https://www.itnb.ch/en/solutions/industries/banking",
+    "company": "https://www.itnb.ch/en/company/about-itnb/certificates-and-compliance",
+    "partner": "https://www.itnb.ch/en/ecosystem/partner-network/success-stories",
+    "news": "https://www.itnb.ch/en/news",
+    "general": "https://www.itnb.ch/en/company/team",
+}
+
+
+def load_reference(rev: str):
+    """scrape-itnb.py as of a git revision, imported under another module name."""
+    source = subprocess.run(["git", "show", f"{rev}:src/snl_poc/scraping/scrape-itnb.py"],
+                            capture_output=True, text=True, check=True).stdout
+    path = Path(tempfile.mkdtemp()) / "scrape_itnb_reference.py"
+    path.write_text(source, encoding="utf-8")
+    spec = importlib.util.spec_from_file_location("scrape_itnb_reference", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_extractor(scraper, soups, page_type, repeat):
+    """Median milliseconds per page, and the results of the last pass."""
+    samples, results = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [scraper.scrape_page_by_type(TYPE_URLS[page_type], page_type, soup) for soup in soups]
+        samples.append((time.perf_counter() - start) / len(soups))
+    return statistics.median(samples) * 1000, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--sections", type=int, default=200, help="Content sections per page")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--parser", default="html.parser", help="HTML parser backend for the soups")
+    parser.add_argument("--against", default=None, help="Git revision of scrape-itnb.py to compare with")
+    args = parser.parse_args()
+
+    current = importlib.import_module("scrape-itnb").ITNBScraper(use_cache=False, parser=args.parser)
+    reference = load_reference(args.against).ITNBScraper(use_cache=False, parser=args.parser) if args.against else None
+
+    pages = synthetic_pages(args.pages, args.sections)
+    soups = [parse_html(html, args.parser) for _, html in pages]
+    size_kb = sum(len(html) for _, html in pages) / len(pages) / 1024
+    tags = sum(len(soup.find_all(True)) for soup in soups) / len(soups)
+    print(f"{len(pages)} pages, {size_kb:.0f} KB and {tags:.0f} tags each, parser {args.parser}")
+
+    header = f"\n{'page type':<16} {'current ms':>11}"
+    if reference:
+        header += f" {'reference ms':>13} {'speedup':>8} {'identical':>10}"
+    print(header)
+    identical = True
+    for page_type in PAGE_TYPES:
+        current_ms, current_results = time_extractor(current, soups, page_type, args.repeat)
+        line = f"{page_type:<16} {current_ms:>11.1f}"
+        if reference:
+            reference_ms, reference_results = time_extractor(reference, soups, page_type, args.repeat)
+            same = current_results == reference_results
+            identical = identical and same
+            line += f" {reference_ms:>13.1f} {reference_ms / current_ms:>7.1f}x {str(same):>10}"
+        print(line)
+
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == "__main__":
+    main()
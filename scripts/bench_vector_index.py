@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Latency / recall benchmark for the local dense vector index.
+
+Runs on a synthetic corpus (random unit vectors) so it works without the
+embeddings server, or on the real scrape corpus with --corpus. Exact
+brute-force search is the ground truth for HNSW recall.
+
+    python scripts/bench_vector_index.py --n 100000 --dim 384
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Repository root, so src.snl_poc imports work when the script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.snl_poc.tools.local_search import load_corpus
+from src.snl_poc.tools.vector_index import DenseVectorIndex, HashingEmbedder, chunk_documents, hnswlib
+
+
+class _PrecomputedEmbedder:
+    """Feeds pre-generated vectors into DenseVectorIndex.build()."""
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+        self.name = "synthetic"
+
+    def embed(self, texts):
+        return self.vectors[: len(texts)]
+
+
+def percentile_ms(samples, pct: float) -> float:
+    return float(np.percentile(samples, pct) * 1000)
+
+
+def time_queries(index: DenseVectorIndex, queries: np.ndarray, k: int, exact: bool, batch: int):
+    latencies = []
+    for i in range(0, len(queries), batch):
+        start = time.perf_counter()
+        index.search_vectors(queries[i:i + batch], k=k, exact=exact)
+        latencies.append((time.perf_counter() - start) / len(queries[i:i + batch]))
+    return latencies
+
+
+def recall_at_k(index: DenseVectorIndex, queries: np.ndarray, k: int) -> float:
+    exact_ids, _ = index.search_vectors(queries, k=k, exact=True)
+    approx_ids, _ = index.search_vectors(queries, k=k, exact=False)
+    hits = sum(len(set(e) & set(a)) for e, a in zip(exact_ids, approx_ids))
+    return hits / float(exact_ids.size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=50000, help="Synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--corpus", action="store_true", help="Use the real scrape corpus with the hashing embedder")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.corpus:
+        chunks = chunk_documents(load_corpus())
+        embedder = HashingEmbedder(args.dim)
+        queries = embedder.embed([c["text"][:200] for c in chunks[: args.queries]])
+    else:
+        vectors = rng.standard_normal((args.n, args.dim)).astype(np.float32)
+        chunks = [{"chunk_id": i, "file_name": "", "url": "", "language": "en", "text": ""} for i in range(args.n)]
+        embedder = _PrecomputedEmbedder(vectors)
+        # Queries near existing vectors, like real questions near their answers
+        picks = rng.integers(0, args.n, args.queries)
+        queries = vectors[picks] + 0.5 * rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+
+    print(f"Corpus: {len(chunks)} vectors, dim {args.dim}, {args.queries} queries, k={args.k}")
+    for dtype in ("float32", "float16"):
+        with tempfile.TemporaryDirectory() as tmp:
+            build_start = time.perf_counter()
+            index = DenseVectorIndex.build(chunks, embedder, tmp, dtype=dtype, with_hnsw=hnswlib is not None)
+            build_time = time.perf_counter() - build_start
+            size_mb = index.vectors.nbytes / 1e6
+
+            print(f"\n== {dtype}: {size_mb:.1f} MB matrix, built in {build_time:.2f}s ==")
+            for batch in (1, 32):
+                lat = time_queries(index, queries, args.k, exact=True, batch=batch)
+                print(f"exact  batch={batch:<3} p50 {percentile_ms(lat, 50):7.3f} ms/query  p95 {percentile_ms(lat, 95):7.3f} ms/query")
+
+            if index.hnsw_index is not None:
+                lat = time_queries(index, queries, args.k, exact=False, batch=1)
+                print(f"hnsw   batch=1   p50 {percentile_ms(lat, 50):7.3f} ms/query  p95 {percentile_ms(lat, 95):7.3f} ms/query")
+                print(f"hnsw   recall@{args.k}: {recall_at_k(index, queries, args.k):.3f}")
+            else:
+                print("hnsw   skipped (hnswlib not installed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 #!/usr/bin/env python
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
-from groundx import GroundX
+# Repository root, so src.snl_poc imports work when the script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.snl_poc.tools.groundx_client import create_groundx_client
+from src.snl_poc.tools.groundx_documents import iter_bucket_documents
 
 
 def ensure_env_defaults() -> None:
@@ -17,22 +22,22 @@ def main() -> None:
 
     api_key = os.environ["GROUNDX_API_KEY"]
     base_url = os.environ.get("GROUNDX_BASE_URL")
-    gx = GroundX(api_key=api_key, base_url=base_url)
+    gx = create_groundx_client(api_key=api_key, base_url=base_url)
 
     bucket_id = int(os.getenv("GROUNDX_BUCKET_ID", "69"))
     print(f"Listing documents in bucket {bucket_id}")
 
-    docs = gx.documents.lookup(id=bucket_id)
     found = False
-    if hasattr(docs, "documents") and docs.documents:
-        for d in docs.documents:
-            name = getattr(d, "file_name", None)
-            did = getattr(d, "document_id", None)
-            print(f"- {name} (id={did})")
-            if name == "company_about-itnb_extracted.json":
-                found = True
-    else:
-        print("No documents found or unexpected response format.")
+    count = 0
+    for d in iter_bucket_documents(gx, bucket_id):
+        name = getattr(d, "file_name", None)
+        did = getattr(d, "document_id", None)
+        print(f"- {name} (id={did})")
+        count += 1
+        if name == "company_about-itnb_extracted.json":
+            found = True
+    if not count:
+        print("No documents found.")
 
     if not found:
         print("company_about-itnb_extracted.json not found in bucket.")
@@ -1,9 +1,13 @@
 #!/usr/bin/env python
 import os
 import time
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
-from groundx import GroundX, Document
+from groundx import Document
+# Repository root, so src.snl_poc imports work when the script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.snl_poc.tools.groundx_client import create_groundx_client
 
 
 def ensure_env_defaults() -> None:
@@ -19,7 +23,7 @@ def main() -> None:
 
     api_key = os.environ["GROUNDX_API_KEY"]
     base_url = os.environ.get("GROUNDX_BASE_URL")
-    gx = GroundX(api_key=api_key, base_url=base_url)
+    gx = create_groundx_client(api_key=api_key, base_url=base_url)
 
     bucket_id = int(os.getenv("GROUNDX_BUCKET_ID", "69"))
     file_path = os.getenv(
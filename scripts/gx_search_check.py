@@ -2,8 +2,12 @@
 import os
 import json
 import textwrap
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
-from groundx import GroundX
+# Repository root, so src.snl_poc imports work when the script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.snl_poc.tools.groundx_client import create_groundx_client
 
 
 def ensure_env_defaults() -> None:
@@ -52,7 +56,7 @@ def main() -> None:
     base_url = os.environ.get("GROUNDX_BASE_URL")
 
     print(f"Using GroundX base: {base_url}")
-    gx = GroundX(api_key=api_key, base_url=base_url)
+    gx = create_groundx_client(api_key=api_key, base_url=base_url)
 
     bucket_id = int(os.getenv("GROUNDX_BUCKET_ID", "69"))
     query = os.getenv("GROUNDX_TEST_QUERY", "who is nicolai brignoli?")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""How much the containment-aware main_content shrinks the scraped corpus.
+
+main_content used to join the text of every substantial <main>, <article>
+and <section>, so a section nested in <main> was emitted once for each
+container around it. This re-extracts saved pages both ways (the old
+extraction is reproduced below) and reports, before and after:
+
+  - main_content characters and prompt tokens (cl100k_base, or chars/4)
+  - bytes of the extracted page JSON, as written to scrape_out
+  - ingested chunks, estimated as ceil(tokens / --chunk-tokens) per page
+
+It also checks that no text is lost: every word of the old main_content
+must still occur in the new one.
+
+Pages come from the HTML archive (see html_archive.py), else from the
+HTTP cache and scrape_out; --synthetic N generates ITNB-like pages.
+
+    python scripts/report_main_content_dedup.py
+    python scripts/report_main_content_dedup.py --synthetic 20 --chunk-tokens 256
+"""
+import argparse
+import importlib
+import json
+import math
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+from bench_html_parsers import SCRAPING_DIR, load_pages, synthetic_pages  # noqa: E402
+from html_archive import DATA_FILES, DEFAULT_ARCHIVE_DIR, HTMLArchive  # noqa: E402
+from html_parser import parse_html  # noqa: E402
+from src.snl_poc.tools.chunk_rerank import count_tokens  # noqa: E402
+
+crawler = importlib.import_module("crawl-itnb")
+scraper_module = importlib.import_module("scrape-itnb")
+
+
+def nested_main_content(soup) -> str:
+    """main_content as extracted before containment-aware extraction."""
+    parts = []
+    for container in soup.find_all(['main', 'article', 'section']):
+        if not any(cls in str(container.get('class', [])).lower()
+                   for cls in ['nav', 'header', 'footer', 'menu']):
+            content = container.get_text(separator=' ', strip=True)
+            if content and len(content) > 100:
+                parts.append(content)
+    return ' '.join(parts)
+
+
+def archived_pages(archive_dir):
+    if not any((Path(archive_dir) / name).exists() for name in DATA_FILES.values()):
+        return []
+    return [(page.url, page.content) for page in HTMLArchive(archive_dir).iter_pages()]
+
+
+def measure(page: dict, chunk_tokens: int) -> dict:
+    tokens = count_tokens(page["main_content"])
+    return {
+        "chars": len(page["main_content"]),
+        "tokens": tokens,
+        "json_bytes": len(json.dumps(page, indent=2, ensure_ascii=False).encode("utf-8")),
+        "chunks": max(1, math.ceil(tokens / chunk_tokens)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive-dir", default=str(DEFAULT_ARCHIVE_DIR), help="HTML archive to read pages from")
+    parser.add_argument("--html-dir", action="append", default=None,
+                        help="Directory with saved pages (*.body from the HTTP cache, *.html); repeatable")
+    parser.add_argument("--synthetic", type=int, default=0, help="Generate this many synthetic pages")
+    parser.add_argument("--sections", type=int, default=20, help="Content sections per synthetic page")
+    parser.add_argument("--chunk-tokens", type=int, default=512, help="Tokens per ingested chunk (estimate)")
+    parser.add_argument("--verbose", action="store_true", help="One line per page")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        pages = synthetic_pages(args.synthetic, args.sections)
+    elif args.html_dir:
+        pages = load_pages(args.html_dir)
+    else:
+        pages = (archived_pages(args.archive_dir)
+                 or load_pages([SCRAPING_DIR / "http_cache", SCRAPING_DIR / "scrape_out"]))
+    if not pages:
+        print("No saved HTML found: run crawl-itnb.py first (it fills the HTML archive) or pass --synthetic N")
+        sys.exit(2)
+
+    scraper = scraper_module.ITNBScraper(use_cache=False, archive=None)
+    totals = {"before": dict.fromkeys(["chars", "tokens", "json_bytes", "chunks"], 0),
+              "after": dict.fromkeys(["chars", "tokens", "json_bytes", "chunks"], 0)}
+    lost = []
+    for url, html in pages:
+        soup = parse_html(html)
+        after = scraper.scrape_page_by_type(url, crawler.categorize_page_type(url, soup), soup)
+        before = dict(after, main_content=nested_main_content(soup))
+        if not set(before["main_content"].split()) <= set(after["main_content"].split()):
+            lost.append(url)
+        sizes = {"before": measure(before, args.chunk_tokens), "after": measure(after, args.chunk_tokens)}
+        for side in totals:
+            for key, value in sizes[side].items():
+                totals[side][key] += value
+        if args.verbose:
+            print(f"{sizes['before']['chars']:>9} -> {sizes['after']['chars']:>9} chars  {url}")
+
+    print(f"{len(pages)} pages, {args.chunk_tokens} tokens per chunk")
+    print(f"\n{'':<22} {'before':>12} {'after':>12} {'shrink':>8}")
+    labels = {"chars": "main_content chars", "tokens": "main_content tokens",
+              "json_bytes": "page JSON bytes", "chunks": "ingested chunks"}
+    for key, label in labels.items():
+        before, after = totals["before"][key], totals["after"][key]
+        shrink = 1 - after / before if before else 0.0
+        print(f"{label:<22} {before:>12,} {after:>12,} {shrink:>7.0%}")
+
+    if lost:
+        print(f"\n{len(lost)} pages lost words from main_content:")
+        for url in lost:
+            print(f"    {url}")
+    sys.exit(1 if lost else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ for noisy_logger in [
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from src.snl_poc.crew import SnlPoc
+from src.snl_poc.crew import SnlPoc, groundx_tool
 from fastapi.responses import JSONResponse
 import traceback
 
@@ -63,4 +63,8 @@ async def chat_endpoint(req: ChatRequest):
 
 @app.get("/health_itnb")
 async def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/metrics_itnb")
+async def metrics():
+    return groundx_tool.get_metrics()
\ No newline at end of file
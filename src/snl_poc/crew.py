@@ -8,6 +8,7 @@ import logging
 import yaml
 from dotenv import load_dotenv
 from src.snl_poc.tools.groundx_tool import GroundXTool
+from src.snl_poc.tools.language_detection import detect_language, LANGUAGE_NAMES
 import json
 import re
 import time
@@ -21,6 +22,10 @@ load_dotenv()
 # Initialize GroundX tool with configurable max chunks for ITNB bucket
 max_chunks = int(os.getenv("GROUNDX_MAX_CHUNKS", "2"))  # Get from env var or default to 2
 groundx_tool = GroundXTool(bucket_id=70, max_chunks=max_chunks)  # Use ITNB bucket ID 69 directly
+
+# Languages the GroundX corpus is available in (see scraping/translate_corpus.py).
+# Queries in one of these languages are searched directly, without translation.
+corpus_languages = [lang.strip() for lang in os.getenv("GROUNDX_CORPUS_LANGUAGES", "en").split(",") if lang.strip()]
 # logger.info("Initialized GroundXTool")
 
 @CrewBase
@@ -279,21 +284,30 @@ Language:"""
             # Trim history to prevent context bloat
             history = self._trim_history(history) if history else ""
             
-            # Translate the query (classification always returns 'website' for ITNB AG)
-            translated_query, query_type = self._translate_and_classify(query)
-            print(f"[DEBUG CREW] ITNB AG query classified as: {query_type}")
-            
-            # Detect the current query language
-            current_query_language = self._detect_query_language(query)
+            # Detect the language locally first: if the corpus exists in that language
+            # we search with the original query and skip both LLM round-trips
+            search_language = detect_language(query)
+            if search_language in corpus_languages:
+                translated_query, query_type = query.strip(), 'website'
+                current_query_language = LANGUAGE_NAMES[search_language]
+                print(f"[DEBUG CREW] Query language '{search_language}' is in the corpus, skipping translation")
+            else:
+                # Translate the query (classification always returns 'website' for ITNB AG)
+                translated_query, query_type = self._translate_and_classify(query)
+                search_language = "en"
+                print(f"[DEBUG CREW] ITNB AG query classified as: {query_type}")
+                
+                # Detect the current query language
+                current_query_language = self._detect_query_language(query)
             print(f"[DEBUG CREW] Current query language detected: {current_query_language}")
             
             # Get GroundX results (cached)
-            cache_key = translated_query.strip().lower()
+            cache_key = f"{search_language}:{translated_query.strip().lower()}"
             if cache_key in self._groundx_cache:
                 groundx_results = self._groundx_cache[cache_key]
             else:
-                groundx_results = groundx_tool._run(translated_query)
-                if not groundx_results.startswith("error"):
+                groundx_results = groundx_tool._run(translated_query, language=search_language)
+                if not groundx_results.startswith("Error"):
                     self._groundx_cache[cache_key] = groundx_results
             
             if groundx_results.startswith("Error"):
@@ -0,0 +1,12 @@
+"""Languages of the ITNB website, shared by the runtime tools and the scraping scripts."""
+
+# English is the source language of the corpus; the others are either
+# crawled natively or pre-translated.
+SUPPORTED_LANGUAGES = ["en", "de", "fr", "it"]
+DEFAULT_LANGUAGE = "en"
+LANGUAGE_NAMES = {
+    "en": "English",
+    "de": "German",
+    "fr": "French",
+    "it": "Italian",
+}
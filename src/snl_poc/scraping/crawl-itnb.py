@@ -1,116 +1,261 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import httpx
 import json
 import os
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urldefrag
 import time
+import argparse
+from itnb_site import (BASE_URL, SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE, SCRAPE_OUT_DIR, URL_LIST_FILE,
+                       page_language, is_language_root)
+from rate_limit import USER_AGENT, HostRateLimiter, load_robots, fetch_with_retries
+from http_cache import HTTPCache
+from frontier import Frontier, parse_sitemap
+from html_parser import PARSER_BACKENDS, parse_html, resolve_backend
+from html_archive import HTMLArchive
 
-def crawl_itnb_site(start_urls, base_url, max_pages=50):
+def summarize_page(url, soup):
+    """Summary record for one crawled page"""
+    # Extract basic page info
+    title = soup.title.string.strip() if soup.title and soup.title.string else ""
+    headings = [h.get_text(strip=True) for h in soup.find_all(['h1', 'h2', 'h3', 'h4'])]
+    
+    # Extract meta description
+    meta_desc = ""
+    meta_tag = soup.find('meta', attrs={'name': 'description'})
+    if meta_tag:
+        meta_desc = meta_tag.get('content', '')
+    
+    # Extract main content areas
+    main_content = []
+    # Look for main content containers
+    for container in soup.find_all(['main', 'article', 'section']):
+        content_text = container.get_text(strip=True)
+        if content_text and len(content_text) > 50:  # Only meaningful content
+            main_content.append(content_text[:500])  # Truncate for summary
+    
+    # Extract navigation structure
+    nav_links = []
+    for nav in soup.find_all(['nav', 'ul']):
+        for link in nav.find_all('a', href=True):
+            link_text = link.get_text(strip=True)
+            if link_text:
+                nav_links.append({
+                    'text': link_text,
+                    'href': link['href']
+                })
+    
+    # Categorize page type based on URL and content
+    page_type = categorize_page_type(url, soup)
+    
+    return {
+        "url": url,
+        "language": page_language(url, DEFAULT_LANGUAGE),
+        "title": title,
+        "meta_description": meta_desc,
+        "headings": headings,
+        "main_content_snippets": main_content[:3],  # First 3 content blocks
+        "navigation_links": nav_links[:10],  # First 10 nav links
+        "page_type": page_type,
+        "content_length": len(soup.get_text(strip=True))
+    }
+
+
+def should_follow(link, from_url, base_url, languages):
+    """True if the crawl should fetch `link`, found on `from_url`"""
+    # Only follow links within itnb.ch domain
+    if urlparse(link).netloc != urlparse(base_url).netloc:
+        return False
+    # Filter out common non-content links
+    if any(x in link.lower() for x in ['javascript:', 'tel:', 'mailto:', '.pdf', '.jpg', '.png']):
+        return False
+    # Only follow the requested site languages
+    link_language = page_language(link)
+    if link_language in languages:
+        return True
+    # Language-neutral link from a page outside the requested languages
+    return link_language is None and page_language(from_url) not in languages
+
+
+def extract_links(url, soup, base_url, languages):
+    """Same-site links on the page that the crawl should follow, in page order"""
+    links = []
+    for a in soup.find_all('a', href=True):
+        # Fragments point into the same page: drop them rather than the link
+        abs_link = urldefrag(urljoin(url, a['href'])).url
+        if abs_link and should_follow(abs_link, url, base_url, languages):
+            links.append(abs_link)
+    return links
+
+
+async def sitemap_urls(client, base_url, robots, limiter, max_sitemaps=20):
     """
-    Crawl ITNB website to discover all available pages
+    Page URLs listed in the site's sitemaps: the ones robots.txt names, or
+    /sitemap.xml. Sitemap indexes are followed up to max_sitemaps files.
     """
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    })
-    
-    visited = set()
-    to_visit = list(start_urls)
-    results = []
-    
-    while to_visit and len(visited) < max_pages:
-        url = to_visit.pop(0)
-        if url in visited:
-            continue
-            
-        print(f"Crawling: {url}")
+    pending = list((robots.site_maps() if robots is not None else None) or [f"{base_url.rstrip('/')}/sitemap.xml"])
+    urls, fetched = [], 0
+    while pending and fetched < max_sitemaps:
+        sitemap = pending.pop(0)
+        fetched += 1
         try:
-            resp = session.get(url, timeout=15)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            
-            # Extract basic page info
-            title = soup.title.string.strip() if soup.title and soup.title.string else ""
-            headings = [h.get_text(strip=True) for h in soup.find_all(['h1', 'h2', 'h3', 'h4'])]
-            
-            # Extract meta description
-            meta_desc = ""
-            meta_tag = soup.find('meta', attrs={'name': 'description'})
-            if meta_tag:
-                meta_desc = meta_tag.get('content', '')
-            
-            # Extract main content areas
-            main_content = []
-            # Look for main content containers
-            for container in soup.find_all(['main', 'article', 'section']):
-                content_text = container.get_text(strip=True)
-                if content_text and len(content_text) > 50:  # Only meaningful content
-                    main_content.append(content_text[:500])  # Truncate for summary
-            
-            # Extract navigation structure
-            nav_links = []
-            for nav in soup.find_all(['nav', 'ul']):
-                for link in nav.find_all('a', href=True):
-                    link_text = link.get_text(strip=True)
-                    if link_text:
-                        nav_links.append({
-                            'text': link_text,
-                            'href': link['href']
-                        })
-            
-            # Categorize page type based on URL and content
-            page_type = categorize_page_type(url, soup)
-            
-            results.append({
-                "url": url,
-                "title": title,
-                "meta_description": meta_desc,
-                "headings": headings,
-                "main_content_snippets": main_content[:3],  # First 3 content blocks
-                "navigation_links": nav_links[:10],  # First 10 nav links
-                "page_type": page_type,
-                "content_length": len(soup.get_text(strip=True))
-            })
-            
-            # Find new links to crawl
-            for a in soup.find_all('a', href=True):
-                link = a['href']
-                abs_link = urljoin(url, link)
-                parsed = urlparse(abs_link)
-                
-                # Only follow links within itnb.ch domain
-                if parsed.netloc == urlparse(base_url).netloc:
-                    if abs_link not in visited and abs_link not in to_visit:
-                        # Filter out common non-content links
-                        if not any(x in abs_link.lower() for x in ['#', 'javascript:', 'tel:', 'mailto:', '.pdf', '.jpg', '.png']):
-                            # Prefer English pages
-                            if "/en/" in abs_link or abs_link.endswith("/en"):
-                                to_visit.append(abs_link)
-                            elif "/en/" not in url:  # Add non-English only if current page isn't English
-                                to_visit.append(abs_link)
-            
-            # Be polite to the server
-            time.sleep(1)
-            
+            resp = await fetch_with_retries(client, sitemap, limiter, retries=1)
         except Exception as e:
-            print(f"Failed to crawl {url}: {e}")
-            
-        visited.add(url)
+            print(f"No sitemap at {sitemap}: {e}")
+            continue
+        pages, nested = parse_sitemap(resp.content)
+        urls.extend(pages)
+        pending.extend(nested)
+    return urls
+
+
+async def crawl_itnb_site_async(start_urls, base_url, max_pages=50, languages=None,
+                                concurrency=4, rate=2.0, retries=3, respect_robots=True, cache=None,
+                                frontier=None, max_depth=None, use_sitemap=True, checkpoint_every=10,
+                                page_handler=None, parser=None, archive=None):
+    """
+    Crawl with `concurrency` workers sharing one keep-alive connection pool.
+
+    Requests per host are limited to `rate` per second (lower if robots.txt
+    sets a Crawl-delay); failed fetches are retried with backoff. With an
+    HTTPCache, recently fetched pages are not requested again and the others
+    are revalidated with conditional requests.
+
+    URLs are scheduled through a Frontier: canonicalized, deduplicated,
+    limited to `max_depth` links from the start pages and taken in
+    breadth-first order. Sitemap URLs are seeded one level below the start
+    pages. The frontier is checkpointed every `checkpoint_every` pages, so
+    passing a Frontier loaded from the checkpoint resumes an interrupted
+    crawl without refetching finished pages. Results keep the order in
+    which pages were discovered.
+
+    `page_handler(url, soup, summary)` is called for every crawled page with
+    the parsed document, so extraction can reuse it instead of fetching the
+    page again. Handler errors are reported but do not fail the page.
+    `parser` selects the HTML parser backend (see html_parser.py). With an
+    HTMLArchive, every crawled response is archived for offline extraction.
+    """
+    languages = list(languages or [DEFAULT_LANGUAGE])
+    parser = resolve_backend(parser)
+    limiter = HostRateLimiter(rate=rate, burst=max(1, min(concurrency, int(rate) or 1)))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if frontier is None:
+        frontier = Frontier(max_pages=max_pages, max_depth=max_depth)
+    
+    async with httpx.AsyncClient(headers={"User-Agent": USER_AGENT}, limits=limits,
+                                 timeout=15, follow_redirects=True) as client:
+        robots = await load_robots(client, base_url) if respect_robots else None
+        if robots is not None:
+            limiter.set_crawl_delay(urlparse(base_url).netloc, robots.crawl_delay(USER_AGENT))
+        
+        if frontier.seen:
+            print(f"Resuming crawl: {len(frontier.done)} pages done, {len(frontier)} pending")
+        else:
+            frontier.add_many(start_urls, depth=0)
+            if use_sitemap:
+                listed = [u for u in await sitemap_urls(client, base_url, robots, limiter)
+                          if should_follow(u, start_urls[0], base_url, languages)]
+                print(f"Seeded {frontier.add_many(listed, depth=1)} URLs from {len(listed)} sitemap entries")
+        
+        wake = asyncio.Event()
+        in_flight = 0
+        since_checkpoint = 0
+        
+        async def crawl_page(url, depth):
+            if robots is not None and not robots.can_fetch(USER_AGENT, url):
+                print(f"Skipping (robots.txt): {url}")
+                frontier.mark_failed(url, "disallowed by robots.txt")
+                return
+            print(f"Crawling: {url}")
+            resp = cache.get_fresh(url) if cache else None
+            if resp is None:
+                headers = cache.conditional_headers(url) if cache else None
+                resp = await fetch_with_retries(client, url, limiter, retries=retries, headers=headers)
+                if cache:
+                    resp = cache.resolve(url, resp.status_code, resp.headers, resp.content, resp.encoding)
+            if archive is not None:
+                archive.add(url, resp.content, resp.status_code, resp.headers, resp.encoding)
+            soup = parse_html(resp.content, parser)
+            summary = summarize_page(url, soup)
+            for link in extract_links(url, soup, base_url, languages):
+                frontier.add(link, depth + 1)
+            if page_handler is not None:
+                try:
+                    page_handler(url, soup, summary)
+                except Exception as e:
+                    print(f"Failed to process {url}: {e}")
+            frontier.mark_done(url, summary)
+        
+        async def worker():
+            nonlocal in_flight, since_checkpoint
+            while True:
+                item = frontier.pop()
+                if item is None:
+                    if in_flight == 0:
+                        wake.set()
+                        return
+                    # Other workers may still discover links
+                    wake.clear()
+                    await wake.wait()
+                    continue
+                url, depth, _ = item
+                in_flight += 1
+                try:
+                    await crawl_page(url, depth)
+                except Exception as e:
+                    print(f"Failed to crawl {url}: {e}")
+                    frontier.mark_failed(url, str(e))
+                finally:
+                    in_flight -= 1
+                    since_checkpoint += 1
+                    if since_checkpoint >= checkpoint_every:
+                        frontier.save()
+                        since_checkpoint = 0
+                    wake.set()
+        
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            # Also on Ctrl-C, so --resume picks up where the crawl stopped
+            frontier.save()
+    
+    return frontier.results()
+
+
+def crawl_itnb_site(start_urls, base_url, max_pages=50, languages=None,
+                    concurrency=4, rate=2.0, retries=3, respect_robots=True, cache=None,
+                    frontier=None, max_depth=None, use_sitemap=True, page_handler=None, parser=None,
+                    archive=None):
+    """
+    Crawl ITNB website to discover all available pages
+
+    `languages` lists the site languages to follow (default: English only).
+    Pass a Frontier loaded from a checkpoint to resume an interrupted crawl,
+    and a page_handler to process each parsed page during the crawl.
+    """
+    start = time.time()
+    results = asyncio.run(crawl_itnb_site_async(
+        start_urls, base_url, max_pages=max_pages, languages=languages,
+        concurrency=concurrency, rate=rate, retries=retries, respect_robots=respect_robots, cache=cache,
+        frontier=frontier, max_depth=max_depth, use_sitemap=use_sitemap, page_handler=page_handler,
+        parser=parser, archive=archive
+    ))
+    if cache:
+        print(cache.report())
+    if archive is not None:
+        print(archive.report())
     
     # Save results
-    output_dir = os.path.join(os.path.dirname(__file__), "scrape_out")
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, "itnb_crawl_summary.json")
+    os.makedirs(SCRAPE_OUT_DIR, exist_ok=True)
+    output_file = os.path.join(SCRAPE_OUT_DIR, "itnb_crawl_summary.json")
     
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
     
     print(f"ITNB crawl summary saved to {output_file}")
-    print(f"Discovered {len(results)} pages")
+    print(f"Discovered {len(results)} pages in {time.time() - start:.1f}s")
     
     # Also save a simple URL list for easy reference
-    url_list_file = os.path.join(output_dir, "itnb_urls.txt")
-    with open(url_list_file, 'w', encoding='utf-8') as f:
+    with open(URL_LIST_FILE, 'w', encoding='utf-8') as f:
         for result in results:
             f.write(f"{result['page_type']}: {result['url']}\n")
     
@@ -123,7 +268,7 @@ def categorize_page_type(url, soup):
     url_lower = url.lower()
     
     # Check URL patterns first
-    if url_lower.endswith('/en') or url_lower.endswith('/'):
+    if is_language_root(url_lower) or url_lower.endswith('/'):
         return "homepage"
     elif 'product' in url_lower or 'service' in url_lower:
         return "product_service"
@@ -157,16 +302,69 @@ def categorize_page_type(url, soup):
     
     return "general"
 
+def add_crawl_arguments(parser):
+    """Crawl options, shared with scrape-itnb.py --fused"""
+    parser.add_argument("--languages", default=DEFAULT_LANGUAGE,
+                        help=f"Comma-separated site languages to crawl ({','.join(SUPPORTED_LANGUAGES)})")
+    parser.add_argument("--max-pages", type=int, default=30,
+                        help="Maximum pages to crawl per language")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Concurrent connections")
+    parser.add_argument("--rate", type=float, default=2.0,
+                        help="Requests per second per host (robots.txt Crawl-delay can lower it)")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="Retries per page on network errors, 429 and 5xx")
+    parser.add_argument("--ignore-robots", action="store_true",
+                        help="Do not read robots.txt")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Download every page instead of using the HTTP cache")
+    parser.add_argument("--max-age", type=float, default=None,
+                        help="Seconds a cached page is reused without revalidation")
+    parser.add_argument("--max-depth", type=int, default=None,
+                        help="Follow links at most this many clicks from the start pages")
+    parser.add_argument("--no-sitemap", action="store_true",
+                        help="Do not seed the crawl from sitemap.xml")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the crawl saved in the checkpoint instead of starting over")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file (default: scraping/crawl_checkpoint.json)")
+    parser.add_argument("--no-archive", action="store_true",
+                        help="Do not add the fetched HTML to the archive (scraping/html_archive)")
+    parser.add_argument("--parser", default=None, choices=["auto"] + PARSER_BACKENDS,
+                        help="HTML parser backend (default: HTML_PARSER or html.parser; auto = the fastest installed)")
+
+
+def crawl_from_args(args, page_handler=None):
+    """Run crawl_itnb_site with the options from add_crawl_arguments"""
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip() in SUPPORTED_LANGUAGES]
+
+    base_url = BASE_URL
+    start_urls = []
+    for lang in languages:
+        start_urls.extend([
+            f"{base_url}/{lang}",  # Language homepage
+            f"{base_url}/{lang}/products-and-services",
+            f"{base_url}/{lang}/solutions",
+            f"{base_url}/{lang}/company"
+        ])
+    
+    max_pages = args.max_pages * len(languages)
+    if args.resume:
+        frontier = Frontier.load(args.checkpoint, max_pages=max_pages, max_depth=args.max_depth)
+    else:
+        frontier = Frontier(max_pages=max_pages, max_depth=args.max_depth, checkpoint_path=args.checkpoint)
+    
+    return crawl_itnb_site(start_urls, base_url, max_pages=max_pages, languages=languages,
+                           concurrency=args.concurrency, rate=args.rate, retries=args.retries,
+                           respect_robots=not args.ignore_robots,
+                           cache=None if args.no_cache else HTTPCache(max_age=args.max_age),
+                           frontier=frontier, use_sitemap=not args.no_sitemap, page_handler=page_handler,
+                           parser=args.parser, archive=None if args.no_archive else HTMLArchive())
+
 def main():
-    base_url = "https://www.itnb.ch"
-    start_urls = [
-        f"{base_url}/en",  # English homepage
-        f"{base_url}/en/products-and-services",
-        f"{base_url}/en/solutions", 
-        f"{base_url}/en/company"
-    ]
-    
-    crawl_itnb_site(start_urls, base_url, max_pages=30)
+    parser = argparse.ArgumentParser(description="Crawl the ITNB website")
+    add_crawl_arguments(parser)
+    crawl_from_args(parser.parse_args())
 
 if __name__ == "__main__":
     main()
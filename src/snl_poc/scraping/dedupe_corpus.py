@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Remove blocks of text repeated across the ITNB corpus before ingestion.
+
+Many pages share boilerplate (hero banners, "Let's Chat About itnb", the
+product teasers, partner lists), and each copy becomes its own GroundX
+chunk competing for the few retrieval slots. This splits the text fields
+of every page into sentence blocks, computes a MinHash signature of each
+block's word shingles and finds near-identical blocks across the corpus
+with LSH banding (blocks are compared only within shared band buckets, so
+the work grows roughly linearly with the corpus). Each group of repeats is
+kept once, in its canonical page: the one with the shortest URL path
+(the homepage for site-wide blocks), and is dropped everywhere else.
+
+scrape_out_cleaned/ is read and scrape_out_deduped/ is written, so the
+cleaned corpus stays the input of every run; the combined
+itnb_all_content.json gets the same edits as the page files.
+
+    python dedupe_corpus.py
+    python dedupe_corpus.py --report-only --top 20
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parent
+INPUT_DIR = ROOT_DIR / "scrape_out_cleaned"
+OUTPUT_DIR = ROOT_DIR / "scrape_out_deduped"
+COMBINED_FILE = "itnb_all_content.json"
+
+# Page fields split into blocks and deduplicated
+DEDUPE_FIELDS = ["main_content"]
+
+NUM_PERM = 128
+# 16 bands of 8 rows: blocks with Jaccard similarity above ~0.7 share a bucket
+# with high probability, dissimilar ones almost never
+BANDS = 16
+SHINGLE_SIZE = 5
+# Blocks shorter than this are kept as they are (too short to match reliably)
+MIN_WORDS = 8
+# Estimated Jaccard similarity above which two blocks count as the same
+THRESHOLD = 0.8
+
+_PRIME = (1 << 31) - 1
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def split_blocks(text: str) -> List[str]:
+    """Sentence blocks of a text field (the extractor joins paragraphs with spaces)."""
+    return [block for block in _SENTENCE_END.split(text) if block]
+
+
+def shingle_hashes(block: str) -> np.ndarray:
+    """32-bit hashes of the block's word n-grams."""
+    words = _WORD.findall(block.lower())
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))}
+    return np.array([zlib.crc32(shingle.encode("utf-8")) for shingle in shingles], dtype=np.uint64)
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, _PRIME, size=(num_perm, 1)).astype(np.uint64)
+        self.b = rng.randint(0, _PRIME, size=(num_perm, 1)).astype(np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """Minimum of num_perm universal hashes (a*x + b) mod p over the shingles."""
+        return ((self.a * hashes[None, :] + self.b) % _PRIME).min(axis=1)
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        self.parent[self.find(i)] = self.find(j)
+
+
+def canonical_order(url: str, name: str) -> Tuple[int, str, str]:
+    """Pages sort by URL depth, then URL: the homepage comes first."""
+    path = urlparse(url or "").path.strip("/")
+    return (path.count("/") + 1 if path else 0, url or "", name)
+
+
+def dedupe_pages(pages: Dict[str, dict], threshold: float = THRESHOLD, min_words: int = MIN_WORDS,
+                 bands: int = BANDS) -> dict:
+    """
+    Drop repeated blocks from the DEDUPE_FIELDS of `pages` (name -> page
+    dict, edited in place). Returns the statistics for the report.
+    """
+    hasher = MinHasher()
+    rows = NUM_PERM // bands
+    order = sorted(pages, key=lambda name: canonical_order(pages[name].get("url"), name))
+
+    # Every block in canonical order: (page name, field, text)
+    blocks, signatures = [], []
+    for name in order:
+        for field in DEDUPE_FIELDS:
+            if isinstance(pages[name].get(field), str):
+                for block in split_blocks(pages[name][field]):
+                    blocks.append((name, field, block))
+                    signatures.append(hasher.signature(shingle_hashes(block))
+                                      if len(block.split()) >= min_words else None)
+
+    # LSH: blocks sharing all rows of a band land in the same bucket; each is
+    # checked against the bucket's first block, so repeats of one block
+    # cost one comparison each instead of one per pair
+    groups = _UnionFind(len(blocks))
+    for band in range(bands):
+        buckets: Dict[bytes, int] = {}
+        for i, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            key = signature[band * rows:(band + 1) * rows].tobytes()
+            first = buckets.setdefault(key, i)
+            if first != i and groups.find(first) != groups.find(i):
+                if np.mean(signatures[first] == signature) >= threshold:
+                    groups.union(i, first)
+
+    # Blocks are in canonical order, so the first of each group is kept
+    kept_group = set()
+    removed = set()
+    copies: Dict[int, List[int]] = {}
+    for i, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        root = groups.find(i)
+        copies.setdefault(root, []).append(i)
+        if root in kept_group:
+            removed.add(i)
+        kept_group.add(root)
+
+    stats = {"pages": len(pages), "blocks": len(blocks), "removed": len(removed),
+             "chars_before": sum(len(pages[name].get(field) or "") for name in pages for field in DEDUPE_FIELDS
+                                 if isinstance(pages[name].get(field), str))}
+    kept: Dict[Tuple[str, str], List[str]] = {}
+    for i, (name, field, block) in enumerate(blocks):
+        kept.setdefault((name, field), [])
+        if i not in removed:
+            kept[(name, field)].append(block)
+    for (name, field), parts in kept.items():
+        if parts:
+            pages[name][field] = " ".join(parts)
+        else:
+            del pages[name][field]
+    stats["chars_after"] = sum(len(pages[name].get(field) or "") for name in pages for field in DEDUPE_FIELDS
+                               if isinstance(pages[name].get(field), str))
+    stats["repeated"] = sorted(
+        ((len(members), blocks[members[0]][2], blocks[members[0]][0])
+         for members in copies.values() if len(members) > 1),
+        key=lambda entry: (-entry[0] * len(entry[1]), entry[2]))
+    return stats
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _ingested_bytes(directory: Path) -> int:
+    """Size of the files ingest_itnb_to_groundx.py uploads from a directory."""
+    files = list(directory.glob("*_extracted.json")) + list(directory.glob(COMBINED_FILE))
+    return sum(path.stat().st_size for path in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove blocks repeated across pages before ingestion")
+    parser.add_argument("--input-dir", type=Path, default=INPUT_DIR)
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="Estimated Jaccard similarity at which two blocks are duplicates")
+    parser.add_argument("--min-words", type=int, default=MIN_WORDS, help="Shorter blocks are never removed")
+    parser.add_argument("--report-only", action="store_true", help="Report the reduction without writing files")
+    parser.add_argument("--top", type=int, default=10, help="Most repeated blocks to list")
+    args = parser.parse_args()
+
+    page_files = sorted(args.input_dir.glob("*_extracted.json"))
+    if not page_files:
+        print(f"No *_extracted.json files found in {args.input_dir}")
+        return False
+
+    pages = {}
+    for path in page_files:
+        with open(path, "r", encoding="utf-8") as f:
+            pages[path.name] = json.load(f)
+    stats = dedupe_pages(pages, threshold=args.threshold, min_words=args.min_words)
+
+    # The combined file holds the same pages: give them the same edits
+    combined = None
+    combined_path = args.input_dir / COMBINED_FILE
+    if combined_path.exists():
+        with open(combined_path, "r", encoding="utf-8") as f:
+            combined = json.load(f)
+        by_url = {page.get("url"): page for page in pages.values()}
+        for page in combined.get("pages", []):
+            deduped = by_url.get(page.get("url"))
+            if deduped is not None:
+                for field in DEDUPE_FIELDS:
+                    if field in deduped:
+                        page[field] = deduped[field]
+                    else:
+                        page.pop(field, None)
+
+    before = _ingested_bytes(args.input_dir)
+    print(f"{stats['pages']} pages, {stats['blocks']} blocks, {stats['removed']} repeated blocks removed "
+          f"({len(stats['repeated'])} distinct)")
+    shrink = 1 - stats["chars_after"] / stats["chars_before"] if stats["chars_before"] else 0.0
+    print(f"{', '.join(DEDUPE_FIELDS)}: {stats['chars_before']:,} -> {stats['chars_after']:,} characters (-{shrink:.0%})")
+    if args.top and stats["repeated"]:
+        print("\nMost repeated blocks:")
+        for count, block, name in stats["repeated"][:args.top]:
+            print(f"  {count:>4}x  {block[:70]!r}, kept in {name}")
+
+    if args.report_only:
+        return True
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    written = set()
+    for path in sorted(args.input_dir.glob("*.json")):
+        if path.name.startswith("."):
+            continue
+        if path.name in pages:
+            _write_json_atomic(args.output_dir / path.name, pages[path.name])
+        elif path.name == COMBINED_FILE and combined is not None:
+            _write_json_atomic(args.output_dir / path.name, combined)
+        else:
+            shutil.copyfile(path, args.output_dir / path.name)
+        written.add(path.name)
+    # Pages gone from the input must not be ingested from here either
+    for path in args.output_dir.glob("*.json"):
+        if path.name not in written:
+            path.unlink()
+
+    after = _ingested_bytes(args.output_dir)
+    print(f"\nIngested JSON: {before / 1024:,.0f} KB -> {after / 1024:,.0f} KB "
+          f"(-{1 - after / before if before else 0:.0%}), written to {args.output_dir}")
+    return True
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
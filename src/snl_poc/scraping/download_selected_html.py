@@ -1,6 +1,10 @@
 import requests
 import os
 import re
+import hashlib
+from urllib.parse import urlparse
+from http_cache import HTTPCache, cached_get
+from html_archive import HTMLArchive
 
 def extract_urls(filepath):
     urls = []
@@ -12,21 +16,28 @@ def extract_urls(filepath):
     return urls
 
 def url_to_filename(url):
-    # Use the last part of the path, or 'index' if root
-    path = url.rstrip('/').split('/')
-    name = path[-1] if path[-1] else 'index'
-    # Remove query params and fragments
-    name = name.split('?')[0].split('#')[0]
+    # Use the whole path so pages like .../a/index and .../b/index don't collide
+    parsed = urlparse(url)
+    path = parsed.path.strip('/')
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', path) or 'index'
+    # Pages that differ only in their query string get a short hash of it
+    if parsed.query:
+        name += '_' + hashlib.sha1(parsed.query.encode('utf-8')).hexdigest()[:8]
     if not name.endswith('.html'):
         name += '.html'
     return name
 
-def download_and_save(url, out_dir):
+def download_and_save(url, out_dir, session=None, cache=None, archive=None):
     try:
-        resp = requests.get(url, headers={
-            'User-Agent': 'Mozilla/5.0 (compatible; DemoBot/1.0)'
-        })
-        resp.raise_for_status()
+        session = session or requests.Session()
+        headers = {'User-Agent': 'Mozilla/5.0 (compatible; DemoBot/1.0)'}
+        if cache:
+            resp = cached_get(session, url, cache, headers=headers)
+        else:
+            resp = session.get(url, headers=headers)
+            resp.raise_for_status()
+        if archive is not None:
+            archive.add(url, resp.content, resp.status_code, resp.headers, resp.encoding)
         filename = url_to_filename(url)
         out_path = os.path.join(out_dir, filename)
         with open(out_path, 'w', encoding='utf-8') as f:
@@ -40,8 +51,13 @@ def main():
     out_dir = './scrape_out'
     os.makedirs(out_dir, exist_ok=True)
     urls = extract_urls(src)
+    session = requests.Session()
+    cache = HTTPCache()
+    archive = HTMLArchive()
     for url in urls:
-        download_and_save(url, out_dir)
+        download_and_save(url, out_dir, session=session, cache=cache, archive=archive)
+    print(cache.report())
+    print(archive.report())
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Crawl frontier: URL canonicalization, depth/priority scheduling, sitemap
+seeding and on-disk checkpoints for resumable crawls.
+
+The frontier is a heap ordered by (priority, discovery order) plus a
+seen-set of canonical URLs, so adding and taking a URL is O(log n) and
+duplicate checks are O(1). The default priority is the link depth, which
+gives the same breadth-first order as the old list-based crawler.
+"""
+
+import heapq
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+DEFAULT_CHECKPOINT_PATH = Path(__file__).parent / "crawl_checkpoint.json"
+
+# Query parameters that never change page content
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|_ga|ref)$", re.IGNORECASE)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so variants of the same page share one frontier entry.
+
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters and trailing slashes (except on the site root), collapses
+    repeated slashes and sorts the remaining query parameters.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+
+    path = re.sub(r"/{2,}", "/", parsed.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+                   if not TRACKING_PARAMS.match(k))
+    return urlunparse((scheme, host, path, "", urlencode(query), ""))
+
+
+def parse_sitemap(content: bytes) -> Tuple[List[str], List[str]]:
+    """
+    Page URLs and nested sitemap URLs from a sitemap.xml or sitemap index.
+    Malformed XML yields nothing.
+    """
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError:
+        return [], []
+    locs = [el.text.strip() for el in root.iter() if el.tag.endswith("loc") and el.text]
+    if root.tag.endswith("sitemapindex"):
+        return [], locs
+    return locs, []
+
+
+class Frontier:
+    """
+    Pending URLs, seen canonical URLs and finished pages of one crawl.
+
+    add() accepts at most max_pages distinct URLs and ignores links deeper
+    than max_depth. Finished pages are stored with their results so a crawl
+    resumed from a checkpoint skips them.
+    """
+
+    def __init__(self, max_pages: int = 50, max_depth: Optional[int] = None,
+                 checkpoint_path: Optional[Path] = None):
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.checkpoint_path = Path(checkpoint_path or DEFAULT_CHECKPOINT_PATH)
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self.seen: Dict[str, List[int]] = {}  # canonical URL -> [discovery order, depth]
+        self.done: Dict[str, dict] = {}  # canonical URL -> page result
+        self.failed: Dict[str, str] = {}  # canonical URL -> error
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, url: str, depth: int = 0, priority: Optional[float] = None) -> bool:
+        """Schedule a URL; False if it was already seen or is over the limits."""
+        canonical = canonicalize_url(url)
+        if canonical in self.seen or len(self.seen) >= self.max_pages:
+            return False
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        order = len(self.seen)
+        self.seen[canonical] = [order, depth]
+        heapq.heappush(self._heap, (depth if priority is None else priority, order, canonical, depth))
+        return True
+
+    def add_many(self, urls: Iterable[str], depth: int = 0) -> int:
+        return sum(self.add(url, depth) for url in urls)
+
+    def pop(self) -> Optional[Tuple[str, int, int]]:
+        """Next (url, depth, discovery order) by priority, or None when empty."""
+        if not self._heap:
+            return None
+        _, order, url, depth = heapq.heappop(self._heap)
+        return url, depth, order
+
+    def mark_done(self, url: str, result: dict) -> None:
+        self.done[url] = result
+        self.failed.pop(url, None)
+
+    def mark_failed(self, url: str, error: str) -> None:
+        self.failed[url] = error
+
+    def results(self) -> List[dict]:
+        """Finished page results in discovery order."""
+        return [self.done[url] for url in sorted(self.done, key=lambda url: self.seen[url][0])]
+
+    def save(self) -> None:
+        """Checkpoint atomically; failed pages are queued again on resume."""
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "max_pages": self.max_pages,
+                "max_depth": self.max_depth,
+                "pending": [[priority, order, url, depth] for priority, order, url, depth in self._heap],
+                "seen": self.seen,
+                "done": self.done,
+                "failed": self.failed,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @classmethod
+    def load(cls, checkpoint_path: Optional[Path] = None, max_pages: Optional[int] = None,
+             max_depth: Optional[int] = None) -> "Frontier":
+        """Restore a checkpoint. A missing or unreadable file gives an empty frontier."""
+        frontier = cls(max_pages or 50, max_depth, checkpoint_path)
+        try:
+            with open(frontier.checkpoint_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return frontier
+
+        frontier.max_pages = max_pages or data.get("max_pages", frontier.max_pages)
+        frontier.max_depth = max_depth if max_depth is not None else data.get("max_depth")
+        frontier.seen = data.get("seen", {})
+        frontier.done = data.get("done", {})
+        frontier._heap = [tuple(entry) for entry in data.get("pending", [])]
+        # Pages that were in flight or failed when the crawl stopped
+        pending = {entry[2] for entry in frontier._heap}
+        for url, (order, depth) in frontier.seen.items():
+            if url not in frontier.done and url not in pending:
+                frontier._heap.append((depth, order, url, depth))
+        heapq.heapify(frontier._heap)
+        return frontier
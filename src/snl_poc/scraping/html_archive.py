@@ -0,0 +1,335 @@
+"""
+Compressed, content-addressed archive of raw HTML responses.
+
+Pages are appended to pages.warc.gz (or pages.warc.zst) as WARC/1.1
+records, each compressed on its own so any record can be read by offset.
+A body whose SHA-256 is already archived is written as a small "revisit"
+record pointing at the stored payload instead of a second copy.
+index.jsonl maps URL and fetch time to record offsets; it can be rebuilt
+by scanning the data file.
+
+Extractors can then be re-run from the archive without touching the live
+site (scrape-itnb.py --from-archive).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+import zlib
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from frontier import canonicalize_url
+
+try:  # Optional, smaller and faster than gzip
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_ARCHIVE_DIR = Path(os.getenv("HTML_ARCHIVE_DIR", Path(__file__).parent / "html_archive"))
+DEFAULT_COMPRESSION = os.getenv("HTML_ARCHIVE_COMPRESSION", "gzip")
+
+DATA_FILES = {"gzip": "pages.warc.gz", "zstd": "pages.warc.zst"}
+INDEX_FILE = "index.jsonl"
+
+# Response headers kept in the archive
+KEPT_HEADERS = ["content-type", "etag", "last-modified", "date"]
+
+_READ_CHUNK = 1 << 20
+
+
+class ArchivedPage:
+    """One archived response: the body plus the metadata of this fetch."""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str],
+                 encoding: Optional[str], fetched_at: float, sha256: str):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.encoding = encoding
+        self.fetched_at = fetched_at
+        self.sha256 = sha256
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+def _warc_date(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+
+def _reason(status_code: int) -> str:
+    try:
+        return HTTPStatus(status_code).phrase
+    except ValueError:
+        return ""
+
+
+def _parse_headers(block: bytes) -> Tuple[str, Dict[str, str]]:
+    lines = block.decode("utf-8", errors="replace").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if ": " in line:
+            name, value = line.split(": ", 1)
+            headers[name] = value
+    return lines[0], headers
+
+
+class HTMLArchive:
+    def __init__(self, archive_dir: Optional[Path] = None, compression: Optional[str] = None):
+        self.archive_dir = Path(archive_dir or DEFAULT_ARCHIVE_DIR)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        # An existing archive keeps the format it was written in
+        existing = [name for name, file in DATA_FILES.items() if (self.archive_dir / file).exists()]
+        self.compression = existing[0] if existing else (compression or DEFAULT_COMPRESSION)
+        if self.compression not in DATA_FILES:
+            raise ValueError(f"Unknown archive compression '{self.compression}', expected one of {list(DATA_FILES)}")
+        if self.compression == "zstd" and zstandard is None:
+            raise ValueError("zstd archives need the zstandard package")
+        self.data_path = self.archive_dir / DATA_FILES[self.compression]
+        self.index_path = self.archive_dir / INDEX_FILE
+
+        self._lock = threading.Lock()
+        self._by_url: Dict[str, List[dict]] = {}
+        self._by_digest: Dict[str, dict] = {}
+        self._load_index()
+
+    # -- compression -------------------------------------------------------
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def _decompress(self, data: bytes) -> bytes:
+        if self.compression == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def _decompressor(self):
+        if self.compression == "zstd":
+            return zstandard.ZstdDecompressor().decompressobj()
+        return zlib.decompressobj(wbits=31)
+
+    # -- index -------------------------------------------------------------
+
+    def _remember(self, entry: dict) -> None:
+        self._by_url.setdefault(entry["key"], []).append(entry)
+        if entry["type"] == "response":
+            self._by_digest.setdefault(entry["sha256"], entry)
+
+    def _load_index(self) -> None:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._remember(json.loads(line))
+                    except ValueError:
+                        continue  # Partially written last line
+        except OSError:
+            return
+        for entries in self._by_url.values():
+            entries.sort(key=lambda entry: entry["fetched_at"])
+
+    def rebuild_index(self) -> int:
+        """Recreate index.jsonl by scanning the data file; returns the record count."""
+        entries = [entry for entry, _ in self._scan()]
+        with self._lock:
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.index_path)
+            self._by_url, self._by_digest = {}, {}
+            for entry in entries:
+                self._remember(entry)
+        return len(entries)
+
+    # -- writing -----------------------------------------------------------
+
+    def add(self, url: str, content: bytes, status_code: int = 200, headers=None,
+            encoding: Optional[str] = None, fetched_at: Optional[float] = None) -> dict:
+        """
+        Archive one response. A body already in the archive (same SHA-256,
+        any URL) is stored as a revisit record without the payload.
+        Returns the index entry.
+        """
+        fetched_at = fetched_at or time.time()
+        headers = {name: value for name, value in (headers or {}).items() if name.lower() in KEPT_HEADERS}
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        with self._lock:
+            original = self._by_digest.get(sha256)
+            warc_headers = [
+                ("WARC-Type", "revisit" if original else "response"),
+                ("WARC-Target-URI", url),
+                ("WARC-Date", _warc_date(fetched_at)),
+                ("WARC-Record-ID", f"<urn:uuid:{uuid.uuid4()}>"),
+                ("WARC-Payload-Digest", f"sha256:{sha256}"),
+                ("X-Fetched-At", repr(fetched_at)),
+                ("Content-Type", "application/http; msgtype=response"),
+            ]
+            if encoding:
+                warc_headers.append(("X-Encoding", encoding))
+            http_head = f"HTTP/1.1 {status_code} {_reason(status_code)}\r\n"
+            http_head += "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+            if original:
+                warc_headers += [("WARC-Profile", "http://netpreserve.org/warc/1.1/revisit/identical-payload-digest"),
+                                 ("WARC-Refers-To-Target-URI", original["url"])]
+                block = http_head.encode("utf-8")
+            else:
+                block = http_head.encode("utf-8") + content
+
+            record = "WARC/1.1\r\n" + "".join(f"{name}: {value}\r\n" for name, value in warc_headers)
+            record = record.encode("utf-8") + f"Content-Length: {len(block)}\r\n\r\n".encode() + block + b"\r\n\r\n"
+            compressed = self._compress(record)
+
+            with open(self.data_path, "ab") as f:
+                offset = f.tell()
+                f.write(compressed)
+            entry = {
+                "key": canonicalize_url(url),
+                "url": url,
+                "fetched_at": fetched_at,
+                "status": status_code,
+                "sha256": sha256,
+                "type": "revisit" if original else "response",
+                "offset": offset,
+                "length": len(compressed),
+                "size": len(content),
+                "encoding": encoding,
+            }
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._remember(entry)
+            return entry
+
+    # -- reading -----------------------------------------------------------
+
+    def _read_record(self, offset: int, length: int, f=None) -> bytes:
+        if f is None:
+            with open(self.data_path, "rb") as f:
+                f.seek(offset)
+                return self._decompress(f.read(length))
+        f.seek(offset)
+        return self._decompress(f.read(length))
+
+    @staticmethod
+    def _split_record(record: bytes) -> Tuple[Dict[str, str], Dict[str, str], int, bytes]:
+        """WARC headers, HTTP headers, HTTP status and payload of one record."""
+        warc_head, _, rest = record.partition(b"\r\n\r\n")
+        _, warc_headers = _parse_headers(warc_head)
+        block = rest[:int(warc_headers.get("Content-Length", len(rest)))]
+        http_head, _, payload = block.partition(b"\r\n\r\n")
+        status_line, http_headers = _parse_headers(http_head)
+        status_code = int(status_line.split(" ")[1]) if status_line.count(" ") else 0
+        return warc_headers, http_headers, status_code, payload
+
+    def _page(self, entry: dict, f=None) -> ArchivedPage:
+        _, headers, status_code, payload = self._split_record(self._read_record(entry["offset"], entry["length"], f))
+        if entry["type"] == "revisit":
+            original = self._by_digest[entry["sha256"]]
+            payload = self._split_record(self._read_record(original["offset"], original["length"], f))[3]
+        return ArchivedPage(entry["url"], status_code, payload, headers, entry.get("encoding"),
+                            entry["fetched_at"], entry["sha256"])
+
+    def versions(self, url: str) -> List[dict]:
+        """Index entries of every archived fetch of url, oldest first."""
+        return list(self._by_url.get(canonicalize_url(url), []))
+
+    def get(self, url: str, at: Optional[float] = None) -> Optional[ArchivedPage]:
+        """The latest archived fetch of url, or the latest one at or before `at` (epoch seconds)."""
+        entries = [entry for entry in self.versions(url) if at is None or entry["fetched_at"] <= at]
+        return self._page(entries[-1]) if entries else None
+
+    def urls(self) -> List[str]:
+        return [entries[-1]["url"] for entries in self._by_url.values()]
+
+    def iter_pages(self, at: Optional[float] = None) -> Iterator[ArchivedPage]:
+        """
+        Stream the latest version of every URL (at or before `at`) in file
+        order, through a single open file handle.
+        """
+        latest = []
+        for entries in self._by_url.values():
+            eligible = [entry for entry in entries if at is None or entry["fetched_at"] <= at]
+            if eligible:
+                latest.append(eligible[-1])
+        latest.sort(key=lambda entry: entry["offset"])
+        with open(self.data_path, "rb") as f:
+            for entry in latest:
+                yield self._page(entry, f)
+
+    def _scan(self) -> Iterator[Tuple[dict, bytes]]:
+        """(index entry, payload) for every record, decompressing the data file front to back."""
+        if not self.data_path.exists():
+            return
+        digests: Dict[str, bytes] = {}
+        with open(self.data_path, "rb") as f:
+            offset, pending = 0, b""
+            while True:
+                if not pending:
+                    pending = f.read(_READ_CHUNK)
+                    if not pending:
+                        return
+                start, decompressor, parts = offset, self._decompressor(), []
+                while not decompressor.eof:
+                    if not pending:
+                        pending = f.read(_READ_CHUNK)
+                        if not pending:
+                            return  # Truncated last record
+                    fed = len(pending)
+                    parts.append(decompressor.decompress(pending))
+                    pending = decompressor.unused_data
+                    offset += fed - len(pending)
+
+                warc_headers, _, status_code, payload = self._split_record(b"".join(parts))
+                sha256 = warc_headers.get("WARC-Payload-Digest", "").replace("sha256:", "")
+                record_type = warc_headers.get("WARC-Type", "response")
+                if record_type == "response":
+                    digests.setdefault(sha256, payload)
+                else:
+                    payload = digests.get(sha256, b"")
+                url = warc_headers.get("WARC-Target-URI", "")
+                yield {
+                    "key": canonicalize_url(url),
+                    "url": url,
+                    "fetched_at": float(warc_headers.get("X-Fetched-At", 0)),
+                    "status": status_code,
+                    "sha256": sha256,
+                    "type": record_type,
+                    "offset": start,
+                    "length": offset - start,
+                    "size": len(payload),
+                    "encoding": warc_headers.get("X-Encoding"),
+                }, payload
+
+    def __iter__(self) -> Iterator[ArchivedPage]:
+        """Every archived fetch, oldest first, streamed from the data file without the index."""
+        for entry, payload in self._scan():
+            yield ArchivedPage(entry["url"], entry["status"], payload, {}, entry["encoding"],
+                               entry["fetched_at"], entry["sha256"])
+
+    def stats(self) -> dict:
+        entries = [entry for entries in self._by_url.values() for entry in entries]
+        return {
+            "urls": len(self._by_url),
+            "records": len(entries),
+            "revisits": sum(1 for entry in entries if entry["type"] == "revisit"),
+            "raw_bytes": sum(entry["size"] for entry in entries),
+            "stored_bytes": self.data_path.stat().st_size if self.data_path.exists() else 0,
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        ratio = s["raw_bytes"] / s["stored_bytes"] if s["stored_bytes"] else 0.0
+        return (f"HTML archive {self.data_path}: {s['urls']} URLs, {s['records']} fetches "
+                f"({s['revisits']} unchanged), {s['raw_bytes'] / 1024:.0f} KB of HTML in "
+                f"{s['stored_bytes'] / 1024:.0f} KB ({ratio:.1f}x)")
@@ -0,0 +1,60 @@
+"""
+HTML parser backends for the ITNB scrapers.
+
+Every extractor is written against the BeautifulSoup tree API, so the
+backends are BeautifulSoup tree builders: "lxml" (C, several times faster),
+"html5lib" (browser-exact, slow) and "html.parser" (pure Python, always
+available). "auto" picks the fastest one that is installed. Set
+HTML_PARSER to choose a backend for all scripts; scripts/bench_html_parsers.py
+checks that the extracted JSON is the same across backends.
+
+html.parser stays the default until that check passes on real ITNB pages
+(the fixtures in scripts/fixtures/itnb_html); "auto" or "lxml" opt in to
+the faster backends.
+"""
+
+import os
+from functools import lru_cache
+from typing import List, Optional, Union
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+# Fastest first: "auto" takes the first one that is installed
+PARSER_BACKENDS = ["lxml", "html.parser", "html5lib"]
+
+DEFAULT_BACKEND = os.getenv("HTML_PARSER", "html.parser")
+
+
+@lru_cache(maxsize=None)
+def _is_available(backend: str) -> bool:
+    try:
+        BeautifulSoup("", backend)
+        return True
+    except FeatureNotFound:
+        return False
+
+
+def available_backends() -> List[str]:
+    return [backend for backend in PARSER_BACKENDS if _is_available(backend)]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """
+    Backend name to hand to BeautifulSoup. None means HTML_PARSER, or
+    html.parser when it is not set; "auto" picks the fastest installed
+    backend. An explicitly requested backend that is not installed raises
+    ValueError.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == "auto":
+        return available_backends()[0]
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend '{backend}', expected one of {PARSER_BACKENDS}")
+    if not _is_available(backend):
+        raise ValueError(f"HTML parser backend '{backend}' is not installed")
+    return backend
+
+
+def parse_html(markup: Union[str, bytes], backend: Optional[str] = None) -> BeautifulSoup:
+    """Parse a page with the selected backend. Bytes are decoded from the page's declared charset."""
+    return BeautifulSoup(markup, resolve_backend(backend))
@@ -0,0 +1,150 @@
+"""
+Persistent HTTP cache with conditional requests, shared by the crawler and
+the scrapers.
+
+Each URL is stored as <sha256>.body (raw bytes) plus <sha256>.json (URL,
+ETag, Last-Modified, encoding, fetch time). Revalidation sends
+If-None-Match / If-Modified-Since and a 304 answer reuses the stored body.
+Entries younger than max_age are served without any request at all, so a
+scrape right after a crawl does not download the pages again.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = Path(os.getenv("HTTP_CACHE_DIR", Path(__file__).parent / "http_cache"))
+DEFAULT_MAX_AGE = float(os.getenv("HTTP_CACHE_MAX_AGE", "600"))
+
+
+class CachedResponse:
+    """The parts of a response the scrapers use, whether fetched or cached."""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: Dict[str, str],
+                 encoding: Optional[str] = None, from_cache: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.encoding = encoding
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HTTPCache:
+    def __init__(self, cache_dir: Optional[Path] = None, max_age: Optional[float] = None):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_age = DEFAULT_MAX_AGE if max_age is None else max_age
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {"requests": 0, "fresh_hits": 0, "revalidated": 0, "misses": 0,
+                      "bytes_downloaded": 0, "bytes_saved": 0}
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def _load_meta(self, url: str) -> Optional[dict]:
+        body_path, meta_path = self._paths(url)
+        if not body_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _cached_response(self, url: str, meta: dict) -> CachedResponse:
+        body_path, _ = self._paths(url)
+        content = body_path.read_bytes()
+        self.stats["bytes_saved"] += len(content)
+        return CachedResponse(url, 200, content, meta.get("headers", {}), meta.get("encoding"), from_cache=True)
+
+    def get_fresh(self, url: str) -> Optional[CachedResponse]:
+        """Cached response fetched less than max_age seconds ago, without any request."""
+        meta = self._load_meta(url)
+        if meta is None or time.time() - meta.get("fetched_at", 0) >= self.max_age:
+            return None
+        self.stats["requests"] += 1
+        self.stats["fresh_hits"] += 1
+        return self._cached_response(url, meta)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for the stored validators, if any."""
+        meta = self._load_meta(url) or {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def resolve(self, url: str, status_code: int, headers, content: bytes,
+                encoding: Optional[str] = None) -> CachedResponse:
+        """
+        Turn a network response into a CachedResponse: 304 reuses the stored
+        body (and refreshes its age), 200 is stored with its validators.
+        """
+        self.stats["requests"] += 1
+        meta = self._load_meta(url)
+        if status_code == 304 and meta is not None:
+            self.stats["revalidated"] += 1
+            meta["fetched_at"] = time.time()
+            self._write_meta(url, meta)
+            return self._cached_response(url, meta)
+
+        self.stats["misses"] += 1
+        self.stats["bytes_downloaded"] += len(content)
+        response = CachedResponse(url, status_code, content, dict(headers), encoding)
+        if status_code == 200:
+            self._store(url, response)
+        return response
+
+    def _store(self, url: str, response: CachedResponse) -> None:
+        body_path, _ = self._paths(url)
+        tmp_path = body_path.with_suffix(".tmp")
+        tmp_path.write_bytes(response.content)
+        os.replace(tmp_path, body_path)
+        self._write_meta(url, {
+            "url": url,
+            "etag": response.headers.get("etag") or response.headers.get("ETag"),
+            "last_modified": response.headers.get("last-modified") or response.headers.get("Last-Modified"),
+            "encoding": response.encoding,
+            "headers": {"content-type": response.headers.get("content-type") or response.headers.get("Content-Type", "")},
+            "fetched_at": time.time(),
+        })
+
+    def _write_meta(self, url: str, meta: dict) -> None:
+        _, meta_path = self._paths(url)
+        tmp_path = meta_path.with_suffix(".jtmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def hit_rate(self) -> float:
+        hits = self.stats["fresh_hits"] + self.stats["revalidated"]
+        return hits / self.stats["requests"] if self.stats["requests"] else 0.0
+
+    def report(self) -> str:
+        s = self.stats
+        return (f"HTTP cache: {s['requests']} requests, {s['fresh_hits']} fresh + {s['revalidated']} revalidated (304) hits, "
+                f"{s['misses']} downloads, hit rate {self.hit_rate():.0%}, "
+                f"{s['bytes_saved'] / 1024:.0f} KB saved, {s['bytes_downloaded'] / 1024:.0f} KB downloaded")
+
+
+def cached_get(session, url: str, cache: HTTPCache, **kwargs) -> CachedResponse:
+    """GET through a requests.Session with the cache; raises on HTTP errors like raise_for_status()."""
+    fresh = cache.get_fresh(url)
+    if fresh is not None:
+        return fresh
+    headers = dict(kwargs.pop("headers", {}) or {})
+    headers.update(cache.conditional_headers(url))
+    resp = session.get(url, headers=headers, **kwargs)
+    if resp.status_code != 304:
+        resp.raise_for_status()
+    return cache.resolve(url, resp.status_code, resp.headers, resp.content, resp.encoding)
@@ -2,11 +2,19 @@
 
 import os
 import sys
+import argparse
 import logging
 import json
-import time
 from pathlib import Path
-from groundx import GroundX, Document
+from groundx import Document
+from itnb_site import SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE
+from ingest_manifest import IngestManifest, DEFAULT_MANIFEST_PATH
+# Repository root, so src.snl_poc imports work when the script is run directly
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from src.snl_poc.tools.groundx_client import create_groundx_client
+from src.snl_poc.tools.groundx_documents import (iter_bucket_documents, count_bucket_documents, delete_documents,
+                                                 log_delete_progress)
+from src.snl_poc.tools.groundx_ingest import ingest_batched
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -15,62 +23,93 @@ logger = logging.getLogger(__name__)
 class ITNBGroundXIngester:
     """GroundX ingester configured for ITNB website data"""
     
-    def __init__(self, api_key: str, base_url: str, bucket_name: str = " "):
+    def __init__(self, api_key: str, base_url: str, bucket_name: str = " ", manifest_path: Path = None,
+                 data_dir: Path = None, bucket_id: int = None):
         """Initialize the ITNB GroundX ingester"""
         self.api_key = api_key
         self.base_url = base_url
         self.bucket_name = bucket_name
-        self.bucket_id = None
+        self.bucket_id = bucket_id
+        self.manifest_path = Path(manifest_path or DEFAULT_MANIFEST_PATH)
         
         # Initialize GroundX client with on-prem configuration
-        self.client = GroundX(
-            api_key=api_key,
-            base_url=base_url
-        )
+        self.client = create_groundx_client(api_key=api_key, base_url=base_url)
         
-        # Set the data directory to ITNB scrape output
-        self.data_dir = Path(__file__).parent / "scrape_out_cleaned"
+        # Set the data directory to ITNB scrape output (scrape_out_deduped after dedupe_corpus.py)
+        self.data_dir = Path(data_dir or Path(__file__).parent / "scrape_out_cleaned")
         
         logger.info(f"Initialized ITNB GroundX Ingester")
         logger.info(f"API Base URL: {base_url}")
         logger.info(f"Target Bucket: {bucket_name}")
         logger.info(f"Data Directory: {self.data_dir}")
     
-    def setup_bucket(self) -> bool:
-        """Create or get the ITNB bucket"""
+    def bucket_exists(self, bucket_id: int) -> bool:
+        """True if a bucket with this ID exists"""
         try:
-            logger.info(f"Setting up bucket '{self.bucket_name}'...")
+            self.client.buckets.get(bucket_id=bucket_id)
+            return True
+        except Exception as e:
+            logger.warning(f"Bucket {bucket_id} not available: {str(e)}")
+            return False
+    
+    def find_bucket(self) -> int:
+        """
+        ID of the bucket named bucket_name, or None. GroundX allows several
+        buckets with the same name; the one with the most documents wins.
+        """
+        matching = []
+        next_token = None
+        while True:
+            response = self.client.buckets.list(next_token=next_token)
+            matching.extend(bucket.bucket_id for bucket in (getattr(response, "buckets", None) or [])
+                            if bucket.name == self.bucket_name)
+            next_token = getattr(response, "next_token", None)
+            if not next_token:
+                break
+        if len(matching) > 1:
+            return max(matching, key=lambda bucket_id: count_bucket_documents(self.client, bucket_id))
+        return matching[0] if matching else None
+    
+    def setup_bucket(self, create: bool = True) -> bool:
+        """
+        Resolve the ITNB bucket: the bucket_id given to the ingester, else the
+        bucket the manifest was written for, else the bucket named bucket_name.
+        A new bucket is created only if none exists and `create` is set.
+        """
+        try:
+            if self.bucket_id:
+                if not self.bucket_exists(self.bucket_id):
+                    logger.error(f"❌ Bucket {self.bucket_id} not found")
+                    return False
+                logger.info(f"✅ Using bucket {self.bucket_id}")
+                return True
             
-            # Try to create the bucket
-            bucket_response = self.client.buckets.create(
-                name=self.bucket_name
-            )
+            manifest_bucket_id = IngestManifest.stored_bucket_id(self.manifest_path)
+            if manifest_bucket_id and self.bucket_exists(manifest_bucket_id):
+                self.bucket_id = manifest_bucket_id
+                logger.info(f"✅ Using bucket {self.bucket_id} from the manifest {self.manifest_path}")
+                return True
+            
+            logger.info(f"Looking up bucket '{self.bucket_name}'...")
+            self.bucket_id = self.find_bucket()
+            if self.bucket_id:
+                logger.info(f"✅ Found existing bucket '{self.bucket_name}' with ID: {self.bucket_id}")
+                return True
             
+            if not create:
+                logger.info(f"No bucket named '{self.bucket_name}' exists")
+                return False
+            bucket_response = self.client.buckets.create(name=self.bucket_name)
             self.bucket_id = bucket_response.bucket.bucket_id
             logger.info(f"✅ Created new bucket '{self.bucket_name}' with ID: {self.bucket_id}")
             return True
             
         except Exception as e:
-            # If bucket already exists, try to find it
-            logger.info(f"Bucket might already exist, trying to find it: {str(e)}")
-            try:
-                # List existing buckets to find our bucket
-                buckets_response = self.client.buckets.list()
-                for bucket in buckets_response.buckets:
-                    if bucket.name == self.bucket_name:
-                        self.bucket_id = bucket.bucket_id
-                        logger.info(f"✅ Found existing bucket '{self.bucket_name}' with ID: {self.bucket_id}")
-                        return True
-                
-                logger.error(f"❌ Could not find or create bucket '{self.bucket_name}'")
-                return False
-                
-            except Exception as e2:
-                logger.error(f"❌ Error setting up bucket: {str(e2)}")
-                return False
+            logger.error(f"❌ Error setting up bucket: {str(e)}")
+            return False
     
-    def clear_bucket(self) -> bool:
-        """Clear all documents from the bucket"""
+    def clear_bucket(self, batch_size: int = None, max_workers: int = None) -> bool:
+        """Clear all documents from the bucket in concurrent batches"""
         try:
             if not self.bucket_id:
                 logger.error("Bucket ID not set. Please run setup_bucket() first.")
@@ -79,19 +118,30 @@ class ITNBGroundXIngester:
             logger.info(f"Clearing all documents from bucket {self.bucket_id}...")
             
             # Get all documents in the bucket
-            documents_response = self.client.documents.list()
-            bucket_docs = [doc for doc in documents_response.documents if doc.bucket_id == self.bucket_id]
+            bucket_docs = list(iter_bucket_documents(self.client, self.bucket_id))
             
             if not bucket_docs:
                 logger.info("No documents found in bucket to clear")
                 return True
             
-            # Delete each document
-            for doc in bucket_docs:
-                self.client.documents.delete(document_id=doc.document_id)
-                logger.info(f"Deleted document: {doc.file_name}")
+            # Delete in batches, several batches in flight at once
+            result = delete_documents(
+                self.client,
+                [doc.document_id for doc in bucket_docs],
+                batch_size=batch_size,
+                max_workers=max_workers,
+                progress=log_delete_progress
+            )
+            
+            if result["failed"]:
+                logger.error(f"❌ Failed to delete {result['failed']} of {len(bucket_docs)} documents")
+                return False
+            
+            # Nothing is ingested any more: start the next run from an empty manifest
+            IngestManifest(self.manifest_path, self.bucket_id).save()
             
-            logger.info(f"✅ Cleared {len(bucket_docs)} documents from bucket")
+            logger.info(f"✅ Cleared {result['deleted']} documents from bucket in {result['seconds']}s "
+                        f"({result['docs_per_second']} docs/s, {result['batches']} batches)")
             return True
             
         except Exception as e:
@@ -104,8 +154,7 @@ class ITNBGroundXIngester:
             if not self.bucket_id:
                 return {"error": "Bucket ID not set"}
             
-            documents_response = self.client.documents.list()
-            bucket_docs = [doc for doc in documents_response.documents if doc.bucket_id == self.bucket_id]
+            bucket_docs = list(iter_bucket_documents(self.client, self.bucket_id))
             
             status = {
                 "bucket_id": self.bucket_id,
@@ -119,109 +168,187 @@ class ITNBGroundXIngester:
         except Exception as e:
             return {"error": str(e)}
     
-    def prepare_itnb_documents(self) -> list:
-        """Prepare ITNB JSON files for ingestion"""
+    def detect_document_language(self, file_path: Path) -> str:
+        """Read the language tag of an extracted page (defaults to English)"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("language"):
+                return data["language"]
+        except Exception as e:
+            logger.warning(f"Could not read language of {file_path.name}: {str(e)}")
+        
+        # Fall back to the file name prefix (de_..., fr_..., it_...)
+        prefix = file_path.name.split("_", 1)[0]
+        return prefix if prefix in SUPPORTED_LANGUAGES else DEFAULT_LANGUAGE
+    
+    def collect_source_files(self) -> dict:
+        """File name -> path of every ITNB JSON file that belongs in the bucket"""
+        files = {}
+        
+        # Check if data directory exists
+        if not self.data_dir.exists():
+            logger.error(f"Data directory not found: {self.data_dir}")
+            return files
+        
+        # Find the main ITNB content file (optional)
+        main_content_file = self.data_dir / "itnb_all_content.json"
+        if main_content_file.exists():
+            logger.info(f"Found main ITNB content file: {main_content_file}")
+            files[main_content_file.name] = main_content_file
+        else:
+            logger.info("Main ITNB content file not found, will use individual extracted files")
+        
+        # Find individual extracted files
+        individual_files = list(self.data_dir.glob("*_extracted.json"))
+        logger.info(f"Found {len(individual_files)} individual extracted files")
+        for file_path in individual_files:
+            files[file_path.name] = file_path
+        
+        return files
+    
+    def prepare_itnb_documents(self, file_names: list = None) -> list:
+        """Prepare ITNB JSON files for ingestion (all files, or only file_names)"""
         documents = []
         
         try:
-            # Check if data directory exists
-            if not self.data_dir.exists():
-                logger.error(f"Data directory not found: {self.data_dir}")
-                return documents
-            
-            # Find the main ITNB content file (optional)
-            main_content_file = self.data_dir / "itnb_all_content.json"
+            source_files = self.collect_source_files()
+            if file_names is not None:
+                source_files = {name: source_files[name] for name in file_names if name in source_files}
             
-            if main_content_file.exists():
-                logger.info(f"Found main ITNB content file: {main_content_file}")
+            language_counts = {}
+            for file_name, file_path in sorted(source_files.items()):
+                language = self.detect_document_language(file_path)
+                language_counts[language] = language_counts.get(language, 0) + 1
                 documents.append(Document(
                     bucket_id=self.bucket_id,
-                    file_name="itnb_all_content.json",
-                    file_path=str(main_content_file),
-                    file_type="json"
-                ))
-            else:
-                logger.info("Main ITNB content file not found, will use individual extracted files")
-            
-            # Find individual extracted files
-            individual_files = list(self.data_dir.glob("*_extracted.json"))
-            logger.info(f"Found {len(individual_files)} individual extracted files")
-            
-            for file_path in individual_files:
-                documents.append(Document(
-                    bucket_id=self.bucket_id,
-                    file_name=file_path.name,
+                    file_name=file_name,
                     file_path=str(file_path),
-                    file_type="json"
+                    file_type="json",
+                    # Tag each page so retrieval can filter on the query language
+                    filter={"language": language}
                 ))
             
             logger.info(f"Prepared {len(documents)} documents for ingestion")
+            logger.info(f"Documents per language: {language_counts}")
             return documents
             
         except Exception as e:
             logger.error(f"Error preparing documents: {str(e)}")
             return documents
     
-    def ingest_documents(self) -> bool:
-        """Ingest all ITNB documents into GroundX"""
+    def get_remote_documents(self) -> dict:
+        """File name -> document IDs currently in the bucket"""
+        remote_docs = {}
+        if not self.bucket_id:
+            return remote_docs
+        for doc in iter_bucket_documents(self.client, self.bucket_id):
+            remote_docs.setdefault(doc.file_name, []).append(doc.document_id)
+        return remote_docs
+    
+    def plan_ingestion(self, force: bool = False) -> dict:
+        """Diff the local files against the manifest and the bucket (everything is new without a bucket)"""
+        if self.bucket_id:
+            manifest = IngestManifest.load(self.manifest_path, self.bucket_id)
+        else:
+            manifest = IngestManifest(self.manifest_path)
+        source_files = self.collect_source_files()
+        if force:
+            # Treat every file as changed (re-upload and replace its documents)
+            manifest.files = {name: {"sha256": None} for name in manifest.files}
+        for name, entry in manifest.files.items():
+            # Documents uploaded without their current language tag (e.g. the
+            # combined file, untagged before) are re-uploaded to carry it
+            if name in source_files and entry.get("language") != self.detect_document_language(source_files[name]):
+                entry["sha256"] = None
+        return manifest.plan(source_files, self.get_remote_documents())
+    
+    def log_plan(self, plan: dict) -> None:
+        """Print the ingestion diff"""
+        logger.info(f"📋 Ingestion plan: {len(plan['new'])} new, {len(plan['changed'])} changed, "
+                    f"{len(plan['unchanged'])} unchanged, {len(plan['removed'])} removed, "
+                    f"{len(plan['delete_ids'])} documents to delete")
+        for label, symbol in (("new", "+"), ("changed", "~"), ("removed", "-")):
+            for name in plan[label]:
+                logger.info(f"  {symbol} {name}")
+    
+    def ingest_documents(self, dry_run: bool = False, force: bool = False) -> bool:
+        """
+        Incrementally ingest ITNB documents into GroundX.
+        
+        Only new and changed files (by content hash in the manifest) are
+        uploaded; the documents they replace, and those of deleted files,
+        are removed afterwards. dry_run only prints the diff, also when the
+        bucket does not exist yet.
+        """
         try:
-            if not self.bucket_id:
+            if not self.bucket_id and not dry_run:
                 logger.error("Bucket not set up. Please run setup_bucket() first.")
                 return False
             
-            # Prepare documents
-            documents = self.prepare_itnb_documents()
-            
-            if not documents:
-                logger.warning("No documents found to ingest")
-                return False
+            plan = self.plan_ingestion(force=force)
+            self.log_plan(plan)
+            if dry_run:
+                logger.info("Dry run: nothing uploaded or deleted")
+                return True
             
-            logger.info(f"Starting ingestion of {len(documents)} ITNB documents...")
+            uploads = plan["new"] + plan["changed"]
+            if not uploads and not plan["delete_ids"] and not plan["removed"]:
+                logger.info("✅ Bucket is up to date, nothing to ingest")
+                return True
             
-            # Ingest documents
-            ingest_response = self.client.ingest(documents=documents)
-            process_id = ingest_response.ingest.process_id
+            uploaded = []
+            failed = []
+            if uploads:
+                documents = self.prepare_itnb_documents(uploads)
+                logger.info(f"Starting ingestion of {len(documents)} ITNB documents...")
+                
+                # Batched concurrent upload, one poller for all ingest processes
+                summary = ingest_batched(self.client, documents)
+                uploaded = summary["succeeded_files"]
+                failed = summary["failed_files"]
             
-            logger.info(f"Ingestion started with process ID: {process_id}")
+            # Keep the old documents if any upload failed; the next run retries the
+            # failed files and removes the duplicates of the ones that succeeded
+            if failed:
+                logger.error(f"❌ {len(failed)} documents failed to ingest, old documents kept")
+            elif plan["delete_ids"]:
+                logger.info(f"Deleting {len(plan['delete_ids'])} replaced or removed documents...")
+                result = delete_documents(self.client, plan["delete_ids"], progress=log_delete_progress)
+                if result["failed"]:
+                    logger.warning(f"⚠️ {result['failed']} old documents could not be deleted")
             
-            # Wait for ingestion to complete
-            logger.info("Waiting for ingestion to complete...")
-            while True:
-                status_response = self.client.documents.get_processing_status_by_id(
-                    process_id=process_id
-                )
-                
-                status = status_response.ingest.status
-                logger.info(f"Ingestion status: {status}")
-                
-                if status == "complete":
-                    logger.info("✅ Ingestion completed successfully!")
-                    return True
-                elif status == "cancelled":
-                    logger.warning("⚠️ Ingestion was cancelled")
-                    return False
-                elif status == "error":
-                    logger.error("❌ Error during ingestion")
-                    return False
-                
-                # Wait before checking again
-                time.sleep(3)
+            # Record the document IDs the uploads were given
+            manifest = IngestManifest.load(self.manifest_path, self.bucket_id)
+            replaced = set(plan["delete_ids"])
+            remote_docs = self.get_remote_documents()
+            source_files = self.collect_source_files()
+            for name in uploaded:
+                new_ids = [i for i in remote_docs.get(name, []) if i not in replaced]
+                language = self.detect_document_language(source_files[name])
+                manifest.record(name, plan["hashes"][name], new_ids[-1] if new_ids else None, language)
+            if not failed:
+                for name in plan["removed"]:
+                    manifest.forget(name)
+            manifest.save()
+            logger.info(f"Manifest updated: {self.manifest_path}")
+            return not failed
             
         except Exception as e:
             logger.error(f"❌ Error during ingestion: {str(e)}")
             return False
     
-    def run_full_ingestion(self) -> bool:
+    def run_full_ingestion(self, dry_run: bool = False, force: bool = False) -> bool:
         """Run the complete ingestion process"""
         try:
-            # Setup bucket
-            if not self.setup_bucket():
+            # Setup bucket (a dry run never creates one)
+            if not self.setup_bucket(create=not dry_run) and not dry_run:
                 return False
             
             # Ingest documents
-            success = self.ingest_documents()
+            success = self.ingest_documents(dry_run=dry_run, force=force)
             
-            if success:
+            if success and not dry_run:
                 # Show final status
                 status = self.get_bucket_status()
                 logger.info(f"🎉 ITNB data ingestion completed!")
@@ -236,6 +363,19 @@ class ITNBGroundXIngester:
 
 def main():
     """Main function to ingest ITNB data"""
+    parser = argparse.ArgumentParser(description="Ingest the ITNB website corpus into GroundX")
+    parser.add_argument("--clear", action="store_true", help="Delete every document in the bucket")
+    parser.add_argument("--status", action="store_true", help="List the documents in the bucket")
+    parser.add_argument("--dry-run", action="store_true", help="Show which files would be uploaded or deleted")
+    parser.add_argument("--full", action="store_true", help="Re-upload every file regardless of the manifest")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST_PATH, help="Ingestion manifest path")
+    parser.add_argument("--data-dir", type=Path, default=None,
+                        help="Directory with the JSON files to ingest (default: scrape_out_cleaned)")
+    parser.add_argument("--bucket-id", type=int, default=None,
+                        help="Bucket to ingest into (default: the manifest's bucket, else the one named "
+                             "itnb-website-widget, created if none exists)")
+    args = parser.parse_args()
+    
     try:
         logger.info("🚀 Starting ITNB website data ingestion to GroundX")
         
@@ -252,40 +392,44 @@ def main():
         ingester = ITNBGroundXIngester(
             api_key=api_key,
             base_url=base_url,
-            bucket_name=bucket_name
+            bucket_name=bucket_name,
+            manifest_path=args.manifest,
+            data_dir=args.data_dir,
+            bucket_id=args.bucket_id
         )
         
         # Handle command line arguments
-        if len(sys.argv) > 1:
-            if sys.argv[1] == "--clear":
-                logger.info("🗑️ Clearing existing documents from bucket...")
-                if ingester.setup_bucket():
-                    success = ingester.clear_bucket()
-                    if success:
-                        logger.info("✅ Bucket cleared successfully")
-                    else:
-                        logger.error("❌ Failed to clear bucket")
-                    return success
-                return False
+        if args.clear:
+            logger.info("🗑️ Clearing existing documents from bucket...")
+            if ingester.setup_bucket(create=False):
+                success = ingester.clear_bucket()
+                if success:
+                    logger.info("✅ Bucket cleared successfully")
+                else:
+                    logger.error("❌ Failed to clear bucket")
+                return success
+            return False
+            
+        elif args.status:
+            logger.info("📊 Checking bucket status...")
+            if ingester.setup_bucket(create=False):
+                status = ingester.get_bucket_status()
+                if "error" in status:
+                    logger.error(f"Error getting status: {status['error']}")
+                    return False
                 
-            elif sys.argv[1] == "--status":
-                logger.info("📊 Checking bucket status...")
-                if ingester.setup_bucket():
-                    status = ingester.get_bucket_status()
-                    if "error" in status:
-                        logger.error(f"Error getting status: {status['error']}")
-                        return False
-                    
-                    logger.info(f"Bucket: {status['bucket_name']} (ID: {status['bucket_id']})")
-                    logger.info(f"Total documents: {status['total_documents']}")
-                    for doc in status['documents']:
-                        logger.info(f"  - {doc['name']} (ID: {doc['id']})")
-                    return True
-                return False
+                logger.info(f"Bucket: {status['bucket_name']} (ID: {status['bucket_id']})")
+                logger.info(f"Total documents: {status['total_documents']}")
+                for doc in status['documents']:
+                    logger.info(f"  - {doc['name']} (ID: {doc['id']})")
+                return True
+            return False
         
-        # Run full ingestion
-        success = ingester.run_full_ingestion()
+        # Run incremental ingestion
+        success = ingester.run_full_ingestion(dry_run=args.dry_run, force=args.full)
         
+        if args.dry_run:
+            return success
         if success:
             logger.info("🎉 All ITNB data has been successfully ingested into GroundX!")
             logger.info("📊 You can now query this data using the GroundX search functionality")
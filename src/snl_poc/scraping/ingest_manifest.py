@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Local manifest of what has been ingested into a GroundX bucket.
+
+Maps each source file name to the SHA-256 of its content and the GroundX
+document ID it was uploaded as, so re-ingestion only touches files that
+were added, changed or removed since the last run.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_MANIFEST_PATH = Path(__file__).parent / "groundx_manifest.json"
+
+
+def file_sha256(path: Path) -> str:
+    """Content hash of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """File name -> {sha256, document_id, language, ingested_at} for one bucket."""
+
+    def __init__(self, path: Optional[Path] = None, bucket_id: Optional[int] = None):
+        self.path = Path(path or DEFAULT_MANIFEST_PATH)
+        self.bucket_id = bucket_id
+        self.files: Dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None, bucket_id: Optional[int] = None) -> "IngestManifest":
+        """Load the manifest. A missing file, or one written for another bucket, starts empty."""
+        manifest = cls(path, bucket_id)
+        try:
+            with open(manifest.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if bucket_id is None or data.get("bucket_id") == bucket_id:
+            manifest.files = data.get("files", {})
+        return manifest
+
+    @staticmethod
+    def stored_bucket_id(path: Optional[Path] = None) -> Optional[int]:
+        """Bucket the manifest at `path` was written for, or None."""
+        try:
+            with open(Path(path or DEFAULT_MANIFEST_PATH), "r", encoding="utf-8") as f:
+                return json.load(f).get("bucket_id")
+        except (OSError, ValueError):
+            return None
+
+    def save(self) -> None:
+        """Write atomically so an interrupted run never leaves a truncated manifest."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"bucket_id": self.bucket_id, "files": self.files}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def record(self, file_name: str, sha256: str, document_id: Optional[str], language: Optional[str] = None) -> None:
+        self.files[file_name] = {
+            "sha256": sha256,
+            "document_id": document_id,
+            "language": language,
+            "ingested_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    def forget(self, file_name: str) -> None:
+        self.files.pop(file_name, None)
+
+    def plan(self, local_files: Dict[str, Path], remote_docs: Dict[str, List[str]]) -> dict:
+        """
+        Diff local files against the manifest and the bucket.
+
+        local_files maps file name -> path; remote_docs maps file name ->
+        document IDs currently in the bucket. Returns lists of file names
+        under "new", "changed", "unchanged" and "removed", the hashes of the
+        local files, and "delete_ids": the documents that uploads replace,
+        the documents of removed files, and duplicates left by earlier full
+        re-ingests.
+        """
+        plan = {"new": [], "changed": [], "unchanged": [], "removed": [], "hashes": {}, "delete_ids": []}
+
+        for name, path in sorted(local_files.items()):
+            sha = file_sha256(path)
+            plan["hashes"][name] = sha
+            entry = self.files.get(name)
+            remote_ids = remote_docs.get(name, [])
+
+            if entry and entry["sha256"] == sha and entry.get("document_id") in remote_ids:
+                plan["unchanged"].append(name)
+                plan["delete_ids"].extend(i for i in remote_ids if i != entry["document_id"])
+            elif entry or remote_ids:
+                # Content changed, the document vanished, or it predates the manifest
+                plan["changed"].append(name)
+                plan["delete_ids"].extend(remote_ids)
+            else:
+                plan["new"].append(name)
+
+        for name in sorted(self.files):
+            if name not in local_files:
+                plan["removed"].append(name)
+                plan["delete_ids"].extend(remote_docs.get(name, []))
+
+        plan["delete_ids"] = [i for i in dict.fromkeys(plan["delete_ids"]) if i]
+        return plan
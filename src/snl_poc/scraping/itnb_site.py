@@ -0,0 +1,72 @@
+"""Shared constants and URL helpers for the ITNB scraping scripts."""
+
+import os
+import re
+import sys
+from typing import List, Optional, Tuple
+
+# Repository root, so the scraping scripts can share src.snl_poc modules when run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from src.snl_poc.languages import SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE, LANGUAGE_NAMES  # noqa: E402,F401
+
+BASE_URL = "https://www.itnb.ch"
+
+SCRAPING_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPE_OUT_DIR = os.path.join(SCRAPING_DIR, "scrape_out")
+# "page_type: url" lines written by crawl-itnb.py and read by scrape-itnb.py
+URL_LIST_FILE = os.path.join(SCRAPE_OUT_DIR, "itnb_urls.txt")
+# The URL list shipped with the repository, used until the crawler has run
+SHIPPED_URL_LIST_FILE = os.path.join(SCRAPING_DIR, "scrape-info", "itnb_urls.txt")
+
+_LANGUAGE_PREFIX = re.compile(r"^https?://[^/]+/([a-z]{2})(?=/|$)")
+
+
+def page_language(url: str, default: Optional[str] = None) -> Optional[str]:
+    """Return the language code of an ITNB URL (e.g. 'de' for /de/company)."""
+    match = _LANGUAGE_PREFIX.match(url or "")
+    if match and match.group(1) in SUPPORTED_LANGUAGES:
+        return match.group(1)
+    return default
+
+
+def is_language_root(url: str) -> bool:
+    """True for the language homepages, e.g. https://www.itnb.ch/fr"""
+    return bool(re.match(r"^https?://[^/]+/[a-z]{2}/?$", url or ""))
+
+
+def page_file_stem(url: str) -> str:
+    """
+    Build the file stem used for *_extracted.json files.
+
+    English pages keep their historical names (company_about-itnb), other
+    languages get a language prefix (de_company_about-itnb) so all variants
+    can live next to each other in scrape_out/.
+    """
+    language = page_language(url, DEFAULT_LANGUAGE)
+    path = _LANGUAGE_PREFIX.sub("", url)
+    stem = path.replace(BASE_URL, "").replace('/', '_').strip('_')
+    if not stem:
+        stem = 'homepage'
+    if language != DEFAULT_LANGUAGE:
+        stem = f"{language}_{stem}"
+    return stem
+
+
+def url_list_file() -> Optional[str]:
+    """The crawler's URL list, else the shipped one; None if neither exists."""
+    for path in (URL_LIST_FILE, SHIPPED_URL_LIST_FILE):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def read_url_list(path: str) -> List[Tuple[str, str]]:
+    """(page_type, url) for every "page_type: url" line of a URL list."""
+    pages = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if ': ' in line:
+                page_type, url = line.split(': ', 1)
+                pages.append((page_type, url))
+    return pages
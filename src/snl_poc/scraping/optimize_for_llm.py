@@ -1,6 +1,12 @@
 import json
 import os
 from typing import Dict, List, Any
+from itnb_site import SCRAPE_OUT_DIR
+
+# Written by scrape-itnb.py; the optimized data and README go next to it
+DATA_FILE = os.path.join(SCRAPE_OUT_DIR, 'itnb_all_content.json')
+OUTPUT_FILE = os.path.join(SCRAPE_OUT_DIR, 'itnb_optimized_for_llm.json')
+README_FILE = os.path.join(SCRAPE_OUT_DIR, 'README_LLM_DATA.md')
 
 class PhoenixDataOptimizer:
     """
@@ -319,19 +325,18 @@ class PhoenixDataOptimizer:
 
 def main():
     """Main function to optimize the scraped data"""
-    current_dir = os.path.dirname(__file__)
-    data_file = os.path.join(current_dir, 'scrape_out', 'phoenix_all_content.json')
+    data_file = DATA_FILE
     
     if not os.path.exists(data_file):
         print(f"Data file not found: {data_file}")
-        print("Please run scrape-phoenix.py first to generate the data file.")
+        print("Please run scrape-itnb.py first to generate the data file.")
         return
     
     optimizer = PhoenixDataOptimizer(data_file)
     optimized_data = optimizer.optimize_for_qa()
     
     # Save optimized data
-    output_file = os.path.join(current_dir, 'scrape_out', 'phoenix_optimized_for_llm.json')
+    output_file = OUTPUT_FILE
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(optimized_data, f, ensure_ascii=False, indent=2)
     
@@ -385,7 +390,7 @@ Generated on: {optimizer.raw_data.get('scraped_at', 'Unknown')}
 Total pages: {len(optimizer.pages)}
 """
     
-    readme_file = os.path.join(current_dir, 'scrape_out', 'README_LLM_DATA.md')
+    readme_file = README_FILE
     with open(readme_file, 'w', encoding='utf-8') as f:
         f.write(readme_content)
     
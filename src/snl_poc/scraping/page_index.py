@@ -0,0 +1,118 @@
+"""
+One-pass index of a parsed page for the ITNB extractors.
+
+The extractors used to walk the whole tree once per question: one
+find_all per heading level, one CSS selector pass per call-to-action
+pattern, one find_all(string=...) per keyword group and a find_previous
+per list. PageIndex walks soup.descendants once and records, in document
+order, every tag by name, every string, the call-to-action and contact
+links and each tag's position. Those questions then become list lookups
+and bisects, and find_next / find_previous become binary searches over
+positions.
+
+The lookups reproduce the BeautifulSoup / soupsieve semantics the
+extractors relied on, so their output is unchanged.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, List, Optional
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+# The call-to-action selectors, in order: a[class*="btn"], a[class*="button"],
+# a[href*="contact"], a[href*="buy"], a[href*="learn"], a[href*="chat"]
+CTA_RULES = [("class", "btn"), ("class", "button"), ("href", "contact"),
+             ("href", "buy"), ("href", "learn"), ("href", "chat")]
+
+
+def _attribute_text(tag: Tag, attribute: str) -> Optional[str]:
+    """Attribute value as CSS selectors see it: multi-valued attributes joined by spaces."""
+    value = tag.get(attribute)
+    if isinstance(value, list):
+        return " ".join(value)
+    return value
+
+
+def class_contains(tag: Tag, keywords: Iterable[str]) -> bool:
+    """Same as class_=lambda x: x and any(k in str(x).lower() for k in keywords)."""
+    value = _attribute_text(tag, "class")
+    return bool(value) and any(keyword in value.lower() for keyword in keywords)
+
+
+class PageIndex:
+    def __init__(self, soup: BeautifulSoup):
+        self.soup = soup
+        self._positions: Dict[str, List[int]] = {}
+        self._tags: Dict[str, List[Tag]] = {}
+        self._position_of: Dict[int, int] = {}
+        self.strings: List[NavigableString] = []
+        self.cta_links: List[List[Tag]] = [[] for _ in CTA_RULES]
+        self.href_links: List[Tag] = []
+
+        for position, node in enumerate(soup.descendants):
+            if isinstance(node, Tag):
+                self._position_of[id(node)] = position
+                self._positions.setdefault(node.name, []).append(position)
+                self._tags.setdefault(node.name, []).append(node)
+                if node.name == "a":
+                    self._index_link(node)
+            elif isinstance(node, NavigableString):
+                self.strings.append(node)
+
+    def _index_link(self, link: Tag) -> None:
+        if link.get("href") is not None:
+            self.href_links.append(link)
+        for matches, (attribute, needle) in zip(self.cta_links, CTA_RULES):
+            value = _attribute_text(link, attribute)
+            if value and needle in value:
+                matches.append(link)
+
+    def tags(self, *names: str) -> List[Tag]:
+        """Tags with any of the names, in document order (find_all(names))."""
+        if len(names) == 1:
+            return list(self._tags.get(names[0], []))
+        merged = heapq.merge(*(zip(self._positions.get(name, []), self._tags.get(name, [])) for name in names),
+                             key=lambda entry: entry[0])
+        return [tag for _, tag in merged]
+
+    def tags_with_class(self, names: Iterable[str], keywords: Iterable[str]) -> List[Tag]:
+        """find_all(names, class_=...) for a class containing any of the keywords."""
+        keywords = list(keywords)
+        return [tag for tag in self.tags(*names) if class_contains(tag, keywords)]
+
+    def tags_with_string(self, names: Iterable[str], predicate: Callable) -> List[Tag]:
+        """find_all(names, string=predicate): tags whose .string matches."""
+        return [tag for tag in self.tags(*names) if predicate(tag.string)]
+
+    def next_tag(self, tag: Tag, names: Iterable[str]) -> Optional[Tag]:
+        """tag.find_next(names): first such tag after tag's start, descendants included."""
+        position = self._position_of[id(tag)]
+        best = None
+        for name in names:
+            positions = self._positions.get(name, [])
+            i = bisect_right(positions, position)
+            if i < len(positions) and (best is None or positions[i] < best[0]):
+                best = (positions[i], self._tags[name][i])
+        return best[1] if best else None
+
+    def previous_tag(self, tag: Tag, names: Iterable[str]) -> Optional[Tag]:
+        """tag.find_previous(names): last such tag before tag's start, ancestors included."""
+        position = self._position_of[id(tag)]
+        best = None
+        for name in names:
+            positions = self._positions.get(name, [])
+            i = bisect_left(positions, position) - 1
+            if i >= 0 and (best is None or positions[i] > best[0]):
+                best = (positions[i], self._tags[name][i])
+        return best[1] if best else None
+
+    def match_strings(self, predicates: Dict[str, Callable]) -> Dict[str, List[NavigableString]]:
+        """find_all(string=predicate) for several predicates in one pass over the strings."""
+        hits: Dict[str, List[NavigableString]] = {key: [] for key in predicates}
+        checks = list(predicates.items())
+        for text in self.strings:
+            for key, predicate in checks:
+                if predicate(text):
+                    hits[key].append(text)
+        return hits
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Make-like orchestrator for refreshing the ITNB knowledge base.
+
+The stages, the scripts they run and what they produce:
+
+    crawl     crawl-itnb.py                 scrape_out/itnb_urls.txt, html_archive/
+    extract   scrape-itnb.py --from-archive scrape_out/*_extracted.json, itnb_all_content.json
+    optimize  optimize_for_llm.py           scrape_out/itnb_optimized_for_llm.json
+    clean     clean_scrape_out.py           scrape_out_cleaned/
+    dedupe    dedupe_corpus.py              scrape_out_deduped/
+    ingest    ingest_itnb_to_groundx.py     the GroundX bucket
+
+    crawl -> extract -> optimize
+                     -> clean -> dedupe -> ingest
+
+A stage runs only when it is stale: it never succeeded, an output is
+missing, or the SHA-256 of its command, its input files (the script itself
+included) or its output files differs from its last successful run. A stage
+whose upstream re-ran but produced identical files is therefore skipped.
+The crawl reads the live site and always runs, unless --offline.
+
+Inside a stage only changed pages are processed: the crawler revalidates
+through the HTTP cache, extraction (--incremental) skips pages whose
+archived HTML is unchanged, cleaning skips unchanged files and ingestion
+uploads only what its manifest says changed. Stages whose dependencies are
+done run in parallel (optimize and clean); their output is prefixed with
+the stage name. A timing table is printed at the end.
+
+Publishing is explicit: the default targets stop at the local artifacts
+(optimize and dedupe); the GroundX bucket is only touched with the ingest
+target.
+
+    python pipeline.py                  # crawl, then every stale local stage
+    python pipeline.py ingest           # ... and upload the changes to GroundX
+    python pipeline.py --offline clean  # re-extract and clean from the HTML archive
+    python pipeline.py -n               # list the stale stages without running them
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from glob import glob
+from typing import Dict, List, Optional, Sequence
+
+from ingest_manifest import file_sha256
+from itnb_site import DEFAULT_LANGUAGE, SCRAPING_DIR
+
+# The scripts import src.snl_poc.tools from the repository root
+REPO_ROOT = os.path.abspath(os.path.join(SCRAPING_DIR, "..", "..", ".."))
+STATE_FILE = os.path.join(SCRAPING_DIR, "pipeline_state.json")
+
+
+class Stage:
+    """
+    One step of the pipeline: a script run from the scraping directory.
+    `inputs` and `outputs` are paths or globs relative to it.
+    """
+
+    def __init__(self, name: str, command: Sequence[str], deps: Sequence[str] = (),
+                 inputs: Sequence[str] = (), outputs: Sequence[str] = (), always: bool = False):
+        self.name = name
+        self.command = [sys.executable] + list(command)
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        # Reads something that cannot be hashed (the live site)
+        self.always = always
+
+    def input_stamp(self) -> str:
+        """Hash of the command and the content of every input."""
+        return hashlib.sha256(json.dumps({
+            "command": self.command[1:],
+            "inputs": hash_files(self.inputs),
+        }, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def missing_outputs(self) -> List[str]:
+        return [pattern for pattern in self.outputs if not glob(os.path.join(SCRAPING_DIR, pattern))]
+
+
+def hash_files(patterns: Sequence[str]) -> Dict[str, Optional[str]]:
+    """Relative path -> SHA-256 of every file matching the patterns (None for a pattern without files)."""
+    hashes = {}
+    for pattern in patterns:
+        paths = sorted(glob(os.path.join(SCRAPING_DIR, pattern)))
+        if not paths:
+            hashes[pattern] = None
+        for path in paths:
+            hashes[os.path.relpath(path, SCRAPING_DIR)] = file_sha256(path)
+    return hashes
+
+
+def build_stages(args) -> Dict[str, Stage]:
+    crawl = ["crawl-itnb.py", "--max-pages", str(args.max_pages), "--languages", args.languages,
+             "--max-age", str(args.max_age)]
+    extract = ["scrape-itnb.py", "--from-archive", "--incremental"]
+    if args.parser:
+        crawl += ["--parser", args.parser]
+        extract += ["--parser", args.parser]
+    corpus = ["scrape_out/*_extracted.json", "scrape_out/itnb_all_content.json"]
+    stages = [
+        Stage("crawl", crawl, always=True,
+              outputs=["scrape_out/itnb_urls.txt", "scrape_out/itnb_crawl_summary.json", "html_archive/index.jsonl"]),
+        Stage("extract", extract, deps=["crawl"],
+              inputs=["scrape_out/itnb_urls.txt", "scrape-info/itnb_urls.txt", "html_archive/index.jsonl",
+                      "scrape-itnb.py", "page_index.py", "itnb_site.py", "html_parser.py"],
+              outputs=corpus),
+        Stage("optimize", ["optimize_for_llm.py"], deps=["extract"],
+              inputs=["scrape_out/itnb_all_content.json", "optimize_for_llm.py"],
+              outputs=["scrape_out/itnb_optimized_for_llm.json", "scrape_out/README_LLM_DATA.md"]),
+        # Only the files ingest reads, so clean does not wait for optimize
+        Stage("clean", ["clean_scrape_out.py", "--pattern", "*_extracted.json", "--pattern", "itnb_all_content.json"],
+              deps=["extract"], inputs=corpus + ["clean_scrape_out.py", "transform_pipeline.py"],
+              outputs=["scrape_out_cleaned/*_extracted.json", "scrape_out_cleaned/itnb_all_content.json"]),
+        # Reads every page: a change anywhere can move a block's canonical page
+        Stage("dedupe", ["dedupe_corpus.py"], deps=["clean"],
+              inputs=["scrape_out_cleaned/*.json", "dedupe_corpus.py"],
+              outputs=["scrape_out_deduped/*_extracted.json"]),
+        Stage("ingest", ["ingest_itnb_to_groundx.py", "--data-dir", "scrape_out_deduped"], deps=["dedupe"],
+              inputs=["scrape_out_deduped/*_extracted.json", "scrape_out_deduped/itnb_all_content.json",
+                      "ingest_itnb_to_groundx.py"]),
+    ]
+    return {stage.name: stage for stage in stages}
+
+
+class Pipeline:
+    def __init__(self, stages: Dict[str, Stage], state_path: str = STATE_FILE):
+        self.stages = stages
+        self.state_path = state_path
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+        self._lock = threading.Lock()
+        self.report: Dict[str, dict] = {}
+
+    def selected(self, targets: Sequence[str]) -> List[str]:
+        """The targets and everything they depend on, in dependency order."""
+        order: List[str] = []
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            for dep in self.stages[name].deps:
+                visit(dep)
+            order.append(name)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    def stale_reason(self, stage: Stage, force: bool) -> Optional[str]:
+        """Why the stage has to run, or None if it is up to date."""
+        previous = self.state.get(stage.name)
+        if force:
+            return "forced"
+        if stage.always:
+            return "reads the live site"
+        if previous is None:
+            return "never ran"
+        if stage.missing_outputs():
+            return f"missing {', '.join(stage.missing_outputs())}"
+        if previous["inputs"] != stage.input_stamp():
+            return "inputs changed"
+        if previous["outputs"] != hash_files(stage.outputs):
+            return "outputs changed"
+        return None
+
+    def _log(self, name: str, line: str) -> None:
+        with self._lock:
+            print(f"[{name}] {line}", flush=True)
+
+    def run_stage(self, stage: Stage, force: bool, dry_run: bool) -> str:
+        """Run the stage if it is stale; returns its status for the report."""
+        start = time.time()
+        reason = self.stale_reason(stage, force)
+        if reason is None:
+            status = "up to date"
+        elif dry_run:
+            status = f"stale: {reason}"
+        else:
+            self._log(stage.name, f"running ({reason}): {' '.join(stage.command[1:])}")
+            # Taken before running: an input written meanwhile makes the next run stale again
+            stamp = stage.input_stamp()
+            env = dict(os.environ, PYTHONUNBUFFERED="1",
+                       PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+            process = subprocess.Popen(stage.command, cwd=SCRAPING_DIR, env=env, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="replace")
+            for line in process.stdout:
+                self._log(stage.name, line.rstrip())
+            returncode = process.wait()
+            missing = stage.missing_outputs()
+            if returncode != 0:
+                status = f"failed (exit {returncode})"
+            elif missing:
+                status = f"failed (no {', '.join(missing)})"
+            else:
+                status = "ran"
+                with self._lock:
+                    self.state[stage.name] = {
+                        "inputs": stamp,
+                        "outputs": hash_files(stage.outputs),
+                        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    }
+                    self._save_state()
+        self.report[stage.name] = {"status": status, "seconds": time.time() - start}
+        return status
+
+    def _save_state(self) -> None:
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def run(self, targets: Sequence[str], jobs: int = 0, force: bool = False, dry_run: bool = False,
+            skip: Sequence[str] = ()) -> bool:
+        """
+        Run the stale stages needed for the targets, each as soon as its
+        dependencies succeeded, up to `jobs` at a time (0 = all that are
+        ready). Stages in `skip` count as done without running.
+        """
+        order = self.selected(targets)
+        waiting = {name: set(self.stages[name].deps) & set(order) for name in order}
+        jobs = jobs or len(order)
+        ok = True
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            running = {}
+            while waiting or running:
+                for name in [name for name, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    if name in skip:
+                        self.report[name] = {"status": "skipped", "seconds": 0.0}
+                        self._finished(name, waiting)
+                        continue
+                    running[pool.submit(self.run_stage, self.stages[name], force, dry_run)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.result().startswith("failed"):
+                        ok = False
+                        self._blocked(name, waiting)
+                    else:
+                        self._finished(name, waiting)
+        return ok
+
+    @staticmethod
+    def _finished(name: str, waiting: Dict[str, set]) -> None:
+        for deps in waiting.values():
+            deps.discard(name)
+
+    def _blocked(self, name: str, waiting: Dict[str, set]) -> None:
+        for downstream in [other for other, deps in waiting.items() if name in deps]:
+            if downstream in waiting:
+                del waiting[downstream]
+                self.report[downstream] = {"status": f"not run ({name} failed)", "seconds": 0.0}
+                self._blocked(downstream, waiting)
+
+    def print_report(self, wall_seconds: float) -> None:
+        print(f"\n{'stage':<10} {'status':<36} {'seconds':>8}")
+        for name in self.stages:
+            if name in self.report:
+                entry = self.report[name]
+                print(f"{name:<10} {entry['status']:<36} {entry['seconds']:>8.1f}")
+        busy = sum(entry["seconds"] for entry in self.report.values())
+        print(f"{'total':<10} {'':<36} {wall_seconds:>8.1f}  ({busy:.1f}s of stage time)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the ITNB knowledge base, re-running only stale stages",
+                                     epilog="Stages: crawl, extract, optimize, clean, dedupe, ingest")
+    parser.add_argument("targets", nargs="*", default=["optimize", "dedupe"],
+                        help="Stages to bring up to date, with everything they depend on "
+                             "(default: optimize and dedupe; pass ingest to publish to GroundX)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Do not crawl; extract from the pages already in the HTML archive")
+    parser.add_argument("--force", action="store_true", help="Run the selected stages even if they are up to date")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Only report which stages are stale")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Stages run at the same time (0 = all ready ones)")
+    parser.add_argument("--max-pages", type=int, default=30, help="Crawl: maximum number of pages")
+    parser.add_argument("--languages", default=DEFAULT_LANGUAGE, help="Crawl: comma-separated language codes")
+    parser.add_argument("--max-age", type=float, default=0,
+                        help="Crawl: seconds a cached page is used without asking the site "
+                             "(default 0: revalidate every page, unchanged ones cost a 304)")
+    parser.add_argument("--parser", default=None, help="HTML parser backend for crawl and extract")
+    args = parser.parse_args()
+
+    stages = build_stages(args)
+    unknown = [target for target in args.targets if target not in stages]
+    if unknown:
+        parser.error(f"unknown stage(s) {', '.join(unknown)}; expected one of {', '.join(stages)}")
+
+    pipeline = Pipeline(stages)
+    start = time.time()
+    ok = pipeline.run(args.targets, jobs=args.jobs, force=args.force, dry_run=args.dry_run,
+                      skip=["crawl"] if args.offline else [])
+    pipeline.print_report(time.time() - start)
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,117 @@
+"""Per-host rate limiting and robots.txt handling for the async crawlers."""
+
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, at most `burst` banked.
+
+    acquire() waits until a token is available, so concurrent requests to
+    the same host are spread out to the configured rate.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host. A robots.txt Crawl-delay lowers that host's rate."""
+
+    def __init__(self, rate: float = 2.0, burst: int = 2):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def set_crawl_delay(self, host: str, delay: Optional[float]) -> None:
+        if delay and delay > 0:
+            self._buckets[host] = TokenBucket(min(self.rate, 1.0 / delay), burst=1)
+
+    def bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    async def acquire(self, url: str) -> None:
+        await self.bucket(urlparse(url).netloc).acquire()
+
+
+async def load_robots(client: httpx.AsyncClient, base_url: str) -> RobotFileParser:
+    """Fetch and parse robots.txt. A missing or unreachable file allows everything."""
+    parser = RobotFileParser()
+    robots_url = f"{base_url.rstrip('/')}/robots.txt"
+    parser.set_url(robots_url)
+    try:
+        resp = await client.get(robots_url, timeout=10)
+        if resp.status_code == 200:
+            parser.parse(resp.text.splitlines())
+        else:
+            parser.allow_all = True
+    except httpx.HTTPError:
+        parser.allow_all = True
+    return parser
+
+
+async def fetch_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    limiter: HostRateLimiter,
+    retries: int = 3,
+    backoff_base: float = 1.0,
+    backoff_max: float = 30.0,
+    headers: Optional[Dict[str, str]] = None,
+) -> httpx.Response:
+    """
+    GET url through the host's rate limiter.
+
+    Transport errors, 429 and 5xx responses are retried with full-jitter
+    exponential backoff (Retry-After wins when present). Other HTTP errors
+    raise immediately; 304 Not Modified is returned for conditional requests.
+    """
+    attempt = 0
+    while True:
+        await limiter.acquire(url)
+        try:
+            resp = await client.get(url, headers=headers)
+            if resp.status_code == 304:
+                return resp
+            if resp.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                resp.raise_for_status()
+                return resp
+            retry_after = resp.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else None
+        except httpx.TransportError:
+            if attempt >= retries:
+                raise
+            delay = None
+        if delay is None:
+            delay = random.uniform(0, min(backoff_max, backoff_base * (2 ** attempt)))
+        attempt += 1
+        print(f"Retrying {url} in {delay:.1f}s (attempt {attempt}/{retries})")
+        await asyncio.sleep(delay)
@@ -1,15 +1,28 @@
 import requests
 from bs4 import BeautifulSoup, Tag
+import hashlib
 import json
 import time
 import os
-from typing import Dict, List, Any
+import sys
+import argparse
+import importlib
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
 import re
 from urllib.parse import urljoin
+from itnb_site import (BASE_URL, DEFAULT_LANGUAGE, SCRAPING_DIR, page_language, page_file_stem,
+                       read_url_list, url_list_file)
+from http_cache import HTTPCache, cached_get
+from html_parser import parse_html, resolve_backend
+from page_index import PageIndex
+from html_archive import HTMLArchive
 
 class ITNBScraper:
-    def __init__(self):
-        self.base_url = "https://www.itnb.ch"
+    def __init__(self, use_cache: bool = True, parser: Optional[str] = None,
+                 archive: Optional[HTMLArchive] = None):
+        self.base_url = BASE_URL
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
@@ -17,24 +30,49 @@ class ITNBScraper:
         self.session.headers.update(self.headers)
         self.local_dir = os.path.join(os.path.dirname(__file__), 'scrape_out')
         os.makedirs(self.local_dir, exist_ok=True)
+        # Shared with the crawler: pages it fetched recently are not downloaded again
+        self.cache = HTTPCache() if use_cache else None
+        # HTML parser backend (see html_parser.py); html.parser unless HTML_PARSER or parser picks another
+        self.parser = resolve_backend(parser)
+        # Downloaded pages are archived so extraction can be re-run offline
+        self.archive = archive
     
     def get_soup(self, url: str) -> BeautifulSoup:
         """Download and parse HTML from URL"""
+        return parse_html(self.get_html(url), self.parser)
+
+    def get_html(self, url: str) -> str:
+        """Download HTML from URL; an empty page if the download fails"""
         try:
-            resp = self.session.get(url, timeout=15)
-            resp.raise_for_status()
+            if self.cache:
+                resp = cached_get(self.session, url, self.cache, timeout=15)
+            else:
+                resp = self.session.get(url, timeout=15)
+                resp.raise_for_status()
             html = resp.text
-            print(f"Downloaded: {url}")
-            time.sleep(1)  # Be polite
-            return BeautifulSoup(html, 'html.parser')
+            if self.archive is not None:
+                self.archive.add(url, resp.content, resp.status_code, resp.headers, resp.encoding)
+            if getattr(resp, 'from_cache', False):
+                print(f"From cache: {url}")
+            else:
+                print(f"Downloaded: {url}")
+                time.sleep(1)  # Be polite
+            return html
         except Exception as e:
             print(f"Error downloading {url}: {e}")
-            return BeautifulSoup("", 'html.parser')
+            return ""
+
+    def extract_common_elements(self, soup: BeautifulSoup, url: str, index: Optional[PageIndex] = None) -> Dict[str, Any]:
+        """
+        Extract common elements present on all pages
 
-    def extract_common_elements(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
-        """Extract common elements present on all pages"""
+        `index` is the page's PageIndex; pass it when the caller needs one
+        too, so the tree is walked only once.
+        """
+        index = index if index is not None else PageIndex(soup)
         data = {
             "url": url,
+            "language": page_language(url, DEFAULT_LANGUAGE),
             "title": soup.title.string.strip() if soup.title and soup.title.string else "",
             "meta_description": "",
             "headings": [],
@@ -45,40 +83,38 @@ class ITNBScraper:
         }
         
         # Meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        meta_desc = next((m for m in index.tags('meta') if m.get('name') == 'description'), None)
         if meta_desc:
             data["meta_description"] = meta_desc.get('content', '')
         
         # Headings hierarchy
         for level in ['h1', 'h2', 'h3', 'h4']:
-            headings = soup.find_all(level)
-            for h in headings:
+            for h in index.tags(level):
                 data["headings"].append({
                     "level": level,
                     "text": h.get_text(strip=True)
                 })
         
-        # Main content - look for main content areas
+        # Main content - look for main content areas. Containers nested in one
+        # already taken (a <section> inside <main>) are skipped: their text is
+        # part of the outer container's, and taking it again duplicated it.
         main_content_parts = []
-        for container in soup.find_all(['main', 'article', 'section']):
+        taken = None
+        for container in index.tags('main', 'article', 'section'):
+            if taken is not None and any(parent is taken for parent in container.parents):
+                continue
             # Skip navigation and header/footer sections
-            if not any(cls in str(container.get('class', [])).lower() 
+            if not any(cls in str(container.get('class', [])).lower()
                       for cls in ['nav', 'header', 'footer', 'menu']):
                 content = container.get_text(separator=' ', strip=True)
                 if content and len(content) > 100:  # Only substantial content
                     main_content_parts.append(content)
-        
+                    taken = container
+
         data["main_content"] = ' '.join(main_content_parts)
         
-        # Call-to-action buttons and links
-        cta_selectors = [
-            'a[class*="btn"]', 'a[class*="button"]', 
-            'a[href*="contact"]', 'a[href*="buy"]', 
-            'a[href*="learn"]', 'a[href*="chat"]'
-        ]
-        
-        for selector in cta_selectors:
-            ctas = soup.select(selector)
+        # Call-to-action buttons and links, grouped by selector (see page_index.CTA_RULES)
+        for ctas in index.cta_links:
             for cta in ctas:
                 if isinstance(cta, Tag):
                     data["call_to_actions"].append({
@@ -88,8 +124,7 @@ class ITNBScraper:
                     })
         
         # Contact information
-        contact_links = soup.find_all('a', href=True)
-        for link in contact_links:
+        for link in index.href_links:
             href = link.get('href', '')
             if href.startswith('mailto:'):
                 data["contact_info"]["email"] = href.replace('mailto:', '')
@@ -98,21 +133,20 @@ class ITNBScraper:
         
         return data
 
-    def scrape_homepage(self, url: str) -> Dict[str, Any]:
+    def scrape_homepage(self, url: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
         """Extract homepage-specific content"""
-        soup = self.get_soup(url)
-        data = self.extract_common_elements(soup, url)
+        soup = soup if soup is not None else self.get_soup(url)
+        index = PageIndex(soup)
+        data = self.extract_common_elements(soup, url, index)
         
         # Main value proposition
-        hero_section = soup.find(['section', 'div'], class_=lambda x: x and 'hero' in str(x).lower())
+        hero_section = next(iter(index.tags_with_class(['section', 'div'], ['hero'])), None)
         if hero_section:
             data["value_proposition"] = hero_section.get_text(separator=' ', strip=True)
         
         # Service/product highlights from homepage
         services = []
-        service_sections = soup.find_all(['section', 'div'], class_=lambda x: x and any(
-            keyword in str(x).lower() for keyword in ['service', 'product', 'solution']
-        ))
+        service_sections = index.tags_with_class(['section', 'div'], ['service', 'product', 'solution'])
         
         for section in service_sections:
             if isinstance(section, Tag):
@@ -129,10 +163,11 @@ class ITNBScraper:
         data["page_type"] = "homepage"
         return data
 
-    def scrape_product_service(self, url: str) -> Dict[str, Any]:
+    def scrape_product_service(self, url: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
         """Extract product/service page content"""
-        soup = self.get_soup(url)
-        data = self.extract_common_elements(soup, url)
+        soup = soup if soup is not None else self.get_soup(url)
+        index = PageIndex(soup)
+        data = self.extract_common_elements(soup, url, index)
         
         # Product/service specific details
         product_info = {
@@ -144,9 +179,9 @@ class ITNBScraper:
         }
         
         # Look for feature lists
-        feature_lists = soup.find_all(['ul', 'ol'])
+        feature_lists = index.tags('ul', 'ol')
         for ul in feature_lists:
-            parent_heading = ul.find_previous(['h1', 'h2', 'h3', 'h4'])
+            parent_heading = index.previous_tag(ul, ['h1', 'h2', 'h3', 'h4'])
             if parent_heading and any(keyword in parent_heading.get_text().lower() 
                                     for keyword in ['feature', 'benefit', 'capability']):
                 for li in ul.find_all('li'):
@@ -157,10 +192,17 @@ class ITNBScraper:
                         elif 'benefit' in parent_heading.get_text().lower():
                             product_info["benefits"].append(feature_text)
         
-        # Look for technical specifications
-        spec_sections = soup.find_all(string=lambda text: text and any(
-            keyword in text.lower() for keyword in ['specification', 'requirement', 'technical']
-        ))
+        # Technical specifications and pricing mentions, from one pass over the page text
+        keyword_hits = index.match_strings({
+            "specs": lambda text: text and any(
+                keyword in text.lower() for keyword in ['specification', 'requirement', 'technical']
+            ),
+            "pricing": lambda text: text and any(
+                keyword in text.lower() for keyword in ['price', 'cost', 'pricing', 'fee', '$', 'chf', 'eur']
+            ),
+        })
+        
+        spec_sections = keyword_hits["specs"]
         for spec_text in spec_sections:
             parent = spec_text.parent if hasattr(spec_text, 'parent') else None
             if parent:
@@ -169,9 +211,7 @@ class ITNBScraper:
                     product_info["technical_specs"].append(content)
         
         # Extract pricing mentions
-        pricing_text = soup.find_all(string=lambda text: text and any(
-            keyword in text.lower() for keyword in ['price', 'cost', 'pricing', 'fee', '$', 'chf', 'eur']
-        ))
+        pricing_text = keyword_hits["pricing"]
         if pricing_text:
             product_info["pricing_info"] = ' '.join([str(p).strip() for p in pricing_text[:3]])
         
@@ -179,10 +219,11 @@ class ITNBScraper:
         data["page_type"] = "product_service"
         return data
 
-    def scrape_solution(self, url: str) -> Dict[str, Any]:
+    def scrape_solution(self, url: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
         """Extract solution page content"""
-        soup = self.get_soup(url)
-        data = self.extract_common_elements(soup, url)
+        soup = soup if soup is not None else self.get_soup(url)
+        index = PageIndex(soup)
+        data = self.extract_common_elements(soup, url, index)
         
         solution_info = {
             "industry": "",
@@ -199,29 +240,29 @@ class ITNBScraper:
             solution_info["use_case"] = url.split('/use-cases/')[-1].replace('-', ' ').title()
         
         # Look for challenge sections
-        challenge_sections = soup.find_all(['h2', 'h3'], string=lambda text: text and any(
+        challenge_sections = index.tags_with_string(['h2', 'h3'], lambda text: text and any(
             keyword in text.lower() for keyword in ['challenge', 'problem', 'issue', 'pain']
         ))
         for section in challenge_sections:
-            next_content = section.find_next(['p', 'ul', 'div'])
+            next_content = index.next_tag(section, ['p', 'ul', 'div'])
             if next_content:
                 solution_info["challenges_addressed"].append(next_content.get_text(strip=True))
         
         # Look for solution approach
-        solution_sections = soup.find_all(['h2', 'h3'], string=lambda text: text and any(
+        solution_sections = index.tags_with_string(['h2', 'h3'], lambda text: text and any(
             keyword in text.lower() for keyword in ['solution', 'approach', 'how we']
         ))
         for section in solution_sections:
-            next_content = section.find_next(['p', 'div'])
+            next_content = index.next_tag(section, ['p', 'div'])
             if next_content:
                 solution_info["solution_approach"] = next_content.get_text(strip=True)
         
         # Look for outcomes/results
-        outcome_sections = soup.find_all(['h2', 'h3'], string=lambda text: text and any(
+        outcome_sections = index.tags_with_string(['h2', 'h3'], lambda text: text and any(
             keyword in text.lower() for keyword in ['outcome', 'result', 'benefit', 'impact']
         ))
         for section in outcome_sections:
-            next_content = section.find_next(['p', 'ul'])
+            next_content = index.next_tag(section, ['p', 'ul'])
             if next_content:
                 if next_content.name == 'ul':
                     outcomes = [li.get_text(strip=True) for li in next_content.find_all('li')]
@@ -233,10 +274,11 @@ class ITNBScraper:
         data["page_type"] = "solution"
         return data
 
-    def scrape_company(self, url: str) -> Dict[str, Any]:
+    def scrape_company(self, url: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
         """Extract company page content"""
-        soup = self.get_soup(url)
-        data = self.extract_common_elements(soup, url)
+        soup = soup if soup is not None else self.get_soup(url)
+        index = PageIndex(soup)
+        data = self.extract_common_elements(soup, url, index)
         
         company_info = {
             "company_description": "",
@@ -248,29 +290,31 @@ class ITNBScraper:
         }
         
         # Company description
-        about_sections = soup.find_all(['p', 'div'], string=lambda text: text and len(str(text)) > 100)
+        about_sections = index.tags_with_string(['p', 'div'], lambda text: text and len(str(text)) > 100)
         if about_sections:
             company_info["company_description"] = about_sections[0].get_text(strip=True)
         
         # Mission/vision statements
         mission_keywords = ['mission', 'vision', 'values', 'commitment']
         for keyword in mission_keywords:
-            mission_heading = soup.find(['h1', 'h2', 'h3'], string=lambda text: text and keyword in text.lower())
+            mission_heading = next(iter(index.tags_with_string(
+                ['h1', 'h2', 'h3'], lambda text: text and keyword in text.lower()
+            )), None)
             if mission_heading:
-                next_content = mission_heading.find_next(['p', 'div'])
+                next_content = index.next_tag(mission_heading, ['p', 'div'])
                 if next_content:
                     company_info["mission_vision"] = next_content.get_text(strip=True)
                     break
         
         # Team information (if on team page)
         if '/team' in url:
-            team_members = soup.find_all(['div', 'section'], class_=lambda x: x and 'team' in str(x).lower())
+            team_members = index.tags_with_class(['div', 'section'], ['team'])
             for member_section in team_members:
                 name_elem = member_section.find(['h3', 'h4', 'h5'])
                 if name_elem:
                     name = name_elem.get_text(strip=True)
                     title = ""
-                    title_elem = name_elem.find_next(['p', 'span', 'div'])
+                    title_elem = index.next_tag(name_elem, ['p', 'span', 'div'])
                     if title_elem:
                         title = title_elem.get_text(strip=True)
                     company_info["team_info"].append({"name": name, "title": title})
@@ -279,17 +323,20 @@ class ITNBScraper:
         if '/certificates' in url or '/compliance' in url:
             cert_text = soup.get_text()
             cert_keywords = ['ISO', 'certified', 'compliance', 'standard', 'audit']
+            cert_hits = index.match_strings({
+                keyword: (lambda text, keyword=keyword: text and keyword in str(text)) for keyword in cert_keywords
+            })
             for keyword in cert_keywords:
                 if keyword in cert_text:
                     # Find surrounding context
-                    cert_sections = soup.find_all(string=lambda text: text and keyword in str(text))
+                    cert_sections = cert_hits[keyword]
                     for cert in cert_sections[:5]:  # Limit to first 5 matches
                         if hasattr(cert, 'parent'):
                             company_info["certifications"].append(cert.parent.get_text(strip=True))
         
         # Contact details (if on contact page)
         if '/contact' in url:
-            address_blocks = soup.find_all(['div', 'section'], class_=lambda x: x and 'address' in str(x).lower())
+            address_blocks = index.tags_with_class(['div', 'section'], ['address'])
             for block in address_blocks:
                 company_info["contact_details"]["address"] = block.get_text(strip=True)
         
@@ -297,10 +344,11 @@ class ITNBScraper:
         data["page_type"] = "company"
         return data
 
-    def scrape_partner(self, url: str) -> Dict[str, Any]:
+    def scrape_partner(self, url: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
         """Extract partner/ecosystem page content"""
-        soup = self.get_soup(url)
-        data = self.extract_common_elements(soup, url)
+        soup = soup if soup is not None else self.get_soup(url)
+        index = PageIndex(soup)
+        data = self.extract_common_elements(soup, url, index)
         
         partner_info = {
             "partner_types": [],
@@ -310,12 +358,12 @@ class ITNBScraper:
         }
         
         # Partner categories
-        partner_headings = soup.find_all(['h2', 'h3'], string=lambda text: text and 'partner' in text.lower())
+        partner_headings = index.tags_with_string(['h2', 'h3'], lambda text: text and 'partner' in text.lower())
         for heading in partner_headings:
             partner_info["partner_types"].append(heading.get_text(strip=True))
         
         # Individual partners (look for logos or names)
-        partner_sections = soup.find_all(['div', 'section'], class_=lambda x: x and 'partner' in str(x).lower())
+        partner_sections = index.tags_with_class(['div', 'section'], ['partner'])
         for section in partner_sections:
             partner_names = section.find_all(['img', 'h4', 'h5'])
             for name_elem in partner_names:
@@ -328,7 +376,7 @@ class ITNBScraper:
         
         # Success stories (if on success stories page)
         if '/success-stories' in url:
-            story_sections = soup.find_all(['div', 'article'], class_=lambda x: x and 'story' in str(x).lower())
+            story_sections = index.tags_with_class(['div', 'article'], ['story'])
             for story in story_sections:
                 story_title = story.find(['h2', 'h3', 'h4'])
                 if story_title:
@@ -342,10 +390,11 @@ class ITNBScraper:
         data["page_type"] = "partner"
         return data
 
-    def scrape_news(self, url: str) -> Dict[str, Any]:
+    def scrape_news(self, url: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
         """Extract news page content"""
-        soup = self.get_soup(url)
-        data = self.extract_common_elements(soup, url)
+        soup = soup if soup is not None else self.get_soup(url)
+        index = PageIndex(soup)
+        data = self.extract_common_elements(soup, url, index)
         
         news_info = {
             "articles": [],
@@ -354,9 +403,7 @@ class ITNBScraper:
         }
         
         # News articles
-        article_sections = soup.find_all(['article', 'div'], class_=lambda x: x and any(
-            keyword in str(x).lower() for keyword in ['news', 'article', 'post']
-        ))
+        article_sections = index.tags_with_class(['article', 'div'], ['news', 'article', 'post'])
         
         for article in article_sections:
             title_elem = article.find(['h1', 'h2', 'h3'])
@@ -376,8 +423,13 @@ class ITNBScraper:
         data["page_type"] = "news"
         return data
 
-    def scrape_page_by_type(self, url: str, page_type: str) -> Dict[str, Any]:
-        """Route to appropriate scraper based on page type"""
+    def scrape_page_by_type(self, url: str, page_type: str, soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
+        """
+        Route to appropriate scraper based on page type
+
+        Pass `soup` to extract from an already parsed page instead of
+        downloading it again.
+        """
         scraper_map = {
             "homepage": self.scrape_homepage,
             "product_service": self.scrape_product_service,
@@ -391,66 +443,291 @@ class ITNBScraper:
         
         if scraper_func == self.extract_common_elements:
             # Fallback for general pages
-            soup = self.get_soup(url)
+            soup = soup if soup is not None else self.get_soup(url)
             data = self.extract_common_elements(soup, url)
             data["page_type"] = "general"
             return data
         else:
-            return scraper_func(url)
+            return scraper_func(url, soup)
+
+
+    def save_page_result(self, result: Dict[str, Any]) -> None:
+        """Write one page's extraction (non-English pages get a language prefix)"""
+        safe_filename = page_file_stem(result["url"])
+        individual_file = os.path.join(self.local_dir, f"{safe_filename}_extracted.json")
+        with open(individual_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    def load_page_result(self, url: str) -> Optional[Dict[str, Any]]:
+        """Extraction saved by an earlier run, if any"""
+        individual_file = os.path.join(self.local_dir, f"{page_file_stem(url)}_extracted.json")
+        try:
+            with open(individual_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_combined(self, results: List[Dict[str, Any]]) -> str:
+        combined_file = os.path.join(self.local_dir, "itnb_all_content.json")
+        with open(combined_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "total_pages": len(results),
+                "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "pages": results
+            }, f, ensure_ascii=False, indent=2)
+        return combined_file
+
+# Per-process scraper of the extraction pool, created once by _init_worker
+_worker_scraper = None
+
+def _init_worker(parser: Optional[str]) -> None:
+    global _worker_scraper
+    _worker_scraper = ITNBScraper(use_cache=False, parser=parser)
+
+def _extract_task(task) -> Dict[str, Any]:
+    url, page_type, html = task
+    try:
+        soup = parse_html(html, _worker_scraper.parser)
+        return {"result": _worker_scraper.scrape_page_by_type(url, page_type, soup)}
+    except Exception as e:
+        return {"error": str(e)}
+
+def extract_pages(pages: List[tuple], workers: int = 1, chunksize: Optional[int] = None,
+                  parser: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Parse and extract (url, page_type, html) tuples, on `workers` processes
+    (0 = one per CPU). Each entry of the returned list is {"result": ...}
+    or {"error": ...}, in the order of `pages` whichever worker finishes
+    first. `chunksize` pages are sent to a worker at a time (default: about
+    four chunks per worker).
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(pages) <= 1:
+        _init_worker(parser)
+        return [_extract_task(task) for task in pages]
+    chunksize = chunksize or max(1, len(pages) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(parser,)) as pool:
+        return list(pool.map(_extract_task, pages, chunksize=chunksize))
+
+def scrape_fused(args) -> None:
+    """
+    Crawl and extract in one pass: every page is fetched and parsed once and
+    the same soup feeds link discovery, categorize_page_type and the
+    page-type extractor.
+    """
+    crawler = importlib.import_module("crawl-itnb")
+    scraper = ITNBScraper(use_cache=False, parser=args.parser)
+    extracted = {}
+
+    def extract(url, soup, summary):
+        result = scraper.scrape_page_by_type(url, summary["page_type"], soup)
+        scraper.save_page_result(result)
+        extracted[url] = result
+
+    pages = crawler.crawl_from_args(args, page_handler=extract)
+
+    # Pages finished before a --resume were extracted by the earlier run
+    all_results = []
+    for page in pages:
+        result = extracted.get(page["url"]) or scraper.load_page_result(page["url"])
+        if result is not None:
+            all_results.append(result)
+
+    combined_file = scraper.save_combined(all_results)
+    print(f"\nCrawl and extraction complete! {len(all_results)} pages saved to {combined_file}")
+    print(f"Individual page files saved in {scraper.local_dir}")
+
+class ArchiveIncompleteError(Exception):
+    """The HTML archive lacks pages of the URL list."""
+
+def archived_pages(urls_to_scrape: List[tuple], as_of: Optional[str] = None,
+                   unchanged: Optional[Dict[str, str]] = None) -> List[tuple]:
+    """
+    (url, page_type, html, sha256) from the HTML archive, as of an ISO
+    date/time if given. Pages whose archived body still has the digest in
+    `unchanged` (url -> sha256) are left out without being read.
+
+    Raises ArchiveIncompleteError if no page of the list is archived, or if
+    any is missing without `as_of` (with it, pages added to the site after
+    that date are expected to be missing).
+    """
+    archive = HTMLArchive()
+    at = datetime.fromisoformat(as_of).timestamp() if as_of else None
+    unchanged = unchanged or {}
+    pages, skipped, missing = [], 0, []
+    for page_type, url in urls_to_scrape:
+        entries = [entry for entry in archive.versions(url) if at is None or entry["fetched_at"] <= at]
+        if not entries:
+            print(f"Not in archive: {url}")
+            missing.append(url)
+            continue
+        if unchanged.get(url) == entries[-1]["sha256"]:
+            skipped += 1
+            continue
+        pages.append((url, page_type, archive.get(url, at=at).text, entries[-1]["sha256"]))
+    if missing and (len(missing) == len(urls_to_scrape) or not as_of):
+        raise ArchiveIncompleteError(
+            f"{len(missing)}/{len(urls_to_scrape)} pages are not in {archive.data_path}; "
+            f"run scrape-itnb.py without --from-archive to fetch them")
+    print(f"Loaded {len(pages)}/{len(urls_to_scrape)} pages from {archive.data_path}"
+          + (f" ({skipped} unchanged since the last extraction)" if skipped else ""))
+    return pages
+
+# url -> archived sha256 of the pages extracted by the last --incremental run
+EXTRACT_STATE_FILE = os.path.join(SCRAPING_DIR, "extract_state.json")
+
+def extractor_fingerprint(parser: str) -> str:
+    """Hash of the extraction code and parser backend: a change re-extracts every page"""
+    digest = hashlib.sha256(parser.encode("utf-8"))
+    for name in ("scrape-itnb.py", "page_index.py", "itnb_site.py"):
+        with open(os.path.join(SCRAPING_DIR, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def load_extract_state(fingerprint: str) -> Dict[str, str]:
+    try:
+        with open(EXTRACT_STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state.get("pages", {}) if state.get("extractor") == fingerprint else {}
+
+def save_extract_state(fingerprint: str, pages: Dict[str, str]) -> None:
+    tmp_file = EXTRACT_STATE_FILE + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({"extractor": fingerprint, "pages": pages}, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, EXTRACT_STATE_FILE)
+
+def extract_incremental(scraper: "ITNBScraper", urls_to_scrape: List[tuple], as_of: Optional[str],
+                        workers: int, chunksize: Optional[int]) -> None:
+    """
+    Extract from the archive only the pages whose archived HTML changed since
+    the last run (or whose result file is missing); the others keep their
+    saved result. The combined file is rewritten only if something changed.
+    """
+    fingerprint = extractor_fingerprint(scraper.parser)
+    previous = load_extract_state(fingerprint)
+    saved = {url: scraper.load_page_result(url) for _, url in urls_to_scrape if url in previous}
+    unchanged = {url: sha256 for url, sha256 in previous.items() if saved.get(url) is not None}
+    pages = archived_pages(urls_to_scrape, as_of, unchanged)
+
+    start = time.time()
+    # A page that fails to extract is tried again next time
+    state = {url: sha256 for url, sha256 in unchanged.items() if url not in {page[0] for page in pages}}
+    outcomes = extract_pages([page[:3] for page in pages], workers, chunksize, scraper.parser)
+    for (url, _, _, sha256), outcome in zip(pages, outcomes):
+        if "error" in outcome:
+            print(f"Error scraping {url}: {outcome['error']}")
+            continue
+        saved[url] = outcome["result"]
+        state[url] = sha256
+        scraper.save_page_result(outcome["result"])
+    print(f"Extracted {len(pages)} pages in {time.time() - start:.1f}s")
+
+    state = {url: state[url] for _, url in urls_to_scrape if url in state}
+    combined_file = os.path.join(scraper.local_dir, "itnb_all_content.json")
+    if state == previous and os.path.exists(combined_file):
+        print(f"\nNothing changed, {combined_file} kept")
+    else:
+        combined_file = scraper.save_combined([saved[url] for url in state])
+        print(f"\nScraping complete! Results saved to {combined_file}")
+    save_extract_state(fingerprint, state)
 
 def main():
-    # Load the crawl results to get all URLs
-    crawl_file = os.path.join(os.path.dirname(__file__), 'scrape_out', 'itnb_urls.txt')
+    parser = argparse.ArgumentParser(description="Extract structured content from the ITNB website")
+    parser.add_argument("--fused", action="store_true",
+                        help="Crawl and extract in one pass instead of downloading the pages in itnb_urls.txt again")
+    parser.add_argument("--from-archive", action="store_true",
+                        help="Extract from the HTML archive written by earlier runs, without network access")
+    parser.add_argument("--as-of", default=None,
+                        help="With --from-archive: use the pages as archived at this ISO date/time")
+    parser.add_argument("--incremental", action="store_true",
+                        help="With --from-archive: extract only pages whose archived HTML changed since the last run")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes that parse and extract pages (0 = one per CPU; "
+                             "default 1, or one per CPU with --from-archive)")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Pages handed to an extraction worker at a time")
+    # Crawl options, used with --fused
+    importlib.import_module("crawl-itnb").add_crawl_arguments(parser)
+    args = parser.parse_args()
+
+    if args.fused:
+        scrape_fused(args)
+        return True
+
+    # Load the crawl results to get all URLs (the shipped list until the crawler has run)
+    crawl_file = url_list_file()
     
-    if not os.path.exists(crawl_file):
-        print(f"Please run crawl-itnb.py first to generate {crawl_file}")
-        return
+    if crawl_file is None:
+        print("Please run crawl-itnb.py first to generate scrape_out/itnb_urls.txt")
+        return False
     
-    scraper = ITNBScraper()
+    if args.from_archive:
+        scraper = ITNBScraper(use_cache=False, parser=args.parser)
+        workers = 0 if args.workers is None else args.workers
+    else:
+        scraper = ITNBScraper(use_cache=not args.no_cache, parser=args.parser,
+                              archive=None if args.no_archive else HTMLArchive())
+        workers = 1 if args.workers is None else args.workers
     
     # Read URLs and their types
-    urls_to_scrape = []
-    with open(crawl_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if ': ' in line:
-                page_type, url = line.split(': ', 1)
-                urls_to_scrape.append((page_type, url))
+    urls_to_scrape = read_url_list(crawl_file)
     
-    print(f"Found {len(urls_to_scrape)} pages to scrape")
+    print(f"Found {len(urls_to_scrape)} pages to scrape in {crawl_file}")
+    
+    try:
+        if args.from_archive and args.incremental:
+            extract_incremental(scraper, urls_to_scrape, args.as_of, workers, args.chunksize)
+            return True
+        # Fail before anything is written: an incomplete corpus must not reach ingestion
+        archived = archived_pages(urls_to_scrape, args.as_of) if args.from_archive else None
+    except ArchiveIncompleteError as e:
+        print(f"Error: {e}")
+        return False
     
     # Scrape each page
     all_results = []
-    for i, (page_type, url) in enumerate(urls_to_scrape):
-        print(f"\nScraping {i+1}/{len(urls_to_scrape)}: {page_type} - {url}")
-        try:
-            result = scraper.scrape_page_by_type(url, page_type)
-            all_results.append(result)
-            
-            # Save individual page result
-            safe_filename = url.replace('https://www.itnb.ch/en', '').replace('/', '_').strip('_')
-            if not safe_filename:
-                safe_filename = 'homepage'
-            individual_file = os.path.join(scraper.local_dir, f"{safe_filename}_extracted.json")
-            
-            with open(individual_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-            
-        except Exception as e:
-            print(f"Error scraping {url}: {e}")
+    if args.from_archive or workers != 1:
+        if args.from_archive:
+            pages = [page[:3] for page in archived]
+        else:
+            # Download first, then parse and extract on all cores
+            pages = []
+            for i, (page_type, url) in enumerate(urls_to_scrape):
+                print(f"\nDownloading {i+1}/{len(urls_to_scrape)}: {page_type} - {url}")
+                pages.append((url, page_type, scraper.get_html(url)))
+        start = time.time()
+        for (url, _, _), outcome in zip(pages, extract_pages(pages, workers, args.chunksize, scraper.parser)):
+            if "error" in outcome:
+                print(f"Error scraping {url}: {outcome['error']}")
+                continue
+            all_results.append(outcome["result"])
+            scraper.save_page_result(outcome["result"])
+        print(f"Extracted {len(all_results)} pages in {time.time() - start:.1f}s")
+    else:
+        for i, (page_type, url) in enumerate(urls_to_scrape):
+            print(f"\nScraping {i+1}/{len(urls_to_scrape)}: {page_type} - {url}")
+            try:
+                result = scraper.scrape_page_by_type(url, page_type)
+                all_results.append(result)
+                
+                # Save individual page result (non-English pages get a language prefix)
+                scraper.save_page_result(result)
+                
+            except Exception as e:
+                print(f"Error scraping {url}: {e}")
     
     # Save combined results
-    combined_file = os.path.join(scraper.local_dir, "itnb_all_content.json")
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            "total_pages": len(all_results),
-            "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "pages": all_results
-        }, f, ensure_ascii=False, indent=2)
+    combined_file = scraper.save_combined(all_results)
     
     print(f"\nScraping complete! Results saved to {combined_file}")
     print(f"Individual page files saved in {scraper.local_dir}")
+    if scraper.cache:
+        print(scraper.cache.report())
+    if scraper.archive is not None:
+        print(scraper.archive.report())
+    return True
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,197 @@
+"""
+Declarative JSON transform pipeline for the scraped corpus.
+
+A pipeline is a plain spec, for example CLEAN_SPEC:
+
+    drop_keys            keys removed wherever they occur
+    scrub                regexes (case-insensitive) whose matches are cut from every string
+    collapse_whitespace  runs of whitespace become one space, strings are stripped
+    truncate             {key: max_chars} for string values under that key
+    prune_empty          empty strings, lists and dicts (after cleaning) and None are removed
+
+TransformPipeline compiles the spec once and applies every step in a single
+recursive pass over a document. run_pipeline applies it to the *.json
+files of a directory on a process pool, writes each output atomically, and
+records the input hash of every file in a state file next to the outputs,
+so a file whose input and spec have not changed is skipped on the next
+run. The input and output directory may be the same (in-place rewrite).
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ingest_manifest import file_sha256
+
+STATE_FILE = ".transform_state.json"
+
+# Pattern artefacts found in scraped pages. Add new ones here.
+NOISE_PATTERNS = [
+    r"Download\s*\(undefined, 0 B\)",
+]
+
+# scrape_out -> scrape_out_cleaned: what clean_scrape_out.py and
+# clean_technical_specs.py used to do in two passes
+CLEAN_SPEC = {
+    "drop_keys": ["headings", "call_to_actions", "technical_specs"],
+    "scrub": NOISE_PATTERNS,
+    "collapse_whitespace": True,
+    "truncate": {},
+    "prune_empty": True,
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class TransformPipeline:
+    def __init__(self, drop_keys: Iterable[str] = (), scrub: Iterable[str] = (),
+                 collapse_whitespace: bool = False, truncate: Optional[Dict[str, int]] = None,
+                 prune_empty: bool = False):
+        self.spec = {
+            "drop_keys": sorted(drop_keys),
+            "scrub": list(scrub),
+            "collapse_whitespace": collapse_whitespace,
+            "truncate": dict(truncate or {}),
+            "prune_empty": prune_empty,
+        }
+        self._drop_keys = frozenset(self.spec["drop_keys"])
+        # One alternation: every pattern is cut in a single scan of the string
+        self._scrub = (re.compile("|".join(f"(?:{p})" for p in self.spec["scrub"]), re.IGNORECASE)
+                       if self.spec["scrub"] else None)
+        self._collapse = collapse_whitespace
+        self._truncate = self.spec["truncate"]
+        self._prune = prune_empty
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "TransformPipeline":
+        return cls(**spec)
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the spec: a changed spec re-runs every file."""
+        return hashlib.sha256(json.dumps(self.spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def apply(self, data: Any) -> Any:
+        """Transformed document; a document pruned away entirely becomes {}."""
+        result = self._transform(data, None)
+        return {} if result is None and self._prune else result
+
+    def _transform(self, value: Any, key: Optional[str]) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            if self._scrub is not None:
+                value = self._scrub.sub("", value)
+            if self._collapse:
+                value = _WHITESPACE.sub(" ", value).strip()
+            limit = self._truncate.get(key)
+            if limit is not None and len(value) > limit:
+                value = value[:limit].rstrip()
+            return value if value or not self._prune else None
+        if isinstance(value, list):
+            items = [self._transform(item, key) for item in value]
+            if self._prune:
+                items = [item for item in items if item is not None]
+            return items if items or not self._prune else None
+        if isinstance(value, dict):
+            cleaned = {}
+            for k, v in value.items():
+                if k in self._drop_keys:
+                    continue
+                v = self._transform(v, k)
+                if v is not None or not self._prune:
+                    cleaned[k] = v
+            return cleaned if cleaned or not self._prune else None
+        return value
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# Per-process pipeline of the transform pool, compiled once by _init_worker
+_worker_pipeline = None
+
+def _init_worker(spec: Dict[str, Any]) -> None:
+    global _worker_pipeline
+    _worker_pipeline = TransformPipeline.from_spec(spec)
+
+def _transform_task(task) -> Dict[str, Any]:
+    input_path, output_path = task
+    try:
+        with open(input_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _write_json_atomic(output_path, _worker_pipeline.apply(data))
+        return {"output_sha256": file_sha256(output_path)}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _load_state(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def run_pipeline(pipeline: TransformPipeline, input_dir: Path, output_dir: Path, workers: int = 0,
+                 force: bool = False, patterns: Iterable[str] = ("*.json",)) -> Dict[str, List[str]]:
+    """
+    Transform every file matching one of `patterns` in input_dir into output_dir,
+    on `workers` processes (0 = one per CPU). Files whose input hash and
+    pipeline fingerprint match the last run are skipped unless `force`.
+    Returns the file names per outcome: "transformed", "skipped", "failed"
+    (name: error).
+    """
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state_path = output_dir / STATE_FILE
+    state = _load_state(state_path)
+    if state.get("pipeline") != pipeline.fingerprint:
+        state = {"pipeline": pipeline.fingerprint, "files": {}}
+    in_place = input_dir.resolve() == output_dir.resolve()
+
+    outcome = {"transformed": [], "skipped": [], "failed": []}
+    tasks, hashes = [], {}
+    input_paths = sorted({path for pattern in patterns for path in input_dir.glob(pattern)})
+    for input_path in input_paths:
+        if input_path.name.startswith("."):
+            continue
+        output_path = output_dir / input_path.name
+        sha256 = file_sha256(input_path)
+        previous = state["files"].get(input_path.name, {})
+        # In place, the file on disk is the previous output
+        unchanged = sha256 == (previous.get("output_sha256") if in_place else previous.get("input_sha256"))
+        if unchanged and output_path.exists() and not force:
+            outcome["skipped"].append(input_path.name)
+            continue
+        hashes[input_path.name] = sha256
+        tasks.append((input_path, output_path))
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        _init_worker(pipeline.spec)
+        results = [_transform_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pipeline.spec,)) as pool:
+            results = list(pool.map(_transform_task, tasks))
+
+    for (input_path, _), result in zip(tasks, results):
+        if "error" in result:
+            state["files"].pop(input_path.name, None)
+            outcome["failed"].append(f"{input_path.name}: {result['error']}")
+            continue
+        state["files"][input_path.name] = {"input_sha256": hashes[input_path.name],
+                                           "output_sha256": result["output_sha256"]}
+        outcome["transformed"].append(input_path.name)
+
+    _write_json_atomic(state_path, state)
+    return outcome
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+"""Pre-translate the cleaned ITNB corpus into the other site languages.
+
+Pages that were crawled natively in German, French or Italian (see
+`crawl-itnb.py --languages`) already have their own `*_extracted.json`
+file. For every English page in `scrape_out_cleaned/` that has no native
+counterpart in a target language, this script asks the translation LLM to
+translate the text values and writes `<lang>_<name>_extracted.json` tagged
+with `"language": "<lang>"`.
+
+URLs, image links, e-mail addresses and other identifiers are kept as-is so
+`[PRIMARY_SOURCE: url]` markers keep pointing at the real pages.
+
+    python translate_corpus.py --languages de,fr,it
+"""
+
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+from openai import OpenAI
+
+from itnb_site import SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE, LANGUAGE_NAMES
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+ROOT_DIR = Path(__file__).resolve().parent
+CORPUS_DIR = ROOT_DIR / "scrape_out_cleaned"
+
+# Keys whose values are identifiers rather than prose
+UNTRANSLATED_KEYS = {
+    "url", "source_url", "full_url", "href", "image", "email", "phone",
+    "page_type", "language",
+}
+
+
+class CorpusTranslator:
+    """Translate corpus JSON documents with the configured translation LLM."""
+
+    def __init__(self, target_language: str):
+        self.target_language = target_language
+        # Same model selection as the crew's translation LLM
+        self.model = os.getenv("OPENAI_MODEL_NAME_2") or os.getenv("OPENAI_MODEL_NAME")
+        self.client = OpenAI(
+            base_url=os.getenv("OPENAI_API_BASE_2") or os.getenv("OPENAI_API_BASE"),
+            api_key=os.getenv("OPENAI_API_KEY_2") or os.getenv("OPENAI_API_KEY"),
+        )
+        # Boilerplate strings repeat across pages; translate each only once
+        self._cache: Dict[str, str] = {}
+
+    def translate_text(self, text: str) -> str:
+        """Translate a single string from English to the target language."""
+        if text in self._cache:
+            return self._cache[text]
+
+        prompt = f"""Translate the following text from English to {LANGUAGE_NAMES[self.target_language]}.
+Keep product names, company names and URLs unchanged.
+
+Text: {text}
+
+Respond with only the translated text:"""
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0,
+        )
+        translated = (response.choices[0].message.content or "").strip() or text
+        self._cache[text] = translated
+        return translated
+
+    def translate_value(self, value: Any, key: str = "") -> Any:
+        """Recursively translate the prose inside a JSON value."""
+        if key in UNTRANSLATED_KEYS:
+            return value
+        if isinstance(value, str):
+            return self.translate_text(value) if value.strip() else value
+        if isinstance(value, list):
+            return [self.translate_value(item, key) for item in value]
+        if isinstance(value, dict):
+            return {k: self.translate_value(v, k) for k, v in value.items()}
+        return value
+
+    def translate_document(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Translate a whole page document and tag it with the target language."""
+        translated = self.translate_value(data)
+        translated["language"] = self.target_language
+        translated["translated_from"] = DEFAULT_LANGUAGE
+        return translated
+
+
+def english_source_files(corpus_dir: Path) -> List[Path]:
+    """English page files are the ones without a language prefix."""
+    prefixes = tuple(f"{lang}_" for lang in SUPPORTED_LANGUAGES if lang != DEFAULT_LANGUAGE)
+    return sorted(fp for fp in corpus_dir.glob("*_extracted.json") if not fp.name.startswith(prefixes))
+
+
+def translate_corpus(corpus_dir: Path, languages: List[str], force: bool = False) -> int:
+    """Translate every English page missing in the given languages. Returns files written."""
+    written = 0
+    sources = english_source_files(corpus_dir)
+    logger.info(f"Found {len(sources)} English source documents in {corpus_dir}")
+
+    for lang in languages:
+        translator = CorpusTranslator(lang)
+        for fp in sources:
+            out_fp = corpus_dir / f"{lang}_{fp.name}"
+            if out_fp.exists() and not force:
+                logger.info(f"Skipping {out_fp.name} (already present)")
+                continue
+            try:
+                with fp.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                translated = translator.translate_document(data)
+                with out_fp.open("w", encoding="utf-8") as f:
+                    json.dump(translated, f, ensure_ascii=False, indent=2)
+                written += 1
+                logger.info(f"✓ {fp.name} -> {out_fp.name}")
+            except Exception as e:
+                logger.error(f"✗ Failed to translate {fp.name} to {lang}: {str(e)}")
+
+    logger.info(f"Wrote {written} translated documents")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-translate the ITNB corpus")
+    parser.add_argument("--languages", default="de,fr,it",
+                        help="Comma-separated target languages")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-translate documents that already exist")
+    args = parser.parse_args()
+
+    languages = [lang.strip() for lang in args.languages.split(",")
+                 if lang.strip() in SUPPORTED_LANGUAGES and lang.strip() != DEFAULT_LANGUAGE]
+    if not languages:
+        logger.error("No valid target languages given")
+        return False
+
+    translate_corpus(CORPUS_DIR, languages, force=args.force)
+    return True
+
+
+if __name__ == "__main__":
+    main()
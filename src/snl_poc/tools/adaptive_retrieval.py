@@ -0,0 +1,91 @@
+import re
+from typing import List, Dict, Any, Tuple
+
+from src.snl_poc.tools.chunk_rerank import count_tokens
+
+# Cues for questions that want one specific fact (EN/DE/FR/IT)
+FACTOID_PATTERNS = [
+    r"\bwho is\b", r"\bwhat is the (email|phone|address)\b", r"\bemail\b", r"\bphone\b",
+    r"\baddress\b", r"\bwhen\b", r"\bwhere is\b", r"\bwer ist\b", r"\bqui est\b", r"\bchi è\b",
+]
+
+# Cues for questions whose answer is spread over several pages
+BROAD_PATTERNS = [
+    r"\bwhat (industries|services|products|solutions)\b", r"\bwhich\b", r"\blist\b", r"\ball\b",
+    r"\boverview\b", r"\bcompare\b", r"\bdifference", r"\bindustries\b", r"\bservices\b",
+    r"\bsolutions\b", r"\bproducts\b", r"\bpartners\b", r"\bwelche\b", r"\bquels\b", r"\bquali\b",
+]
+
+_FACTOID = [re.compile(p, re.IGNORECASE) for p in FACTOID_PATTERNS]
+_BROAD = [re.compile(p, re.IGNORECASE) for p in BROAD_PATTERNS]
+
+
+def classify_query_complexity(query: str) -> str:
+    """Classify a query as 'factoid', 'standard' or 'broad'."""
+    broad_hits = sum(1 for pattern in _BROAD if pattern.search(query))
+    factoid_hits = sum(1 for pattern in _FACTOID if pattern.search(query))
+    if broad_hits > factoid_hits:
+        return "broad"
+    if factoid_hits > 0:
+        return "factoid"
+    return "standard"
+
+
+def depth_for_complexity(complexity: str, base_chunks: int, max_chunks: int) -> int:
+    """Chunk cap per complexity class, anchored on the configured base depth."""
+    if complexity == "factoid":
+        return max(1, base_chunks - 1)
+    if complexity == "broad":
+        return max(base_chunks, max_chunks)
+    return base_chunks
+
+
+def select_adaptive(
+    query: str,
+    chunks: List[Dict[str, Any]],
+    base_chunks: int = 2,
+    max_chunks: int = 6,
+    token_budget: int = 1500,
+    gap_ratio: float = 0.6,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Choose how many of the ranked chunks (best first) go into the prompt.
+
+    The cap depends on query complexity. Below the cap, selection stops at
+    the first large relevance gap (a chunk scoring under gap_ratio times the
+    previous one) or when the next chunk would exceed token_budget. The best
+    chunk is always kept.
+    """
+    complexity = classify_query_complexity(query)
+    cap = depth_for_complexity(complexity, base_chunks, max_chunks)
+
+    selected = []
+    prompt_tokens = 0
+    stop_reason = "exhausted"
+    previous_score = None
+    for chunk in chunks:
+        if len(selected) >= cap:
+            stop_reason = "cap"
+            break
+        score = chunk.get("rerank_score", chunk.get("score")) or 0.0
+        tokens = count_tokens(chunk["text"])
+        if selected:
+            if previous_score and score < gap_ratio * previous_score:
+                stop_reason = "score_gap"
+                break
+            if prompt_tokens + tokens > token_budget:
+                stop_reason = "token_budget"
+                break
+        selected.append(chunk)
+        prompt_tokens += tokens
+        previous_score = score
+
+    stats = {
+        "complexity": complexity,
+        "cap": cap,
+        "candidates": len(chunks),
+        "chosen": len(selected),
+        "prompt_tokens": prompt_tokens,
+        "stop_reason": stop_reason,
+    }
+    return selected, stats
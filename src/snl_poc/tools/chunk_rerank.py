@@ -0,0 +1,139 @@
+import re
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from src.snl_poc.tools.local_search import tokenize
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """
+    The cl100k_base encoding, loaded on first use: on a cold cache tiktoken
+    downloads it, which must not happen at import time. None (and the
+    estimate) when tiktoken is missing or the download fails offline.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens for text (cl100k_base, or a chars/4 estimate without tiktoken)."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(1, len(text) // 4)
+
+
+def _shingles(text: str, size: int = 5) -> set:
+    """Word n-gram shingles used for near-duplicate detection."""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _overlap(a: set, b: set) -> float:
+    """Overlap coefficient: 1.0 when one shingle set contains the other."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def lexical_overlap(query_terms: set, text: str) -> float:
+    """Share of query terms that occur in text."""
+    if not query_terms:
+        return 0.0
+    return len(query_terms & set(tokenize(text))) / len(query_terms)
+
+
+def rerank_chunks(
+    query: str,
+    chunks: List[Dict[str, Any]],
+    keep: int,
+    max_per_source: int = 1,
+    duplicate_threshold: float = 0.7,
+    min_relative_score: float = 0.3,
+    lexical_weight: float = 0.6,
+    baseline_n: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Pick the best `keep` chunks out of an oversampled candidate list.
+
+    Each chunk is a dict with at least "text", and optionally "score"
+    (GroundX relevance) and "source_key" / "source_url" identifying the
+    page. Candidates are scored by lexical overlap with the (translated)
+    query blended with the normalised GroundX score, then selected greedily
+    while skipping chunks that repeat a source more than max_per_source
+    times or whose text overlaps an already selected chunk. Chunks far
+    below the best score are dropped.
+
+    Returns the selected chunks (best first) and stats including the
+    prompt-token savings against taking the first `baseline_n` (default
+    `keep`) candidates in GroundX order.
+    """
+    query_terms = set(tokenize(query))
+    max_score = max((c.get("score") or 0.0 for c in chunks), default=0.0)
+
+    scored = []
+    for position, chunk in enumerate(chunks):
+        remote = (chunk.get("score") or 0.0) / max_score if max_score > 0 else 0.0
+        lexical = lexical_overlap(query_terms, chunk["text"])
+        combined = lexical_weight * lexical + (1 - lexical_weight) * remote
+        scored.append((combined, position, chunk))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+
+    selected = []
+    selected_shingles = []
+    per_source: Dict[Optional[str], int] = {}
+    dropped_duplicates = 0
+    dropped_low_score = 0
+    best = scored[0][0] if scored else 0.0
+
+    for combined, _, chunk in scored:
+        if len(selected) >= keep:
+            break
+        if best > 0 and combined < min_relative_score * best:
+            dropped_low_score += 1
+            continue
+
+        source = chunk.get("source_key") or chunk.get("source_url")
+        if source and per_source.get(source, 0) >= max_per_source:
+            dropped_duplicates += 1
+            continue
+
+        shingles = _shingles(chunk["text"])
+        if any(_overlap(shingles, other) >= duplicate_threshold for other in selected_shingles):
+            dropped_duplicates += 1
+            continue
+
+        chunk["rerank_score"] = round(combined, 4)
+        selected.append(chunk)
+        selected_shingles.append(shingles)
+        if source:
+            per_source[source] = per_source.get(source, 0) + 1
+
+    baseline_tokens = sum(count_tokens(c["text"]) for c in chunks[:baseline_n or keep])
+    selected_tokens = sum(count_tokens(c["text"]) for c in selected)
+    stats = {
+        "candidates": len(chunks),
+        "selected": len(selected),
+        "dropped_duplicates": dropped_duplicates,
+        "dropped_low_score": dropped_low_score,
+        "baseline_tokens": baseline_tokens,
+        "selected_tokens": selected_tokens,
+        "tokens_saved": baseline_tokens - selected_tokens,
+    }
+    return selected, stats
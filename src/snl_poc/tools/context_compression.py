@@ -0,0 +1,131 @@
+import json
+import re
+from typing import List, Dict, Any, Tuple
+
+from src.snl_poc.tools.chunk_rerank import count_tokens
+from src.snl_poc.tools.local_search import tokenize
+
+# Scraper fields the answer never uses
+DROPPED_FIELDS = {
+    "page_type", "navigation", "contact_info", "headings", "call_to_actions",
+    "language", "translated_from",
+}
+
+# Fields that identify the page; rendered once as "Source: <url>"
+SOURCE_FIELDS = ("source_url", "url")
+
+# Text fields longer than this get query-aware sentence selection
+LONG_FIELD_CHARS = 600
+MAX_SENTENCES = 5
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-ZÄÖÜÀ-Ý0-9\"'(])")
+_JSON_NOISE = re.compile(r'[{}\[\]"]|\\n')
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split prose into sentences on terminal punctuation."""
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+
+
+def select_sentences(text: str, query_terms: set, max_sentences: int = MAX_SENTENCES) -> str:
+    """
+    Keep the sentences that share most terms with the query, in their
+    original order. The first sentence is kept as context when nothing
+    matches.
+    """
+    sentences = split_sentences(text)
+    if len(sentences) <= max_sentences:
+        return text
+
+    scored = []
+    for position, sentence in enumerate(sentences):
+        overlap = len(query_terms & set(tokenize(sentence)))
+        scored.append((overlap, -position, position))
+    scored.sort(reverse=True)
+
+    chosen = sorted(position for overlap, _, position in scored[:max_sentences] if overlap > 0)
+    if not chosen:
+        chosen = [0]
+    return " ".join(sentences[i] for i in chosen)
+
+
+def _label(key: str) -> str:
+    return key.replace("_", " ").capitalize()
+
+
+def _compress_text(text: str, query_terms: set) -> str:
+    text = re.sub(r"\s+", " ", text).strip()
+    if len(text) > LONG_FIELD_CHARS:
+        return select_sentences(text, query_terms)
+    return text
+
+
+def _compress_item(item: Any, query_terms: set) -> str:
+    """Render one list item. Objects stay compact JSON so image URLs keep their shape."""
+    if isinstance(item, dict):
+        compact = {}
+        for k, v in item.items():
+            if k in DROPPED_FIELDS or v in (None, "", [], {}):
+                continue
+            compact[k] = _compress_text(v, query_terms) if isinstance(v, str) else v
+        return json.dumps(compact, ensure_ascii=False, separators=(", ", ": "))
+    if isinstance(item, str):
+        return _compress_text(item, query_terms)
+    return str(item)
+
+
+def _render(data: Dict[str, Any], query_terms: set, lines: List[str]) -> None:
+    for key, value in data.items():
+        if key in DROPPED_FIELDS or key in SOURCE_FIELDS or value in (None, "", [], {}):
+            continue
+        if isinstance(value, str):
+            lines.append(f"{_label(key)}: {_compress_text(value, query_terms)}")
+        elif isinstance(value, list):
+            lines.append(f"{_label(key)}:")
+            lines.extend(f"- {_compress_item(item, query_terms)}" for item in value)
+        elif isinstance(value, dict):
+            _render(value, query_terms, lines)
+        else:
+            lines.append(f"{_label(key)}: {value}")
+
+
+def compress_chunk(text: str, query: str) -> str:
+    """
+    Turn a retrieved chunk into compact text for the prompt.
+
+    JSON chunks (the *_extracted.json pages) lose their keys, quotes and
+    boilerplate fields, long fields are reduced to the sentences most
+    related to the query, and the page URL plus any team image URLs are
+    preserved. Chunks that are not valid JSON (GroundX may split a file
+    mid-object) only get JSON punctuation stripped and sentence selection.
+    """
+    query_terms = set(tokenize(query))
+    try:
+        data = json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+
+    if not isinstance(data, dict):
+        return _compress_text(_JSON_NOISE.sub(" ", text or ""), query_terms)
+
+    lines = []
+    source = next((data[k] for k in SOURCE_FIELDS if data.get(k)), None)
+    if source:
+        lines.append(f"Source: {source}")
+    _render(data, query_terms, lines)
+    return "\n".join(lines)
+
+
+def compress_chunks(chunks: List[Dict[str, Any]], query: str) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Compress each chunk's "text" in place. Returns the chunks and token stats."""
+    tokens_before = 0
+    tokens_after = 0
+    for chunk in chunks:
+        tokens_before += count_tokens(chunk["text"])
+        chunk["text"] = compress_chunk(chunk["text"], query)
+        tokens_after += count_tokens(chunk["text"])
+    return chunks, {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after,
+    }
@@ -2,7 +2,8 @@
 
 import os
 import logging
-from groundx import GroundX
+from src.snl_poc.tools.groundx_client import create_groundx_client
+from src.snl_poc.tools.groundx_documents import iter_bucket_documents, count_bucket_documents
 from typing import Optional, Dict, Any
 
 # Configure logging
@@ -21,10 +22,7 @@ class BucketInspector:
         api_key = os.getenv("GROUNDX_API_KEY", "5c49be10-d228-4dd8-bbb0-d59300698ef6")
         base_url = os.getenv("GROUNDX_BASE_URL", "https://groundx-service-eyelevel.apps.eyelevel.kvant.cloud/api")
         
-        self.client = GroundX(
-            api_key=api_key,
-            base_url=base_url
-        )
+        self.client = create_groundx_client(api_key=api_key, base_url=base_url)
         
         # Find the bucket with documents
         self._find_active_bucket()
@@ -39,16 +37,11 @@ class BucketInspector:
                 logger.warning("No buckets found in the system")
                 return None
             
-            # Get all documents
-            documents_response = self.client.documents.list()
-            
-            # Find buckets with matching name and count documents
+            # Find buckets with matching name and count their documents
             matching_buckets = []
             for bucket in buckets_response.buckets:
                 if bucket.name == self.bucket_name:
-                    doc_count = 0
-                    if hasattr(documents_response, 'documents') and documents_response.documents:
-                        doc_count = len([doc for doc in documents_response.documents if doc.bucket_id == bucket.bucket_id])
+                    doc_count = count_bucket_documents(self.client, bucket.bucket_id)
                     
                     matching_buckets.append({
                         'id': bucket.bucket_id,
@@ -78,11 +71,7 @@ class BucketInspector:
                 return {"error": "No active bucket found"}
             
             # Get documents in this bucket
-            documents_response = self.client.documents.list()
-            bucket_docs = []
-            
-            if hasattr(documents_response, 'documents') and documents_response.documents:
-                bucket_docs = [doc for doc in documents_response.documents if doc.bucket_id == self.bucket_id]
+            bucket_docs = list(iter_bucket_documents(self.client, self.bucket_id))
             
             info = {
                 "bucket_name": self.bucket_name,
@@ -1,7 +1,9 @@
 # /app/src/snl_poc/tools/groundx_debug.py
 
 import os
-from groundx import GroundX
+from groundx import GroundXEnvironment
+from src.snl_poc.tools.groundx_client import create_groundx_client
+from src.snl_poc.tools.groundx_documents import iter_bucket_documents
 from dotenv import load_dotenv
 import random
 import requests
@@ -136,7 +138,7 @@ def main():
     api_key = os.getenv("GROUNDX_API_KEY")
     if not api_key:
         raise ValueError("GROUNDX_API_KEY not found in environment variables")
-    client = GroundX(api_key=api_key)
+    client = create_groundx_client(api_key=api_key, base_url=GroundXEnvironment.DEFAULT.value)
 
     # List buckets
     buckets = client.buckets.list()
@@ -148,10 +150,9 @@ def main():
     bucket_id = 19752
 
     # List documents in the bucket
-    docs = client.documents.lookup(id=bucket_id)
     print("\nDocuments in bucket:")
     doc_map = {}
-    for d in docs.documents:
+    for d in iter_bucket_documents(client, bucket_id):
         print(f"  {d.document_id}: {d.file_name}")
         doc_map[d.file_name] = d.document_id
 
@@ -0,0 +1,178 @@
+import os
+import random
+import threading
+import time
+import logging
+from typing import Optional
+
+import httpx
+from groundx import GroundX
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Methods that can be replayed without side effects
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# POST endpoints that only read (search), so they are safe to retry as well
+RETRYABLE_POST_PATHS = ("/v1/search/",)
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    httpx transport that retries transient failures with full-jitter
+    exponential backoff.
+
+    Connection failures are retried for every request (nothing reached the
+    server). Read timeouts and 429/502/503/504 responses are only retried for
+    idempotent methods and search POSTs, so ingest uploads are never sent
+    twice. A Retry-After header overrides the computed delay.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 8.0,
+    ):
+        self._transport = transport
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _is_replayable(self, request: httpx.Request) -> bool:
+        if request.method in IDEMPOTENT_METHODS:
+            return True
+        return request.method == "POST" and any(p in request.url.path for p in RETRYABLE_POST_PATHS)
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        replayable = self._is_replayable(request)
+        attempt = 0
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                if attempt >= self.retries:
+                    raise
+                logger.debug(f"GroundX connect failed ({e}), retry {attempt + 1}/{self.retries}")
+            except (httpx.ReadTimeout, httpx.RemoteProtocolError) as e:
+                if not replayable or attempt >= self.retries:
+                    raise
+                logger.debug(f"GroundX read failed ({e}), retry {attempt + 1}/{self.retries}")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or not replayable or attempt >= self.retries:
+                    return response
+                delay = self._delay(attempt, response)
+                response.close()
+                logger.debug(f"GroundX returned {response.status_code}, retry {attempt + 1}/{self.retries} in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            time.sleep(self._delay(attempt))
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+def create_http_client(
+    max_connections: Optional[int] = None,
+    max_keepalive: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    connect_timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+    http2: Optional[bool] = None,
+) -> httpx.Client:
+    """
+    Build a pooled keep-alive httpx client for GroundX.
+
+    Unset arguments come from GROUNDX_HTTP_MAX_CONNECTIONS,
+    GROUNDX_HTTP_MAX_KEEPALIVE, GROUNDX_HTTP_KEEPALIVE_EXPIRY,
+    GROUNDX_CONNECT_TIMEOUT, GROUNDX_READ_TIMEOUT, GROUNDX_HTTP_RETRIES and
+    GROUNDX_HTTP2. HTTP/2 is used when the h2 package is installed.
+    """
+    max_connections = max_connections if max_connections is not None else _env_int("GROUNDX_HTTP_MAX_CONNECTIONS", 20)
+    max_keepalive = max_keepalive if max_keepalive is not None else _env_int("GROUNDX_HTTP_MAX_KEEPALIVE", 10)
+    keepalive_expiry = keepalive_expiry if keepalive_expiry is not None else _env_float("GROUNDX_HTTP_KEEPALIVE_EXPIRY", 60.0)
+    connect_timeout = connect_timeout if connect_timeout is not None else _env_float("GROUNDX_CONNECT_TIMEOUT", 5.0)
+    read_timeout = read_timeout if read_timeout is not None else _env_float("GROUNDX_READ_TIMEOUT", 60.0)
+    retries = retries if retries is not None else _env_int("GROUNDX_HTTP_RETRIES", 3)
+    if http2 is None:
+        http2 = HTTP2_AVAILABLE and os.getenv("GROUNDX_HTTP2", "1").lower() not in ("0", "false", "no")
+
+    transport = httpx.HTTPTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
+    return httpx.Client(
+        transport=RetryTransport(transport, retries=retries),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        follow_redirects=True,
+    )
+
+
+_shared_http_client: Optional[httpx.Client] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide pooled client, so every GroundX user shares warm connections."""
+    global _shared_http_client
+    if _shared_http_client is None:
+        with _shared_lock:
+            if _shared_http_client is None:
+                _shared_http_client = create_http_client()
+    return _shared_http_client
+
+
+def create_groundx_client(
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None,
+    http_client: Optional[httpx.Client] = None,
+) -> GroundX:
+    """
+    GroundX client on the shared pooled transport.
+
+    api_key and base_url default to GROUNDX_API_KEY and GROUNDX_BASE_URL; the
+    public GroundX API is used when no base URL is set.
+    """
+    api_key = api_key or os.getenv("GROUNDX_API_KEY")
+    base_url = base_url or os.getenv("GROUNDX_BASE_URL")
+    if not api_key:
+        raise ValueError("GROUNDX_API_KEY not found in environment variables")
+
+    http_client = http_client or get_http_client()
+    if base_url:
+        client = GroundX(api_key=api_key, base_url=base_url, httpx_client=http_client)
+    else:
+        client = GroundX(api_key=api_key, httpx_client=http_client)
+    # Retries live in RetryTransport; the SDK's own loop would also replay
+    # non-idempotent uploads and multiply the attempts
+    client._client_wrapper.httpx_client.base_max_retries = 0
+    return client
@@ -0,0 +1,172 @@
+import os
+import queue
+import random
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = int(os.getenv("GROUNDX_PAGE_SIZE", "100"))
+DEFAULT_PREFETCH = int(os.getenv("GROUNDX_PAGE_PREFETCH", "2"))
+DEFAULT_DELETE_BATCH_SIZE = int(os.getenv("GROUNDX_DELETE_BATCH_SIZE", "50"))
+DEFAULT_DELETE_WORKERS = int(os.getenv("GROUNDX_DELETE_WORKERS", "4"))
+
+_DONE = object()
+
+
+def _fetch_pages(client: Any, bucket_id: int, page_size: int, lookup_kwargs: dict) -> Iterator[list]:
+    """Yield the documents of each lookup page, following next_token."""
+    next_token = None
+    while True:
+        response = client.documents.lookup(id=bucket_id, n=page_size, next_token=next_token, **lookup_kwargs)
+        documents = getattr(response, "documents", None) or []
+        if documents:
+            yield documents
+        next_token = getattr(response, "next_token", None)
+        if not next_token or not documents:
+            return
+
+
+def iter_bucket_documents(
+    client: Any,
+    bucket_id: int,
+    page_size: Optional[int] = None,
+    prefetch: Optional[int] = None,
+    **lookup_kwargs: Any,
+) -> Iterator[Any]:
+    """
+    Lazily iterate over the documents of one bucket.
+
+    Pages come from documents.lookup (bucket-scoped) instead of
+    documents.list (every document in the installation). With prefetch > 0
+    a background thread fetches up to that many pages ahead while the caller
+    consumes the current one. Extra keyword arguments (status, sort,
+    filter, ...) are passed through to lookup. Errors from any page are
+    raised in the caller.
+    """
+    page_size = page_size or DEFAULT_PAGE_SIZE
+    prefetch = DEFAULT_PREFETCH if prefetch is None else prefetch
+
+    if prefetch <= 0:
+        for page in _fetch_pages(client, bucket_id, page_size, lookup_kwargs):
+            yield from page
+        return
+
+    pages: "queue.Queue" = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def producer() -> None:
+        try:
+            for page in _fetch_pages(client, bucket_id, page_size, lookup_kwargs):
+                if not put(page):
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(_DONE)
+
+    thread = threading.Thread(target=producer, name=f"groundx-pages-{bucket_id}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+    finally:
+        # Stops the producer when the caller breaks out early
+        stop.set()
+
+
+def count_bucket_documents(client: Any, bucket_id: int) -> int:
+    """Number of documents in a bucket, from a single one-document lookup."""
+    response = client.documents.lookup(id=bucket_id, n=1)
+    total = getattr(response, "total", None)
+    if total is not None:
+        return total
+    # Older deployments may not report totals: page through instead
+    return sum(1 for _ in iter_bucket_documents(client, bucket_id))
+
+
+def _delete_batch(client: Any, batch: List[str], retries: int) -> None:
+    """Delete one batch, retrying with jittered backoff before giving up."""
+    attempt = 0
+    while True:
+        try:
+            client.documents.delete(document_ids=batch)
+            return
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            delay = random.uniform(0, min(8.0, 0.5 * (2 ** attempt)))
+            logger.warning(f"Delete batch of {len(batch)} failed ({str(e)}), retry {attempt + 1}/{retries} in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+def delete_documents(
+    client: Any,
+    document_ids: List[str],
+    batch_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    retries: int = 3,
+    progress: Optional[Callable[[int, int, float], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Delete documents in batches of batch_size with up to max_workers batches
+    in flight. Failed batches are retried; batches that still fail are
+    reported in the result rather than aborting the rest.
+
+    progress(deleted, total, elapsed_seconds) is called after each batch.
+    Returns deleted/failed counts, the failed IDs, elapsed seconds and
+    documents per second.
+    """
+    batch_size = batch_size or DEFAULT_DELETE_BATCH_SIZE
+    max_workers = max_workers or DEFAULT_DELETE_WORKERS
+    batches = [document_ids[i:i + batch_size] for i in range(0, len(document_ids), batch_size)]
+
+    deleted = 0
+    failed_ids: List[str] = []
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches) or 1))) as pool:
+        futures = {pool.submit(_delete_batch, client, batch, retries): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                future.result()
+                deleted += len(batch)
+            except Exception as e:
+                logger.error(f"Giving up on a batch of {len(batch)} documents: {str(e)}")
+                failed_ids.extend(batch)
+            if progress:
+                progress(deleted, len(document_ids), time.time() - start)
+
+    elapsed = time.time() - start
+    return {
+        "deleted": deleted,
+        "failed": len(failed_ids),
+        "failed_ids": failed_ids,
+        "batches": len(batches),
+        "seconds": round(elapsed, 2),
+        "docs_per_second": round(deleted / elapsed, 1) if elapsed > 0 else float(deleted),
+    }
+
+
+def log_delete_progress(deleted: int, total: int, elapsed: float) -> None:
+    """Default progress callback: deleted count, percentage and throughput."""
+    rate = deleted / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Deleted {deleted}/{total} documents ({100.0 * deleted / max(total, 1):.0f}%, {rate:.1f} docs/s)")
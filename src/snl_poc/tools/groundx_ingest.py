@@ -0,0 +1,195 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# The SDK refuses more than 50 documents or 50 MB in one ingest call
+MAX_BATCH_DOCS = 50
+MAX_BATCH_BYTES = 50 * 1024 * 1024
+
+DEFAULT_BATCH_DOCS = int(os.getenv("GROUNDX_INGEST_BATCH_DOCS", "20"))
+DEFAULT_BATCH_BYTES = int(os.getenv("GROUNDX_INGEST_BATCH_BYTES", str(20 * 1024 * 1024)))
+DEFAULT_WORKERS = int(os.getenv("GROUNDX_INGEST_WORKERS", "3"))
+DEFAULT_TIMEOUT = float(os.getenv("GROUNDX_INGEST_TIMEOUT", "1800"))
+
+TERMINAL_STATUSES = {"complete", "error", "cancelled"}
+
+
+def _document_bytes(document: Any) -> int:
+    path = getattr(document, "file_path", None)
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        # Remote URLs have no local size
+        return 0
+
+
+def make_batches(
+    documents: List[Any],
+    max_docs: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> List[List[Any]]:
+    """Group documents greedily into batches bounded by count and total file size."""
+    max_docs = min(max_docs or DEFAULT_BATCH_DOCS, MAX_BATCH_DOCS)
+    max_bytes = min(max_bytes or DEFAULT_BATCH_BYTES, MAX_BATCH_BYTES)
+
+    batches: List[List[Any]] = []
+    current: List[Any] = []
+    current_bytes = 0
+    for document in documents:
+        size = _document_bytes(document)
+        if current and (len(current) >= max_docs or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(document)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _status_of(response: Any) -> Optional[str]:
+    ingest = getattr(response, "ingest", None)
+    status = getattr(ingest, "status", None) or getattr(response, "status", None)
+    return status.lower() if isinstance(status, str) else status
+
+
+def wait_for_processes(
+    client: Any,
+    process_ids: List[str],
+    timeout: Optional[float] = None,
+    initial_interval: float = 1.0,
+    max_interval: float = 30.0,
+    backoff: float = 2.0,
+    on_finished: Optional[Callable[[str, str, float], None]] = None,
+) -> Dict[str, str]:
+    """
+    Poll every process ID from one loop until all reach a terminal status.
+
+    The wait between polling rounds starts at initial_interval and grows by
+    backoff up to max_interval. Status-check errors count as "still pending".
+    Processes that have not finished by the overall timeout are reported as
+    "timeout". on_finished(process_id, status, seconds_waited) is called
+    as each one completes.
+
+    Returns process ID -> final status.
+    """
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+    results: Dict[str, str] = {}
+    pending = list(dict.fromkeys(process_ids))
+    start = time.time()
+    interval = initial_interval
+
+    while pending:
+        for process_id in list(pending):
+            try:
+                status = _status_of(client.documents.get_processing_status_by_id(process_id=process_id))
+            except Exception as e:
+                logger.warning(f"Status check for {process_id} failed: {str(e)}")
+                continue
+            if status in TERMINAL_STATUSES:
+                pending.remove(process_id)
+                results[process_id] = status
+                if on_finished:
+                    on_finished(process_id, status, time.time() - start)
+
+        if not pending:
+            break
+        elapsed = time.time() - start
+        if elapsed >= timeout:
+            logger.warning(f"Gave up waiting for {len(pending)} ingest processes after {elapsed:.0f}s")
+            for process_id in pending:
+                results[process_id] = "timeout"
+            break
+        logger.info(f"Processing: {len(results)}/{len(results) + len(pending)} done, next check in {interval:.0f}s")
+        time.sleep(min(interval, max(0.0, timeout - elapsed)))
+        interval = min(interval * backoff, max_interval)
+
+    return results
+
+
+def ingest_batched(
+    client: Any,
+    documents: List[Any],
+    max_docs: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    wait: bool = True,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Upload documents in right-sized batches with up to max_workers uploads in
+    flight, then track all ingest processes with one poller.
+
+    Returns a summary with one entry per batch (file names, bytes, process
+    ID, upload and processing seconds, final status) plus totals. A batch
+    whose upload fails gets status "upload_failed"; with wait=False
+    statuses stay "submitted".
+    """
+    batches = make_batches(documents, max_docs, max_bytes)
+    max_workers = max_workers or DEFAULT_WORKERS
+    start = time.time()
+
+    reports: List[Dict[str, Any]] = [
+        {
+            "files": [getattr(d, "file_name", None) for d in batch],
+            "bytes": sum(_document_bytes(d) for d in batch),
+            "process_id": None,
+            "upload_seconds": None,
+            "processing_seconds": None,
+            "status": "pending",
+        }
+        for batch in batches
+    ]
+
+    def upload(index: int) -> None:
+        upload_start = time.time()
+        response = client.ingest(documents=batches[index])
+        reports[index]["upload_seconds"] = round(time.time() - upload_start, 2)
+        reports[index]["process_id"] = response.ingest.process_id
+        reports[index]["status"] = "submitted"
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches) or 1))) as pool:
+        futures = {pool.submit(upload, i): i for i in range(len(batches))}
+        for done, future in enumerate(as_completed(futures), start=1):
+            report = reports[futures[future]]
+            try:
+                future.result()
+                logger.info(f"Uploaded batch {done}/{len(batches)}: {len(report['files'])} files, "
+                            f"{report['bytes'] / 1024:.0f} KB in {report['upload_seconds']}s "
+                            f"(process {report['process_id']})")
+            except Exception as e:
+                report["status"] = "upload_failed"
+                logger.error(f"Upload of batch {done}/{len(batches)} ({len(report['files'])} files) failed: {str(e)}")
+    upload_seconds = time.time() - start
+
+    if wait:
+        by_process = {r["process_id"]: r for r in reports if r["process_id"]}
+        poll_start = time.time()
+
+        def finished(process_id: str, status: str, _: float) -> None:
+            report = by_process[process_id]
+            report["processing_seconds"] = round(time.time() - poll_start, 2)
+            done = sum(1 for r in by_process.values() if r["processing_seconds"] is not None)
+            logger.info(f"Batch {process_id} {status} after {report['processing_seconds']}s "
+                        f"({done}/{len(by_process)} batches processed)")
+
+        statuses = wait_for_processes(client, list(by_process), timeout=timeout, on_finished=finished)
+        for process_id, status in statuses.items():
+            by_process[process_id]["status"] = status
+
+    succeeded = [f for r in reports if r["status"] in ("complete", "submitted") for f in r["files"]]
+    summary = {
+        "batches": reports,
+        "documents": len(documents),
+        "succeeded_files": succeeded,
+        "failed_files": [f for r in reports if r["status"] not in ("complete", "submitted") for f in r["files"]],
+        "upload_seconds": round(upload_seconds, 2),
+        "total_seconds": round(time.time() - start, 2),
+    }
+    logger.info(f"Ingested {len(succeeded)}/{len(documents)} documents in {len(batches)} batches "
+                f"(upload {summary['upload_seconds']}s, total {summary['total_seconds']}s)")
+    return summary
@@ -4,11 +4,23 @@ import base64
 import json
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Type
-from groundx import GroundX, Document
+from groundx import Document
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import time
+import threading
+from src.snl_poc.tools.local_search import BM25Index, format_hits
+from src.snl_poc.languages import DEFAULT_LANGUAGE
+from src.snl_poc.tools.chunk_rerank import rerank_chunks, count_tokens
+from src.snl_poc.tools.adaptive_retrieval import select_adaptive
+from src.snl_poc.tools.context_compression import compress_chunks
+from src.snl_poc.tools.groundx_client import create_groundx_client
+from src.snl_poc.tools.groundx_ingest import ingest_batched
+from src.snl_poc.tools.groundx_documents import (
+    iter_bucket_documents, count_bucket_documents, delete_documents, log_delete_progress
+)
+from src.snl_poc.tools.resilience import CircuitBreaker, SearchCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +29,47 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Bucket discovery results survive restarts, so startup never waits on GroundX
+BUCKET_CACHE_TTL = float(os.getenv("GROUNDX_BUCKET_CACHE_TTL", "86400"))
+
+
+def _bucket_cache_path() -> Path:
+    cache_dir = os.getenv("GROUNDX_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "snl_poc")
+    return Path(cache_dir) / "groundx_buckets.json"
+
+
+def load_cached_bucket(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Cached discovery result for cache_key, or None when missing or expired."""
+    try:
+        with open(_bucket_cache_path(), "r", encoding="utf-8") as f:
+            entry = json.load(f).get(cache_key)
+    except (OSError, ValueError):
+        return None
+    if not entry or time.time() - entry.get("cached_at", 0) > BUCKET_CACHE_TTL:
+        return None
+    return entry
+
+
+def save_cached_bucket(cache_key: str, **fields: Any) -> None:
+    """Merge fields into the cache entry for cache_key. Write failures are only logged."""
+    path = _bucket_cache_path()
+    try:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        entry = data.get(cache_key, {})
+        entry.update(fields, cached_at=time.time())
+        data[cache_key] = entry
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write bucket cache {path}: {str(e)}")
+
 class GroundXSearchSchema(BaseModel):
     """Input schema for GroundX search."""
     query: str = Field(..., description="The search query to find relevant information")
@@ -33,9 +86,37 @@ class GroundXTool(BaseTool):
     bucket_name: str = "itnb"
     client: Optional[Any] = None
     _bucket_id: Optional[int] = None
+    _bucket_lock: Optional[Any] = None
+    _existing_loaded: bool = False
     _knowledge_dir: Optional[str] = None
     _ingested_files: Dict[str, bool] = {}
     max_chunks: int = 4  # Configurable max chunks to retrieve
+    # Local BM25 tier: "off", "fallback" (only when GroundX fails) or "first"
+    # (answer locally when the best BM25 score reaches local_min_score)
+    local_search_mode: str = "fallback"
+    local_min_score: float = 5.0
+    _local_index: Optional[BM25Index] = None
+    _local_corpus_dir: Optional[str] = None
+    # Post-retrieval reranking: fetch max_chunks * oversample candidates,
+    # drop duplicates and keep the best max_chunks
+    rerank_enabled: bool = True
+    oversample: int = 3
+    max_chunks_per_source: int = 1
+    # Turn JSON chunks into compact text before they reach the LLM
+    compress_context: bool = True
+    # Adaptive depth: fetch candidate_pool chunks once, then choose 1..adaptive_max_chunks
+    # by query complexity, relevance-score gaps and a prompt token budget
+    adaptive_chunks: bool = True
+    candidate_pool: int = 12
+    adaptive_max_chunks: int = 6
+    context_token_budget: int = 1500
+    # Filter English searches on language too. Off until the bucket's English
+    # documents carry the language tag (see "Language tags" in the README)
+    filter_english: bool = False
+    _last_retrieval_stats: Dict[str, Any] = {}
+    # Fail fast while GroundX is unhealthy; cache results (stale-while-revalidate)
+    _breaker: Optional[CircuitBreaker] = None
+    _search_cache: Optional[SearchCache] = None
     
     def __init__(
         self,
@@ -43,26 +124,43 @@ class GroundXTool(BaseTool):
         bucket_id: Optional[int] = None,
         knowledge_dir: Optional[str] = None,
         max_chunks: int = 4,
+        local_search_mode: Optional[str] = None,
+        local_corpus_dir: Optional[str] = None,
         **kwargs
     ):
         """Initialize the GroundX tool."""
         super().__init__(**kwargs)
         
-        # Initialize GroundX client with on-premise configuration
-        api_key = os.getenv("GROUNDX_API_KEY")
+        # Initialize GroundX client on the shared pooled transport
         base_url = os.getenv("GROUNDX_BASE_URL")
-        if not api_key:
-            raise ValueError("GROUNDX_API_KEY not found in environment variables")
-        
-        # Use on-premise configuration if available
+        self.client = create_groundx_client(base_url=base_url)
         if base_url:
-            self.client = GroundX(api_key=api_key, base_url=base_url)
             logger.info(f"Using on-premise GroundX at: {base_url}")
         else:
-            self.client = GroundX(api_key=api_key)
             logger.info("Using default GroundX API")
         self.bucket_name = bucket_name
         self.max_chunks = max_chunks
+        self.local_search_mode = (local_search_mode or os.getenv("GROUNDX_LOCAL_SEARCH", "fallback")).lower()
+        self.local_min_score = float(os.getenv("GROUNDX_LOCAL_MIN_SCORE", str(self.local_min_score)))
+        self._local_corpus_dir = local_corpus_dir
+        self.rerank_enabled = os.getenv("GROUNDX_RERANK", "1").lower() not in ("0", "false", "no")
+        self.oversample = max(1, int(os.getenv("GROUNDX_OVERSAMPLE", str(self.oversample))))
+        self.max_chunks_per_source = max(1, int(os.getenv("GROUNDX_MAX_CHUNKS_PER_SOURCE", str(self.max_chunks_per_source))))
+        self.compress_context = os.getenv("GROUNDX_COMPRESS_CONTEXT", "1").lower() not in ("0", "false", "no")
+        self.adaptive_chunks = os.getenv("GROUNDX_ADAPTIVE_CHUNKS", "1").lower() not in ("0", "false", "no")
+        self.candidate_pool = max(1, int(os.getenv("GROUNDX_CANDIDATE_POOL", str(self.candidate_pool))))
+        self.adaptive_max_chunks = max(1, int(os.getenv("GROUNDX_ADAPTIVE_MAX_CHUNKS", str(self.adaptive_max_chunks))))
+        self.context_token_budget = int(os.getenv("GROUNDX_CONTEXT_TOKEN_BUDGET", str(self.context_token_budget)))
+        self.filter_english = os.getenv("GROUNDX_FILTER_ENGLISH", "0").lower() in ("1", "true", "yes")
+        self._breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv("GROUNDX_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("GROUNDX_BREAKER_RESET_SECONDS", "30"))
+        )
+        self._search_cache = SearchCache(
+            ttl=float(os.getenv("GROUNDX_CACHE_TTL", "300")),
+            stale_ttl=float(os.getenv("GROUNDX_CACHE_STALE_TTL", "3600")),
+            negative_ttl=float(os.getenv("GROUNDX_NEGATIVE_CACHE_TTL", "15"))
+        )
         
         # Set knowledge directory
         self._knowledge_dir = knowledge_dir or os.path.join(
@@ -71,20 +169,49 @@ class GroundXTool(BaseTool):
         )
         logger.info(f"Knowledge directory: {self._knowledge_dir}")
         
-        # Setup bucket and store ID
+        # No network I/O here: the bucket is resolved on first use (or from the
+        # disk cache) and existing documents are only looked up when ingesting
+        self._bucket_lock = threading.Lock()
         if bucket_id:
             # Use directly provided bucket_id
             self._bucket_id = bucket_id
             logger.info(f"Using directly specified bucket ID: {bucket_id}")
         else:
-            # Use bucket name lookup (existing behavior)
-            self._bucket_id = self._setup_bucket_improved()
+            cached = load_cached_bucket(self._bucket_cache_key())
+            if cached and cached.get("bucket_id"):
+                self._bucket_id = cached["bucket_id"]
+                logger.info(f"Using cached bucket ID {self._bucket_id} for '{bucket_name}'")
         
-        # Get existing documents
-        self._get_existing_documents()
+        # Optional: discover the bucket and print its status without blocking startup
+        if os.getenv("GROUNDX_BACKGROUND_INIT", "0").lower() in ("1", "true", "yes"):
+            self.start_background_init()
+    
+    def _bucket_cache_key(self) -> str:
+        return f"{os.getenv('GROUNDX_BASE_URL') or 'default'}|{self.bucket_name}"
+    
+    def _ensure_bucket(self) -> Optional[int]:
+        """Bucket ID, discovering it by name (once, then cached on disk) if needed."""
+        if self._bucket_id:
+            return self._bucket_id
+        with self._bucket_lock:
+            if not self._bucket_id:
+                self._bucket_id = self._setup_bucket_improved()
+                if self._bucket_id:
+                    save_cached_bucket(self._bucket_cache_key(), bucket_id=self._bucket_id)
+        return self._bucket_id
+    
+    def start_background_init(self) -> threading.Thread:
+        """Resolve the bucket and print its status in a daemon thread."""
+        def init():
+            try:
+                self._ensure_bucket()
+                self._print_bucket_status()
+            except Exception as e:
+                logger.error(f"Background GroundX init failed: {str(e)}")
         
-        # Print bucket status for debugging
-        self._print_bucket_status()
+        thread = threading.Thread(target=init, name="groundx-init", daemon=True)
+        thread.start()
+        return thread
     
     def _setup_bucket_improved(self) -> Optional[int]:
         """Find the bucket with the most documents using improved logic."""
@@ -98,16 +225,11 @@ class GroundXTool(BaseTool):
                 logger.warning("No buckets found in the system")
                 return None
             
-            # Get all documents
-            documents_response = self.client.documents.list()
-            
-            # Find buckets with matching name and count documents
+            # Find buckets with matching name and count their documents
             matching_buckets = []
             for bucket in buckets_response.buckets:
                 if bucket.name == self.bucket_name:
-                    doc_count = 0
-                    if hasattr(documents_response, 'documents') and documents_response.documents:
-                        doc_count = len([doc for doc in documents_response.documents if doc.bucket_id == bucket.bucket_id])
+                    doc_count = count_bucket_documents(self.client, bucket.bucket_id)
                     
                     matching_buckets.append({
                         'id': bucket.bucket_id,
@@ -136,16 +258,12 @@ class GroundXTool(BaseTool):
                 print("❌ No active bucket found")
                 return
             
-            # Get documents in this bucket
-            documents_response = self.client.documents.list()
-            bucket_docs = []
-            
-            if hasattr(documents_response, 'documents') and documents_response.documents:
-                bucket_docs = [doc for doc in documents_response.documents if doc.bucket_id == self._bucket_id]
+            doc_count = count_bucket_documents(self.client, self._bucket_id)
+            save_cached_bucket(self._bucket_cache_key(), bucket_id=self._bucket_id, doc_count=doc_count)
             
             print("=" * 50)
             print(f"📦 GroundX Bucket: {self.bucket_name} (ID: {self._bucket_id})")
-            print(f"📁 Documents: {len(bucket_docs)}")
+            print(f"📁 Documents: {doc_count}")
             print("=" * 50)
             
         except Exception as e:
@@ -185,14 +303,12 @@ class GroundXTool(BaseTool):
         """Get list of existing document names in the bucket to avoid duplicates."""
         try:
             logger.info(f"Retrieving existing documents for bucket {self._bucket_id}")
-            docs = self.client.documents.lookup(id=self._bucket_id)
-            
-            if hasattr(docs, 'documents'):
-                for doc in docs.documents:
-                    if hasattr(doc, 'file_name'):
-                        self._ingested_files[doc.file_name] = True
-                        logger.info(f"Found existing document: {doc.file_name}")
+            for doc in iter_bucket_documents(self.client, self._bucket_id):
+                if getattr(doc, 'file_name', None):
+                    self._ingested_files[doc.file_name] = True
+                    logger.info(f"Found existing document: {doc.file_name}")
             
+            self._existing_loaded = True
             logger.info(f"Found {len(self._ingested_files)} existing documents")
         except Exception as e:
             logger.error(f"Error retrieving existing documents: {str(e)}")
@@ -207,6 +323,12 @@ class GroundXTool(BaseTool):
                 logger.error(f"Knowledge directory not found: {self._knowledge_dir}")
                 return False
             
+            if not self._ensure_bucket():
+                logger.error(f"No GroundX bucket available for '{self.bucket_name}'")
+                return False
+            if not self._existing_loaded:
+                self._get_existing_documents()
+            
             logger.info(f"Ingesting documents from {self._knowledge_dir} into bucket {self._bucket_id}")
             
             # Supported file types
@@ -224,179 +346,324 @@ class GroundXTool(BaseTool):
                 '.json': 'json'
             }
             
-            # Process files
-            success = False
-            new_docs = 0
+            # Collect files that are not in the bucket yet
+            documents = []
             skipped_docs = 0
-            
             for file_path in knowledge_path.glob("**/*"):
                 if file_path.is_file() and file_path.suffix.lower() in supported_extensions:
-                    try:
-                        file_type = supported_extensions[file_path.suffix.lower()]
-                        file_name = file_path.name
-                        file_path_str = str(file_path.absolute())
-                        
-                        # Skip already ingested files
-                        if file_name in self._ingested_files:
-                            logger.info(f"Skipping already ingested file: {file_name}")
-                            skipped_docs += 1
-                            continue
-                        
-                        logger.info(f"Processing {file_name} ({file_type})")
-                        
-                        # Create document using the format from the documentation
-                        doc = Document(
-                            bucket_id=self._bucket_id,
-                            file_name=file_name,
-                            file_path=file_path_str,
-                            file_type=file_type
-                        )
-                        
-                        # Ingest document
-                        logger.info(f"Ingesting document with bucket_id={self._bucket_id}, file_name={file_name}")
-                        response = self.client.ingest(documents=[doc])
-                        
-                        # Get process_id directly as shown in logs
-                        if hasattr(response, 'ingest') and hasattr(response.ingest, 'process_id'):
-                            process_id = response.ingest.process_id
-                            logger.info(f"Ingestion started for {file_name}. Process ID: {process_id}")
-                            self._ingested_files[file_name] = True
-                            new_docs += 1
-                            success = True
-                        else:
-                            logger.error(f"Could not find process_id in response: {response}")
+                    file_name = file_path.name
                     
-                    except Exception as e:
-                        logger.error(f"Error ingesting {file_path}: {str(e)}")
-            
-            # Consider it a success if we found documents, even if all were skipped
-            total_docs = new_docs + skipped_docs
-            if total_docs > 0 and not success:
-                logger.info("No new documents were ingested, but existing documents were found and skipped")
-                success = True
-            elif total_docs == 0:
+                    # Skip already ingested files
+                    if file_name in self._ingested_files:
+                        logger.info(f"Skipping already ingested file: {file_name}")
+                        skipped_docs += 1
+                        continue
+                    
+                    documents.append(Document(
+                        bucket_id=self._bucket_id,
+                        file_name=file_name,
+                        file_path=str(file_path.absolute()),
+                        file_type=supported_extensions[file_path.suffix.lower()],
+                        # Searches always filter on language; knowledge files are English
+                        filter={"language": DEFAULT_LANGUAGE}
+                    ))
+            
+            if not documents:
+                if skipped_docs:
+                    logger.info("No new documents were ingested, but existing documents were found and skipped")
+                    return True
                 logger.warning("No documents were found to process")
-
-            logger.info(f"Ingestion summary: {new_docs} new files ingested, {skipped_docs} files skipped")
-            return success
+                return False
+            
+            # Upload in batches with bounded concurrency and wait for processing with one poller
+            summary = ingest_batched(self.client, documents)
+            for file_name in summary["succeeded_files"]:
+                self._ingested_files[file_name] = True
+            
+            logger.info(f"Ingestion summary: {len(summary['succeeded_files'])} new files ingested, "
+                        f"{len(summary['failed_files'])} failed, {skipped_docs} files skipped")
+            return not summary["failed_files"]
             
         except Exception as e:
             logger.error(f"Error ingesting documents: {str(e)}")
             return False
     
-    def _wait_for_processing(self, process_id: str, max_attempts: int = 10) -> None:
-        """Wait for document processing to complete."""
-        import time
-        
-        logger.info(f"Waiting for processing to complete for process ID: {process_id}")
-        attempts = 0
-        while attempts < max_attempts:
+    def _get_local_index(self) -> Optional[BM25Index]:
+        """Build the local BM25 index on first use."""
+        if self._local_index is None:
             try:
-                response = self.client.documents.get_processing_status_by_id(process_id=process_id)
-                
-                # Log the full response to understand its structure
-                logger.info(f"Processing status response: {response}")
-                
-                # Check different possible status attributes
-                status = None
-                if hasattr(response, 'ingest'):
-                    if hasattr(response.ingest, 'status'):
-                        status = response.ingest.status
-                elif hasattr(response, 'status'):
-                    status = response.status
-                
-                if status:
-                    logger.info(f"Processing status: {status}")
-                    if status.lower() in ["complete", "failed", "cancelled", "error"]:
-                        return
-                
-                attempts += 1
-                time.sleep(5)
+                self._local_index = BM25Index.from_directory(self._local_corpus_dir)
             except Exception as e:
-                logger.error(f"Error checking processing status: {str(e)}")
-                attempts += 1
-                time.sleep(5)
+                logger.error(f"Error building local BM25 index: {str(e)}")
+        return self._local_index
+    
+    def _search_local(self, query: str, language: Optional[str] = None, min_score: float = 0.0) -> str:
+        """Search the local BM25 index. Returns "" when nothing scores at least min_score."""
+        index = self._get_local_index()
+        if index is None:
+            return ""
         
-        logger.warning(f"Reached maximum wait attempts. Processing may still be ongoing.")
+        local_start = time.time()
+        hits = index.search(query, k=self.max_chunks, language=language or "en")
+        local_time = time.time() - local_start
+        print(f"[PROFILE] Local BM25 search took {local_time * 1000:.2f} ms")
+        
+        if not hits or hits[0]["score"] < min_score:
+            best = hits[0]["score"] if hits else 0.0
+            print(f"[DEBUG GROUNDX] Local BM25 best score {best:.2f} below threshold {min_score:.2f}")
+            return ""
+        
+        print(f"[DEBUG GROUNDX] Answering from local BM25 index with {len(hits)} documents (best score {hits[0]['score']:.2f})")
+        return format_hits(hits)
     
-    def _run(self, query: str) -> str:
+    def _run(self, query: str, language: Optional[str] = None) -> str:
+        """
+        Search the bucket. When `language` is given (and not English), only
+        documents tagged with that language are searched, so queries in a
+        pre-translated corpus language don't need to be translated first.
+        English searches are filtered too with GROUNDX_FILTER_ENGLISH=1.
+
+        Results are cached. Stale entries are served while a background
+        refresh runs, and empty or error results are cached briefly. After
+        repeated GroundX failures the circuit breaker opens and searches fail
+        fast (or use the local index) until a probe call succeeds.
+        """
+        print(f"[DEBUG GROUNDX] _run() called with query: '{query[:50]}...' (length: {len(query)})")
+        
+        # Validate query is not empty
+        if not query or not query.strip():
+            print(f"[DEBUG GROUNDX] Empty query detected, returning error message")
+            return "Error: Search query cannot be empty. Please provide a valid search term."
+        
+        # Local first tier: skip the network round-trip when BM25 is confident
+        if self.local_search_mode == "first":
+            local_content = self._search_local(query, language, min_score=self.local_min_score)
+            if local_content:
+                return local_content
+        
+        cache_key = f"{language or 'en'}:{query.strip().lower()}"
+        cached, status = self._search_cache.get(cache_key)
+        if status in ("fresh", "negative"):
+            print(f"[DEBUG GROUNDX] Serving {status} cached result")
+            return cached
+        if status == "stale":
+            print(f"[DEBUG GROUNDX] Serving stale cached result, refreshing in the background")
+            self._refresh_in_background(cache_key, query, language)
+            return cached
+        
+        if not self._breaker.allow():
+            print(f"[DEBUG GROUNDX] Circuit breaker open, skipping GroundX")
+            return self._fallback(query, language, "Error: GroundX search is temporarily unavailable")
+        
         try:
-            print(f"[DEBUG GROUNDX] _run() called with query: '{query[:50]}...' (length: {len(query)})")
-            
-            # Validate query is not empty
-            if not query or not query.strip():
-                print(f"[DEBUG GROUNDX] Empty query detected, returning error message")
-                return "Error: Search query cannot be empty. Please provide a valid search term."
-            
-            # Limit chunks at API level for efficiency
-            print(f"[DEBUG GROUNDX] Requesting max {self.max_chunks} chunks from GroundX API")
-            
-            retrieval_start = time.time()
-            search_result = self.client.search.content(
-                id=self._bucket_id,
-                query=query.strip(),  # Ensure query is trimmed
-                verbosity=2,
-                n=self.max_chunks  # Limit results at API level
-            )
-            retrieval_time = time.time() - retrieval_start
-            print(f"[PROFILE] Retrieval took {retrieval_time:.2f} seconds")
-            
-            sources_set = set()
-            texts = []
-            total_chunks_found = 0
-            
-            if hasattr(search_result, 'search') and hasattr(search_result.search, 'results'):
-                total_chunks_found = len(search_result.search.results)
-                print(f"[DEBUG GROUNDX] Received {total_chunks_found} chunks from GroundX (requested max {self.max_chunks})")
-                
-                for i, result in enumerate(search_result.search.results):
-                    text = getattr(result, 'text', '')
-                    print(f"[DEBUG GROUNDX] Chunk {i+1} length: {len(text)} chars")
-                    print(f"[DEBUG GROUNDX] Raw chunk {i+1}: {text[:200]}...")
-                    try:
-                        chunk_data = json.loads(text)
+            content = self._search_groundx(query, language)
+        except Exception as e:
+            print(f"[DEBUG GROUNDX] Error in _run(): {str(e)}")
+            self._breaker.record_failure(e)
+            result = self._fallback(query, language, f"Error searching documents: {str(e)}")
+            self._search_cache.put(cache_key, result, negative=True)
+            return result
+        
+        self._breaker.record_success()
+        self._search_cache.put(cache_key, content, negative=not content.strip())
+        return content
+    
+    def _fallback(self, query: str, language: Optional[str], error: str) -> str:
+        """Local BM25 results when GroundX is down or slow, otherwise the error message."""
+        if self.local_search_mode in ("fallback", "first"):
+            local_content = self._search_local(query, language)
+            if local_content:
+                print(f"[DEBUG GROUNDX] Served results from local BM25 fallback")
+                return local_content
+        return error
+    
+    def _refresh_in_background(self, cache_key: str, query: str, language: Optional[str]) -> None:
+        """Re-run a search for a stale cache entry without blocking the caller."""
+        if not self._search_cache.start_refresh(cache_key):
+            return
+        if not self._breaker.allow():
+            self._search_cache.finish_refresh(cache_key)
+            return
+        
+        def refresh():
+            try:
+                content = self._search_groundx(query, language)
+                self._breaker.record_success()
+                if content.strip():
+                    self._search_cache.put(cache_key, content)
+            except Exception as e:
+                logger.error(f"Background refresh failed: {str(e)}")
+                self._breaker.record_failure(e)
+            finally:
+                self._search_cache.finish_refresh(cache_key)
+        
+        threading.Thread(target=refresh, daemon=True).start()
+    
+    def _search_groundx(self, query: str, language: Optional[str] = None) -> str:
+        """Query GroundX and build the prompt context. Raises when the search fails."""
+        # Adaptive depth fetches one larger candidate set and cuts it locally;
+        # otherwise oversample only when reranking so duplicates can be dropped
+        if self.adaptive_chunks:
+            request_n = max(self.candidate_pool, self.adaptive_max_chunks)
+        elif self.rerank_enabled:
+            request_n = self.max_chunks * self.oversample
+        else:
+            request_n = self.max_chunks
+        print(f"[DEBUG GROUNDX] Requesting max {request_n} chunks from GroundX API")
+        
+        # Translated documents are always tagged. English ones only after the
+        # re-tag migration, so English is filtered only once that has run
+        language = language or DEFAULT_LANGUAGE
+        search_kwargs = {}
+        if language != DEFAULT_LANGUAGE or self.filter_english:
+            search_kwargs["filter"] = {"language": language}
+            print(f"[DEBUG GROUNDX] Restricting search to '{language}' documents")
+        
+        bucket_id = self._ensure_bucket()
+        if not bucket_id:
+            raise ValueError(f"No GroundX bucket found for '{self.bucket_name}'")
+        
+        retrieval_start = time.time()
+        search_result = self.client.search.content(
+            id=bucket_id,
+            query=query.strip(),  # Ensure query is trimmed
+            verbosity=2,
+            n=request_n,  # Limit results at API level
+            **search_kwargs
+        )
+        retrieval_time = time.time() - retrieval_start
+        print(f"[PROFILE] Retrieval took {retrieval_time:.2f} seconds")
+        
+        candidates = []
+        total_chunks_found = 0
+        
+        if hasattr(search_result, 'search') and hasattr(search_result.search, 'results') and search_result.search.results:
+            total_chunks_found = len(search_result.search.results)
+            print(f"[DEBUG GROUNDX] Received {total_chunks_found} chunks from GroundX (requested max {request_n})")
+            
+            for i, result in enumerate(search_result.search.results):
+                text = getattr(result, 'text', '') or ''
+                source_url = None
+                page_url = None
+                print(f"[DEBUG GROUNDX] Chunk {i+1} length: {len(text)} chars")
+                print(f"[DEBUG GROUNDX] Raw chunk {i+1}: {text[:200]}...")
+                try:
+                    chunk_data = json.loads(text)
+                    if isinstance(chunk_data, dict):
                         print(f"[DEBUG GROUNDX] Chunk {i+1} JSON keys: {list(chunk_data.keys())}")
+                        page_url = chunk_data.get('url')
                         # Extract source_url if it exists
                         if 'source_url' in chunk_data:
                             source_url = chunk_data['source_url']
-                            sources_set.add(source_url)
                             print(f"[DEBUG GROUNDX] Found source_url in chunk {i+1}: {source_url}")
                         else:
                             print(f"[DEBUG GROUNDX] No source_url found in chunk {i+1}")
-                        texts.append(text)
-                    except json.JSONDecodeError:
-                        print(f"[DEBUG GROUNDX] Chunk {i+1} is not valid JSON, using as plain text")
-                        texts.append(text)
-            else:
-                print(f"[DEBUG GROUNDX] No search results found in response")
-            
-            print(f"[DEBUG GROUNDX] Using all {len(texts)} retrieved chunks (no post-retrieval limiting needed)")
-            
-            # Combine all text content
-            content = "\n\n".join(texts)
-            
-            # Add sources in the format expected by frontend: [PRIMARY_SOURCE: url]
-            if sources_set:
-                sources_list = list(sources_set)
-                # Frontend expects individual [PRIMARY_SOURCE: url] markers for each source
-                primary_source_markers = []
-                for url in sources_list:
-                    primary_source_markers.append(f"[PRIMARY_SOURCE: {url}]")
+                except json.JSONDecodeError:
+                    print(f"[DEBUG GROUNDX] Chunk {i+1} is not valid JSON, using as plain text")
                 
-                # Add all source markers to content
-                sources_text = "\n\n" + "\n".join(primary_source_markers)
-                content += sources_text
-                
-                print(f"[DEBUG GROUNDX] Added {len(sources_list)} source URLs in PRIMARY_SOURCE format")
-                print(f"[DEBUG GROUNDX] Primary source markers: {sources_text.strip()}")
-            
-            print(f"[DEBUG GROUNDX] Final content length: {len(content)} chars")
-            print(f"[DEBUG GROUNDX] Final content preview: {content[-200:]}")  # Last 200 chars to see sources
-            return content
+                candidates.append({
+                    "text": text,
+                    "score": getattr(result, 'score', None) or 0.0,
+                    "source_url": source_url,
+                    # Chunks of the same page count as the same source when deduplicating
+                    "source_key": source_url or page_url or getattr(result, 'document_id', None),
+                })
+        else:
+            print(f"[DEBUG GROUNDX] No search results found in response")
         
-        except Exception as e:
-            print(f"[DEBUG GROUNDX] Error in _run(): {str(e)}")
-            return f"Error searching documents: {str(e)}"
+        # Token savings are measured against the plain prompt: the first max_chunks
+        # chunks in GroundX order (counted now, compression edits the texts in place)
+        baseline_tokens = sum(count_tokens(c["text"]) for c in candidates[:self.max_chunks])
+        
+        # Post-retrieval: drop near-duplicates and keep the best reranked subset
+        if self.rerank_enabled and candidates:
+            chunks, rerank_stats = rerank_chunks(
+                query,
+                candidates,
+                keep=request_n if self.adaptive_chunks else self.max_chunks,
+                max_per_source=self.max_chunks_per_source,
+                baseline_n=self.max_chunks
+            )
+            print(f"[PROFILE] Rerank kept {rerank_stats['selected']}/{rerank_stats['candidates']} chunks "
+                  f"({rerank_stats['dropped_duplicates']} duplicates, {rerank_stats['dropped_low_score']} low-score dropped)"
+                  # Adaptive depth picks the prompt chunks afterwards and reports the savings
+                  + ("" if self.adaptive_chunks else
+                     f", prompt tokens {rerank_stats['baseline_tokens']} -> {rerank_stats['selected_tokens']} "
+                     f"(saved {rerank_stats['tokens_saved']})"))
+        else:
+            chunks = candidates if self.adaptive_chunks else candidates[:self.max_chunks]
+        
+        # Compress raw JSON chunks into compact, query-focused text
+        if self.compress_context and chunks:
+            chunks, compression_stats = compress_chunks(chunks, query)
+            print(f"[PROFILE] Context compression: {compression_stats['tokens_before']} -> "
+                  f"{compression_stats['tokens_after']} prompt tokens (saved {compression_stats['tokens_saved']})")
+        
+        # Adaptive depth: cut the ranked list at the first relevance gap or the token budget
+        depth_stats = None
+        if self.adaptive_chunks and chunks:
+            chunks, depth_stats = select_adaptive(
+                query,
+                chunks,
+                base_chunks=self.max_chunks,
+                max_chunks=self.adaptive_max_chunks,
+                token_budget=self.context_token_budget
+            )
+            print(f"[PROFILE] Adaptive depth ({depth_stats['complexity']} query, cap {depth_stats['cap']}): "
+                  f"chose {depth_stats['chosen']}/{depth_stats['candidates']} chunks, "
+                  f"prompt tokens {baseline_tokens} -> {depth_stats['prompt_tokens']} "
+                  f"(saved {baseline_tokens - depth_stats['prompt_tokens']}), stopped by {depth_stats['stop_reason']}")
+        
+        texts = [chunk["text"] for chunk in chunks]
+        sources_list = []
+        for chunk in chunks:
+            if chunk["source_url"] and chunk["source_url"] not in sources_list:
+                sources_list.append(chunk["source_url"])
+        
+        # Combine all text content
+        content = "\n\n".join(texts)
+        
+        # Add sources in the format expected by frontend: [PRIMARY_SOURCE: url]
+        if sources_list:
+            # Frontend expects individual [PRIMARY_SOURCE: url] markers for each source
+            primary_source_markers = []
+            for url in sources_list:
+                primary_source_markers.append(f"[PRIMARY_SOURCE: {url}]")
+            
+            # Add all source markers to content
+            sources_text = "\n\n" + "\n".join(primary_source_markers)
+            content += sources_text
+            
+            print(f"[DEBUG GROUNDX] Added {len(sources_list)} source URLs in PRIMARY_SOURCE format")
+            print(f"[DEBUG GROUNDX] Primary source markers: {sources_text.strip()}")
+        
+        self._last_retrieval_stats = {
+            "query": query,
+            "language": language or "en",
+            "retrieval_seconds": round(retrieval_time, 3),
+            "candidates": total_chunks_found,
+            "chosen": len(chunks),
+            "complexity": depth_stats["complexity"] if depth_stats else None,
+            "prompt_chars": len(content),
+            "prompt_tokens": count_tokens(content),
+        }
+        print(f"[PROFILE] Retrieval stats: {self._last_retrieval_stats}")
+        
+        print(f"[DEBUG GROUNDX] Final content length: {len(content)} chars")
+        print(f"[DEBUG GROUNDX] Final content preview: {content[-200:]}")  # Last 200 chars to see sources
+        return content
+    
+    def get_last_retrieval_stats(self) -> Dict[str, Any]:
+        """Chunk count and prompt size of the most recent search."""
+        return dict(self._last_retrieval_stats)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Circuit breaker state, cache counters and the last retrieval stats."""
+        return {
+            "circuit_breaker": self._breaker.snapshot(),
+            "search_cache": self._search_cache.snapshot(),
+            "last_retrieval": self.get_last_retrieval_stats(),
+        }
     
     def test_search(self, query: str) -> str:
         """Test search functionality with the given query."""
@@ -408,20 +675,18 @@ class GroundXTool(BaseTool):
     def clear_bucket(self) -> bool:
         """Delete all documents in the bucket."""
         try:
-            logger.info(f"Clearing all documents from bucket {self._bucket_id}")
-            docs = self.client.documents.lookup(id=self._bucket_id)
-            
-            if hasattr(docs, 'documents'):
-                doc_ids = []
-                for doc in docs.documents:
-                    if hasattr(doc, 'document_id'):
-                        doc_ids.append(doc.document_id)
-                
-                if doc_ids:
-                    logger.info(f"Deleting {len(doc_ids)} documents")
-                    self.client.documents.delete(document_ids=doc_ids)
-                    self._ingested_files = {}
-                    return True
+            bucket_id = self._ensure_bucket()
+            logger.info(f"Clearing all documents from bucket {bucket_id}")
+            # Collect every page first: deleting while paging would shift the pages
+            doc_ids = [doc.document_id for doc in iter_bucket_documents(self.client, bucket_id)
+                       if getattr(doc, 'document_id', None)]
+            
+            if doc_ids:
+                logger.info(f"Deleting {len(doc_ids)} documents")
+                result = delete_documents(self.client, doc_ids, progress=log_delete_progress)
+                self._ingested_files = {}
+                self._existing_loaded = False
+                return result["failed"] == 0
             
             logger.info("No documents to delete")
             return True
@@ -5,10 +5,11 @@ import time
 import hashlib
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Type
-from groundx import GroundX, Document
+from groundx import Document, GroundXEnvironment
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+from src.snl_poc.tools.groundx_client import create_groundx_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -44,12 +45,8 @@ class OptimizedGroundXTool(BaseTool):
         """Initialize the optimized GroundX tool."""
         super().__init__(**kwargs)
         
-        # Initialize GroundX client
-        api_key = os.getenv("GROUNDX_API_KEY")
-        if not api_key:
-            raise ValueError("GROUNDX_API_KEY not found in environment variables")
-        
-        self.client = GroundX(api_key=api_key)
+        # Initialize GroundX client (Phoenix lives on the public API)
+        self.client = create_groundx_client(base_url=GroundXEnvironment.DEFAULT.value)
         self.bucket_name = bucket_name
         self.max_chunks = max_chunks
         self._cache = {}
@@ -0,0 +1,75 @@
+import re
+from typing import Dict, Optional
+
+# Languages the ITNB website (and therefore the corpus) is published in
+from src.snl_poc.languages import SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE, LANGUAGE_NAMES
+
+# Short, high-frequency function words are enough to tell these four apart
+# for typical chat questions.
+_STOPWORDS = {
+    "en": {
+        "the", "is", "are", "what", "who", "how", "does", "do", "you", "your",
+        "and", "of", "for", "with", "about", "which", "can", "tell", "me",
+        "offer", "services", "where", "when", "why", "this", "that", "it's",
+    },
+    "de": {
+        "der", "die", "das", "ist", "sind", "was", "wer", "wie", "welche",
+        "und", "für", "mit", "über", "ich", "sie", "bietet", "gibt", "es",
+        "ein", "eine", "nicht", "auch", "wo", "warum", "können", "kann",
+    },
+    "fr": {
+        "le", "la", "les", "est", "sont", "que", "qui", "quoi", "comment",
+        "quels", "quelles", "quel", "et", "pour", "avec", "sur", "je", "vous",
+        "des", "une", "du", "propose", "où", "pourquoi", "ce",
+    },
+    "it": {
+        "il", "lo", "gli", "è", "sono", "che", "chi", "cosa", "come", "quali",
+        "quale", "e", "per", "con", "su", "io", "voi", "della", "delle",
+        "dove", "perché", "questo", "di", "una", "del",
+    },
+}
+
+# Characters that only (or almost only) appear in one of the languages
+_CHARACTER_HINTS = {
+    "de": re.compile(r"[äöüß]"),
+    "fr": re.compile(r"[çéèêëàâîïôûœ]"),
+    "it": re.compile(r"[ìòù]"),
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-zàâäçéèêëìîïòôöùûüœß']+")
+
+
+def score_languages(text: str) -> Dict[str, int]:
+    """Score how strongly the text matches each supported language."""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    scores = {lang: 0 for lang in SUPPORTED_LANGUAGES}
+    for token in tokens:
+        for lang, words in _STOPWORDS.items():
+            if token in words:
+                scores[lang] += 1
+    for lang, pattern in _CHARACTER_HINTS.items():
+        if pattern.search(text.lower()):
+            scores[lang] += 1
+    return scores
+
+
+def detect_language(text: str, min_score: int = 2) -> Optional[str]:
+    """
+    Detect the language of a query without calling an LLM.
+
+    Returns an ISO code from SUPPORTED_LANGUAGES, or None when the text is
+    too short or ambiguous to decide (callers should then fall back to the
+    LLM-based detection).
+    """
+    if not text or not text.strip():
+        return None
+
+    scores = score_languages(text)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    best_lang, best_score = ranked[0]
+    runner_up_score = ranked[1][1]
+
+    if best_score < min_score or best_score == runner_up_score:
+        return None
+    return best_lang
+
@@ -0,0 +1,174 @@
+import json
+import logging
+import math
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cleaned scrape output that is also ingested into GroundX
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parent.parent / "scraping" / "scrape_out_cleaned"
+
+# Keys that hold identifiers rather than searchable prose
+NON_TEXT_KEYS = {"url", "source_url", "full_url", "href", "image", "page_type", "language"}
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Very common words that carry no retrieval signal (EN/DE/FR/IT)
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "is", "are", "what",
+    "who", "how", "does", "do", "me", "about", "tell", "which", "by", "at", "as", "be", "it",
+    "der", "die", "das", "und", "ist", "sind", "was", "wer", "wie", "von", "mit", "für", "zu",
+    "le", "la", "les", "et", "est", "de", "des", "du", "que", "qui", "pour", "avec", "un", "une",
+    "il", "lo", "gli", "e", "è", "di", "che", "chi", "per", "con", "del", "della",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [t for t in _TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _collect_text(value: Any, key: str = "") -> List[str]:
+    """Recursively collect the prose strings of a JSON value."""
+    if key in NON_TEXT_KEYS:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [text for item in value for text in _collect_text(item, key)]
+    if isinstance(value, dict):
+        return [text for k, v in value.items() for text in _collect_text(v, k)]
+    return []
+
+
+def load_corpus(corpus_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Load the *_extracted.json pages into search documents.
+
+    Each document keeps the raw JSON text (what GroundX would return as a
+    chunk) plus the title / meta_description / body fields used for scoring.
+    """
+    corpus_dir = Path(corpus_dir or DEFAULT_CORPUS_DIR)
+    documents = []
+    for file_path in sorted(corpus_dir.glob("*_extracted.json")):
+        try:
+            raw_text = file_path.read_text(encoding="utf-8")
+            data = json.loads(raw_text)
+        except Exception as e:
+            logger.warning(f"Skipping unreadable corpus file {file_path.name}: {str(e)}")
+            continue
+        if not isinstance(data, dict):
+            continue
+
+        body = {k: v for k, v in data.items() if k not in ("title", "meta_description")}
+        documents.append({
+            "file_name": file_path.name,
+            "url": data.get("url", ""),
+            "language": data.get("language", "en"),
+            "text": raw_text,
+            "fields": {
+                "title": data.get("title", ""),
+                "meta_description": data.get("meta_description", ""),
+                "body": " ".join(_collect_text(body)),
+            },
+        })
+    return documents
+
+
+class BM25Index:
+    """
+    In-memory inverted index with BM25F scoring over the scrape corpus.
+
+    Field boosts let matches in the page title and meta description count
+    more than matches somewhere in the page body.
+    """
+
+    DEFAULT_FIELD_BOOSTS = {"title": 3.0, "meta_description": 2.0, "body": 1.0}
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, field_boosts: Optional[Dict[str, float]] = None):
+        self.k1 = k1
+        self.b = b
+        self.field_boosts = field_boosts or dict(self.DEFAULT_FIELD_BOOSTS)
+        self.documents: List[Dict[str, Any]] = []
+        # term -> [(doc index, length-normalised and boosted term frequency)]
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        self.idf: Dict[str, float] = {}
+
+    def build(self, documents: List[Dict[str, Any]]) -> "BM25Index":
+        """Build the index from documents produced by load_corpus()."""
+        start = time.time()
+        self.documents = documents
+        field_tokens = [
+            {field: tokenize(doc["fields"].get(field, "")) for field in self.field_boosts}
+            for doc in documents
+        ]
+
+        # Average field lengths for BM25F length normalisation
+        avg_len = {}
+        for field in self.field_boosts:
+            lengths = [len(tokens[field]) for tokens in field_tokens]
+            avg_len[field] = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+        postings = defaultdict(list)
+        for doc_idx, tokens in enumerate(field_tokens):
+            weighted_tf = defaultdict(float)
+            for field, boost in self.field_boosts.items():
+                if not tokens[field] or not avg_len[field]:
+                    continue
+                norm = 1 - self.b + self.b * len(tokens[field]) / avg_len[field]
+                counts = defaultdict(int)
+                for token in tokens[field]:
+                    counts[token] += 1
+                for token, count in counts.items():
+                    weighted_tf[token] += boost * count / norm
+            for token, tf in weighted_tf.items():
+                postings[token].append((doc_idx, tf))
+
+        n_docs = len(documents)
+        self.postings = dict(postings)
+        self.idf = {
+            term: math.log(1 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+            for term, plist in self.postings.items()
+        }
+        logger.info(f"Built BM25 index: {n_docs} documents, {len(self.postings)} terms "
+                    f"in {(time.time() - start) * 1000:.1f} ms")
+        return self
+
+    @classmethod
+    def from_directory(cls, corpus_dir: Optional[Path] = None, **kwargs) -> "BM25Index":
+        """Load the corpus from disk and build the index."""
+        return cls(**kwargs).build(load_corpus(corpus_dir))
+
+    def search(self, query: str, k: int = 2, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the top-k documents as {"document", "score"} dicts, best first."""
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_idx, tf in self.postings[term]:
+                scores[doc_idx] += idf * tf * (self.k1 + 1) / (tf + self.k1)
+
+        if language:
+            scores = {idx: s for idx, s in scores.items() if self.documents[idx]["language"] == language}
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [{"document": self.documents[idx], "score": score} for idx, score in ranked]
+
+
+def format_hits(hits: List[Dict[str, Any]]) -> str:
+    """Format search hits like GroundXTool output, with [PRIMARY_SOURCE: url] markers."""
+    texts = [hit["document"]["text"] for hit in hits]
+    content = "\n\n".join(texts)
+    sources = []
+    for hit in hits:
+        url = hit["document"]["url"]
+        if url and url not in sources:
+            sources.append(url)
+    if sources:
+        content += "\n\n" + "\n".join(f"[PRIMARY_SOURCE: {url}]" for url in sources)
+    return content
@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated backend failures.
+
+    After failure_threshold consecutive failures the breaker opens and
+    allow() returns False for reset_timeout seconds. Then one probe call is
+    let through (half-open). Its success closes the breaker and its failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._trips = 0
+        self._short_circuited = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend now."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._short_circuited += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error) if error else None
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._trips += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for metrics."""
+        with self._lock:
+            state = self._current_state()
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)) if state == OPEN else 0.0
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout_seconds": self.reset_timeout,
+                "retry_in_seconds": round(retry_in, 1),
+                "trips": self._trips,
+                "short_circuited": self._short_circuited,
+                "last_error": self._last_error,
+            }
+
+
+class SearchCache:
+    """
+    LRU cache of search results with stale-while-revalidate.
+
+    Entries are fresh for ttl seconds and may be served stale (while a
+    refresh runs) until stale_ttl. Negative entries (empty or error results)
+    live only negative_ttl seconds, so a burst of identical queries against
+    a sick backend costs one call.
+    """
+
+    def __init__(self, ttl: float = 300.0, stale_ttl: float = 3600.0, negative_ttl: float = 15.0, max_entries: int = 512):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float, bool]]" = OrderedDict()
+        self._refreshing = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "negative_hits": 0, "misses": 0}
+
+    def get(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (value, status) with status "fresh", "stale", "negative" or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None, None
+            value, stored_at, negative = entry
+            age = time.monotonic() - stored_at
+            if negative:
+                if age < self.negative_ttl:
+                    self._stats["negative_hits"] += 1
+                    return value, "negative"
+            elif age < self.ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return value, "fresh"
+            elif age < self.stale_ttl:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                return value, "stale"
+            del self._entries[key]
+            self._stats["misses"] += 1
+            return None, None
+
+    def put(self, key: str, value: str, negative: bool = False) -> None:
+        with self._lock:
+            # A short-lived failure must not evict a good result that can still be served stale
+            existing = self._entries.get(key)
+            if negative and existing is not None and not existing[2] and time.monotonic() - existing[1] < self.stale_ttl:
+                return
+            self._entries[key] = (value, time.monotonic(), negative)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def start_refresh(self, key: str) -> bool:
+        """Claim the background refresh for key. False if one is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def finish_refresh(self, key: str) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cache counters for metrics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "refreshing": len(self._refreshing),
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+                "negative_ttl_seconds": self.negative_ttl,
+                **self._stats,
+            }
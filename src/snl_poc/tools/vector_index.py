@@ -0,0 +1,323 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import List, Optional, Dict, Any
+
+import httpx
+import numpy as np
+from dotenv import load_dotenv
+
+from src.snl_poc.tools.local_search import load_corpus, tokenize
+
+try:  # Optional approximate index for larger corpora
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parent.parent / "scraping" / "vector_index"
+
+VECTORS_FILE = "vectors.npy"
+CHUNKS_FILE = "chunks.json"
+META_FILE = "index_meta.json"
+HNSW_FILE = "hnsw.bin"
+
+
+def chunk_documents(documents: List[Dict[str, Any]], chunk_size: int = 800, overlap: int = 100) -> List[Dict[str, Any]]:
+    """
+    Split corpus documents (see local_search.load_corpus) into overlapping
+    character windows. Every chunk is prefixed with the page title so it
+    still makes sense on its own.
+    """
+    chunks = []
+    for doc in documents:
+        title = doc["fields"].get("title", "")
+        meta = doc["fields"].get("meta_description", "")
+        body = doc["fields"].get("body", "")
+        text = f"{meta} {body}".strip()
+
+        start = 0
+        while True:
+            window = text[start:start + chunk_size]
+            if window.strip():
+                chunks.append({
+                    "chunk_id": len(chunks),
+                    "file_name": doc["file_name"],
+                    "url": doc["url"],
+                    "language": doc["language"],
+                    "text": f"{title}: {window}" if title else window,
+                })
+            if start + chunk_size >= len(text):
+                break
+            start += chunk_size - overlap
+    return chunks
+
+
+class EmbeddingClient:
+    """Client for the OpenAI-compatible embeddings server (EMBEDDINGS_SERVER_*)."""
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 model: Optional[str] = None, batch_size: int = 64, timeout: float = 30.0):
+        self.base_url = (base_url or os.getenv("EMBEDDINGS_SERVER_BASE_URL", "")).rstrip("/")
+        self.api_key = api_key or os.getenv("EMBEDDINGS_SERVER_API_KEY", "")
+        self.model = model or os.getenv("EMBEDDINGS_DEFAULT_MODEL", "")
+        self.batch_size = batch_size
+        if not self.base_url:
+            raise ValueError("EMBEDDINGS_SERVER_BASE_URL not found in environment variables")
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.api_key}"} if self.api_key else {},
+            timeout=timeout,
+        )
+
+    @property
+    def name(self) -> str:
+        return self.model or "embeddings-server"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in batches. Returns a float32 matrix (len(texts), dim)."""
+        vectors = []
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i:i + self.batch_size]
+            response = self.client.post("/embeddings", json={"model": self.model, "input": batch})
+            response.raise_for_status()
+            data = sorted(response.json()["data"], key=lambda item: item["index"])
+            vectors.extend(item["embedding"] for item in data)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class HashingEmbedder:
+    """
+    Local stand-in for the embeddings server: feature-hashed unigrams and
+    bigrams. Not semantic, but deterministic and dependency-free, which is
+    enough for development and benchmarks without network access.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    @property
+    def name(self) -> str:
+        return f"hashing-{self.dim}"
+
+    def _bucket(self, feature: str) -> int:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % self.dim
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                vectors[row, self._bucket(feature)] += 1.0
+        return vectors
+
+
+def get_embedder(local: bool = False):
+    """Use the embeddings server when configured, the hashing stand-in otherwise."""
+    if not local and os.getenv("EMBEDDINGS_SERVER_BASE_URL"):
+        return EmbeddingClient()
+    logger.info("EMBEDDINGS_SERVER_BASE_URL not set, using local hashing embedder")
+    return HashingEmbedder()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class DenseVectorIndex:
+    """
+    Dense index stored as a normalised float16/float32 matrix in a .npy file.
+
+    The matrix is opened with np.load(mmap_mode="r"), so every worker process
+    maps the same file and shares its pages through the OS page cache instead
+    of holding a private copy. Search is exact, vectorised cosine similarity
+    over row blocks; an optional HNSW graph (hnswlib) serves larger corpora.
+
+    float16 halves memory and page-cache footprint, but each block is upcast
+    to float32 per search call, so batch queries to amortise the conversion
+    (see scripts/bench_vector_index.py).
+    """
+
+    def __init__(self, vectors: np.ndarray, chunks: List[Dict[str, Any]], meta: Dict[str, Any],
+                 hnsw_index: Optional[Any] = None, block_size: int = 65536):
+        self.vectors = vectors
+        self.chunks = chunks
+        self.meta = meta
+        self.hnsw_index = hnsw_index
+        self.block_size = block_size
+
+    @classmethod
+    def build(cls, chunks: List[Dict[str, Any]], embedder, index_dir: Optional[Path] = None,
+              dtype: str = "float16", with_hnsw: bool = False) -> "DenseVectorIndex":
+        """Embed the chunks and write the index files to index_dir."""
+        index_dir = Path(index_dir or DEFAULT_INDEX_DIR)
+        index_dir.mkdir(parents=True, exist_ok=True)
+
+        start = time.time()
+        vectors = _normalize(embedder.embed([chunk["text"] for chunk in chunks])).astype(dtype)
+        logger.info(f"Embedded {len(chunks)} chunks in {time.time() - start:.2f}s")
+
+        # Write to a temporary name first so readers never map a half-written file
+        tmp_path = index_dir / f"{VECTORS_FILE}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, vectors)
+        os.replace(tmp_path, index_dir / VECTORS_FILE)
+
+        meta = {
+            "embedder": embedder.name,
+            "dim": int(vectors.shape[1]) if len(chunks) else 0,
+            "count": len(chunks),
+            "dtype": dtype,
+            "built_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with open(index_dir / CHUNKS_FILE, "w", encoding="utf-8") as f:
+            json.dump(chunks, f, ensure_ascii=False)
+        with open(index_dir / META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        hnsw_index = None
+        if with_hnsw:
+            hnsw_index = cls._build_hnsw(vectors, index_dir / HNSW_FILE)
+        if hnsw_index is None:
+            # A graph left over from an earlier build indexes the old vectors
+            (index_dir / HNSW_FILE).unlink(missing_ok=True)
+        return cls.load(index_dir, use_hnsw=hnsw_index is not None, embedder=embedder)
+
+    @staticmethod
+    def _build_hnsw(vectors: np.ndarray, path: Path, ef_construction: int = 200, m: int = 16):
+        if hnswlib is None:
+            logger.warning("hnswlib is not installed, skipping HNSW index")
+            return None
+        index = hnswlib.Index(space="ip", dim=vectors.shape[1])
+        index.init_index(max_elements=len(vectors), ef_construction=ef_construction, M=m)
+        index.add_items(np.asarray(vectors, dtype=np.float32), np.arange(len(vectors)))
+        index.save_index(str(path))
+        return index
+
+    @classmethod
+    def load(cls, index_dir: Optional[Path] = None, use_hnsw: bool = False, ef: int = 64,
+             embedder=None) -> "DenseVectorIndex":
+        """
+        Memory-map an index previously written by build(). When an embedder
+        is given, it must be the one the index was built with.
+        """
+        index_dir = Path(index_dir or DEFAULT_INDEX_DIR)
+        with open(index_dir / META_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if embedder is not None:
+            cls._check_embedder(meta, embedder)
+        vectors = np.load(index_dir / VECTORS_FILE, mmap_mode="r")
+        with open(index_dir / CHUNKS_FILE, "r", encoding="utf-8") as f:
+            chunks = json.load(f)
+
+        hnsw_index = None
+        hnsw_path = index_dir / HNSW_FILE
+        if use_hnsw and hnswlib is not None and hnsw_path.exists():
+            hnsw_index = hnswlib.Index(space="ip", dim=meta["dim"])
+            hnsw_index.load_index(str(hnsw_path), max_elements=meta["count"])
+            hnsw_index.set_ef(ef)
+        return cls(vectors, chunks, meta, hnsw_index=hnsw_index)
+
+    @staticmethod
+    def _check_embedder(meta: Dict[str, Any], embedder, dim: Optional[int] = None) -> None:
+        """Raise ValueError if the queries would come from another embedding space than the index."""
+        if meta.get("embedder") != embedder.name:
+            raise ValueError(f"Index was built with embedder '{meta.get('embedder')}', not '{embedder.name}'; "
+                             f"rebuild it or query it with the same embedder")
+        if dim is not None and meta.get("dim") and dim != meta["dim"]:
+            raise ValueError(f"Query vectors have dim {dim}, the index has dim {meta['dim']}")
+
+    def search_vectors(self, queries: np.ndarray, k: int = 5, exact: bool = False):
+        """
+        Top-k search for a batch of query vectors.
+
+        Returns (indices, scores), both shaped (n_queries, k), best first.
+        """
+        queries = _normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        k = min(k, len(self.chunks))
+        if k == 0:
+            return np.zeros((len(queries), 0), dtype=np.int64), np.zeros((len(queries), 0), dtype=np.float32)
+
+        if self.hnsw_index is not None and not exact:
+            labels, distances = self.hnsw_index.knn_query(queries, k=k)
+            return labels.astype(np.int64), (1.0 - distances).astype(np.float32)
+
+        best_idx = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        # Process the (possibly memory-mapped float16) matrix block by block
+        for start in range(0, len(self.vectors), self.block_size):
+            block = np.asarray(self.vectors[start:start + self.block_size], dtype=np.float32)
+            scores = queries @ block.T
+            block_k = min(k, scores.shape[1])
+            top = np.argpartition(-scores, block_k - 1, axis=1)[:, :block_k]
+            best_idx = np.concatenate([best_idx, top + start], axis=1)
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            if best_idx.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_idx = np.take_along_axis(best_idx, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+    def search(self, queries: List[str], embedder, k: int = 5, language: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """Embed and search a batch of text queries. Returns hits per query."""
+        # Over-fetch when filtering by language so k hits survive the filter
+        fetch_k = k * 4 if language else k
+        self._check_embedder(self.meta, embedder)
+        query_vectors = embedder.embed(queries)
+        self._check_embedder(self.meta, embedder, dim=query_vectors.shape[1])
+        indices, scores = self.search_vectors(query_vectors, k=fetch_k)
+        results = []
+        for row_idx, row_scores in zip(indices, scores):
+            hits = []
+            for idx, score in zip(row_idx, row_scores):
+                chunk = self.chunks[int(idx)]
+                if language and chunk["language"] != language:
+                    continue
+                hits.append({"chunk": chunk, "score": float(score)})
+                if len(hits) == k:
+                    break
+            results.append(hits)
+        return results
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Build or query the local dense vector index")
+    parser.add_argument("command", choices=["build", "search"])
+    parser.add_argument("query", nargs="?", default="")
+    parser.add_argument("--index-dir", default=str(DEFAULT_INDEX_DIR))
+    parser.add_argument("--dtype", choices=["float16", "float32"], default="float16")
+    parser.add_argument("--hnsw", action="store_true", help="Also build/use an HNSW index")
+    parser.add_argument("--local-embedder", action="store_true", help="Use the hashing stand-in embedder")
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    embedder = get_embedder(local=args.local_embedder)
+    if args.command == "build":
+        chunks = chunk_documents(load_corpus())
+        index = DenseVectorIndex.build(chunks, embedder, args.index_dir, dtype=args.dtype, with_hnsw=args.hnsw)
+        print(f"Indexed {index.meta['count']} chunks ({index.meta['dtype']}, dim {index.meta['dim']}) in {args.index_dir}")
+    else:
+        index = DenseVectorIndex.load(args.index_dir, use_hnsw=args.hnsw, embedder=embedder)
+        start = time.time()
+        hits = index.search([args.query], embedder, k=args.k)[0]
+        print(f"Search took {(time.time() - start) * 1000:.2f} ms")
+        for hit in hits:
+            print(f"{hit['score']:.3f}  {hit['chunk']['url']}  {hit['chunk']['text'][:100]}")
+
+
+if __name__ == "__main__":
+    main()
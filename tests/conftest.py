@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRAPING_DIR = REPO_ROOT / "src" / "snl_poc" / "scraping"
+
+# Repository root, so src.snl_poc imports work; the scraping scripts import
+# their siblings directly (from itnb_site import ...)
+for path in (REPO_ROOT, SCRAPING_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,51 @@
+import pytest
+
+from src.snl_poc.tools.adaptive_retrieval import classify_query_complexity, depth_for_complexity, select_adaptive
+
+
+def chunks_with_scores(*scores, text="Sovereign cloud hosting in Switzerland."):
+    return [{"text": text, "rerank_score": score} for score in scores]
+
+
+@pytest.mark.parametrize("query, complexity", [
+    ("What is the email address of ITNB?", "factoid"),
+    ("Wer ist der CEO?", "factoid"),
+    ("What industries and services does ITNB cover?", "broad"),
+    ("Tell me about the sovereign cloud", "standard"),
+])
+def test_classify_query_complexity(query, complexity):
+    assert classify_query_complexity(query) == complexity
+
+
+def test_depth_for_complexity():
+    assert depth_for_complexity("factoid", 2, 6) == 1
+    assert depth_for_complexity("factoid", 1, 6) == 1
+    assert depth_for_complexity("standard", 2, 6) == 2
+    assert depth_for_complexity("broad", 2, 6) == 6
+
+
+def test_stops_at_cap():
+    selected, stats = select_adaptive("Tell me about the cloud", chunks_with_scores(1.0, 0.9, 0.8))
+    assert len(selected) == 2
+    assert stats["stop_reason"] == "cap" and stats["complexity"] == "standard"
+
+
+def test_stops_at_score_gap():
+    selected, stats = select_adaptive("List all services", chunks_with_scores(1.0, 0.9, 0.3, 0.2))
+    assert len(selected) == 2
+    assert stats["stop_reason"] == "score_gap"
+
+
+def test_stops_at_token_budget_but_keeps_best():
+    long_chunks = chunks_with_scores(1.0, 0.95, text="cloud " * 400)
+    selected, stats = select_adaptive("List all services", long_chunks, token_budget=10)
+    assert len(selected) == 1
+    assert stats["stop_reason"] == "token_budget"
+    assert stats["prompt_tokens"] > 10
+
+
+def test_falls_back_to_groundx_score_and_exhausts():
+    chunks = [{"text": "cloud", "score": 0.5}, {"text": "cloud", "score": 0.45}]
+    selected, stats = select_adaptive("List all services", chunks)
+    assert selected == chunks
+    assert stats["stop_reason"] == "exhausted" and stats["candidates"] == 2
@@ -0,0 +1,57 @@
+from src.snl_poc.tools import chunk_rerank
+from src.snl_poc.tools.chunk_rerank import count_tokens, rerank_chunks
+
+
+def test_count_tokens_falls_back_without_tiktoken(monkeypatch):
+    monkeypatch.setattr(chunk_rerank, "_encoding", lambda: None)
+    assert count_tokens("") == 0
+    assert count_tokens("abc") == 1
+    assert count_tokens("x" * 40) == 10
+
+
+def test_lexical_match_beats_groundx_order():
+    chunks = [
+        {"text": "Partner network and events in Zurich.", "score": 0.9, "source_key": "a"},
+        {"text": "Sovereign cloud hosting for banks in Switzerland.", "score": 0.8, "source_key": "b"},
+    ]
+    selected, stats = rerank_chunks("sovereign cloud for banks", chunks, keep=1)
+    assert [chunk["source_key"] for chunk in selected] == ["b"]
+    assert "rerank_score" in selected[0]
+    assert stats["candidates"] == 2 and stats["selected"] == 1
+
+
+def test_drops_repeated_sources_and_near_duplicates():
+    text = "ITNB runs a sovereign cloud in Swiss data centres for regulated industries."
+    chunks = [
+        {"text": text, "score": 0.9, "source_key": "cloud"},
+        {"text": text + " Contact us.", "score": 0.85, "source_key": "cloud-copy"},
+        {"text": "Sovereign cloud pricing is per virtual machine.", "score": 0.8, "source_key": "cloud"},
+        {"text": "The sovereign cloud team is based in Schaffhausen.", "score": 0.7, "source_key": "team"},
+    ]
+    selected, stats = rerank_chunks("sovereign cloud", chunks, keep=3)
+    assert [chunk["source_key"] for chunk in selected] == ["cloud", "team"]
+    assert stats["dropped_duplicates"] == 2
+
+
+def test_drops_chunks_far_below_the_best():
+    chunks = [
+        {"text": "Sovereign cloud in Switzerland.", "score": 1.0},
+        {"text": "Unrelated footer text.", "score": 0.05},
+    ]
+    selected, stats = rerank_chunks("sovereign cloud", chunks, keep=2)
+    assert len(selected) == 1
+    assert stats["dropped_low_score"] == 1
+
+
+def test_token_savings_against_baseline(monkeypatch):
+    monkeypatch.setattr(chunk_rerank, "_encoding", lambda: None)
+    chunks = [{"text": "sovereign cloud " * 10, "score": 1.0, "source_key": str(i)} for i in range(4)]
+    selected, stats = rerank_chunks("sovereign cloud", chunks, keep=1, baseline_n=4)
+    assert len(selected) == 1
+    assert stats["baseline_tokens"] == 4 * stats["selected_tokens"]
+    assert stats["tokens_saved"] == 3 * stats["selected_tokens"]
+
+
+def test_empty_candidates():
+    selected, stats = rerank_chunks("cloud", [], keep=2)
+    assert selected == [] and stats["tokens_saved"] == 0
@@ -0,0 +1,69 @@
+import json
+
+from src.snl_poc.tools.context_compression import (
+    LONG_FIELD_CHARS,
+    compress_chunk,
+    compress_chunks,
+    select_sentences,
+    split_sentences,
+)
+
+PAGE = {
+    "url": "https://www.itnb.ch/en/sovereign-cloud",
+    "page_type": "product",
+    "language": "en",
+    "navigation": ["Home", "Products"],
+    "title": "Sovereign Cloud",
+    "description": "Swiss hosted infrastructure as a service.",
+    "team": [{"name": "Jane Doe", "image": "https://cdn.itnb.ch/jane.jpg", "headings": []}],
+    "contact_info": {"email": "info@itnb.ch"},
+}
+
+
+def test_split_sentences():
+    assert split_sentences("One. Two? Three! four.") == ["One.", "Two?", "Three! four."]
+
+
+def test_select_sentences_keeps_matches_in_order():
+    sentences = [f"Filler sentence number {i}." for i in range(8)]
+    sentences[2] = "Our sovereign cloud runs in Switzerland."
+    sentences[6] = "The cloud is certified for banks."
+    result = select_sentences(" ".join(sentences), {"cloud", "banks"}, max_sentences=2)
+    assert result == "Our sovereign cloud runs in Switzerland. The cloud is certified for banks."
+
+
+def test_select_sentences_falls_back_to_first_sentence():
+    text = " ".join(f"Sentence {i}." for i in range(8))
+    assert select_sentences(text, {"quantum"}, max_sentences=2) == "Sentence 0."
+
+
+def test_compress_json_chunk():
+    compressed = compress_chunk(json.dumps(PAGE), "sovereign cloud team")
+    lines = compressed.splitlines()
+    assert lines[0] == "Source: https://www.itnb.ch/en/sovereign-cloud"
+    assert "Title: Sovereign Cloud" in lines
+    assert "https://cdn.itnb.ch/jane.jpg" in compressed
+    for dropped in ("page_type", "navigation", "info@itnb.ch", "headings", '"url"'):
+        assert dropped not in compressed
+
+
+def test_compress_long_field_to_query_sentences():
+    filler = " ".join(f"Filler sentence number {i} about nothing in particular." for i in range(20))
+    page = {"url": "u", "body": filler + " Our sovereign cloud is hosted in Switzerland."}
+    assert len(page["body"]) > LONG_FIELD_CHARS
+    compressed = compress_chunk(json.dumps(page), "sovereign cloud")
+    assert "Our sovereign cloud is hosted in Switzerland." in compressed
+    assert len(compressed) < len(page["body"])
+
+
+def test_compress_partial_json_chunk():
+    assert compress_chunk('"title": "Sovereign Cloud", "body": [', "cloud") == "title : Sovereign Cloud , body :"
+
+
+def test_compress_chunks_in_place_with_stats():
+    chunks = [{"text": json.dumps(PAGE)}, {"text": json.dumps(PAGE, indent=2)}]
+    result, stats = compress_chunks(chunks, "sovereign cloud")
+    assert result is chunks
+    assert all(chunk["text"].startswith("Source: ") for chunk in chunks)
+    assert stats["tokens_after"] < stats["tokens_before"]
+    assert stats["tokens_saved"] == stats["tokens_before"] - stats["tokens_after"]
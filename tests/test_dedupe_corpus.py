@@ -0,0 +1,69 @@
+import numpy as np
+
+from dedupe_corpus import MinHasher, canonical_order, dedupe_pages, shingle_hashes, split_blocks
+
+BANNER = ("Let's chat about itnb and how our sovereign cloud, managed security services and AI platforms "
+          "can support your organisation on its way to a trusted digital future today.")
+PROSE = {
+    "cloud": "Our sovereign cloud keeps every workload inside Swiss data centres run by our own staff.",
+    "finance": "Banks and insurers use dedicated tenants that satisfy the strict supervisory requirements.",
+    "about": "The company was founded in Schaffhausen and now employs engineers across the whole country.",
+}
+
+
+def page(url, *blocks):
+    return {"url": url, "title": url, "main_content": " ".join(blocks)}
+
+
+def test_split_blocks():
+    assert split_blocks("One two. Three four! Five") == ["One two.", "Three four!", "Five"]
+
+
+def test_minhash_estimates_jaccard():
+    hasher = MinHasher()
+    a = shingle_hashes(PROSE["cloud"])
+    assert np.array_equal(hasher.signature(a), hasher.signature(shingle_hashes(PROSE["cloud"])))
+    similar = np.mean(hasher.signature(a) == hasher.signature(shingle_hashes(PROSE["cloud"] + " Really.")))
+    different = np.mean(hasher.signature(a) == hasher.signature(shingle_hashes(PROSE["finance"])))
+    assert similar > 0.7 and different < 0.1
+
+
+def test_canonical_order():
+    urls = ["https://www.itnb.ch/en/company/about", "https://www.itnb.ch/", "https://www.itnb.ch/en"]
+    assert sorted(urls, key=lambda url: canonical_order(url, "")) == [
+        "https://www.itnb.ch/", "https://www.itnb.ch/en", "https://www.itnb.ch/en/company/about"]
+
+
+def test_repeated_block_kept_on_canonical_page():
+    pages = {
+        "about": page("https://www.itnb.ch/en/company/about", PROSE["about"], BANNER),
+        "home": page("https://www.itnb.ch/", BANNER),
+        "cloud": page("https://www.itnb.ch/en/cloud", BANNER, PROSE["cloud"]),
+        "finance": page("https://www.itnb.ch/en/finance", PROSE["finance"], BANNER.replace("today", "now")),
+    }
+    stats = dedupe_pages(pages)
+
+    assert pages["home"]["main_content"] == BANNER
+    assert pages["cloud"]["main_content"] == PROSE["cloud"]
+    assert pages["about"]["main_content"] == PROSE["about"]
+    assert pages["finance"]["main_content"] == PROSE["finance"]
+    assert stats["removed"] == 3
+    assert stats["repeated"][0][:2] == (4, BANNER)
+    assert stats["chars_after"] < stats["chars_before"]
+
+
+def test_short_and_distinct_blocks_survive():
+    pages = {
+        "a": page("https://www.itnb.ch/en/a", "Contact us.", PROSE["cloud"]),
+        "b": page("https://www.itnb.ch/en/b", "Contact us.", PROSE["finance"]),
+    }
+    stats = dedupe_pages(pages)
+    assert stats["removed"] == 0
+    assert pages["b"]["main_content"] == "Contact us. " + PROSE["finance"]
+
+
+def test_field_removed_when_every_block_repeats():
+    pages = {"home": page("https://www.itnb.ch/", BANNER), "copy": page("https://www.itnb.ch/en/copy", BANNER)}
+    dedupe_pages(pages)
+    assert "main_content" not in pages["copy"]
+    assert pages["copy"]["title"] == "https://www.itnb.ch/en/copy"
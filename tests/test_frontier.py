@@ -0,0 +1,69 @@
+import pytest
+
+from frontier import Frontier, canonicalize_url, parse_sitemap
+
+
+@pytest.mark.parametrize("url, canonical", [
+    ("HTTPS://WWW.ITNB.CH:443/en/", "https://www.itnb.ch/en"),
+    ("https://www.itnb.ch", "https://www.itnb.ch/"),
+    ("https://www.itnb.ch//en//company/#team", "https://www.itnb.ch/en/company"),
+    ("https://www.itnb.ch/en?utm_source=x&b=2&a=1&fbclid=y", "https://www.itnb.ch/en?a=1&b=2"),
+    ("http://www.itnb.ch:8080/en", "http://www.itnb.ch:8080/en"),
+])
+def test_canonicalize_url(url, canonical):
+    assert canonicalize_url(url) == canonical
+
+
+def test_parse_sitemap():
+    urlset = (b'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+              b'<url><loc> https://www.itnb.ch/en </loc></url><url><loc>https://www.itnb.ch/de</loc></url></urlset>')
+    index = (b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+             b'<sitemap><loc>https://www.itnb.ch/sitemap-en.xml</loc></sitemap></sitemapindex>')
+    assert parse_sitemap(urlset) == (["https://www.itnb.ch/en", "https://www.itnb.ch/de"], [])
+    assert parse_sitemap(index) == ([], ["https://www.itnb.ch/sitemap-en.xml"])
+    assert parse_sitemap(b"<not xml") == ([], [])
+
+
+def test_add_deduplicates_and_respects_limits(tmp_path):
+    frontier = Frontier(max_pages=3, max_depth=1, checkpoint_path=tmp_path / "checkpoint.json")
+    assert frontier.add("https://www.itnb.ch/en/")
+    assert not frontier.add("https://www.itnb.ch/en#top")
+    assert not frontier.add("https://www.itnb.ch/en/deep", depth=2)
+    assert frontier.add_many(["https://www.itnb.ch/de", "https://www.itnb.ch/fr", "https://www.itnb.ch/it"], depth=1) == 2
+    assert len(frontier) == 3
+
+
+def test_pop_by_depth_then_discovery(tmp_path):
+    frontier = Frontier(checkpoint_path=tmp_path / "checkpoint.json")
+    frontier.add("https://www.itnb.ch/en/b", depth=1)
+    frontier.add("https://www.itnb.ch/en/a", depth=1)
+    frontier.add("https://www.itnb.ch/en", depth=0)
+    assert [frontier.pop()[0] for _ in range(3)] == [
+        "https://www.itnb.ch/en", "https://www.itnb.ch/en/b", "https://www.itnb.ch/en/a"]
+    assert frontier.pop() is None
+
+
+def test_resume_requeues_in_flight_and_failed_pages(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    frontier = Frontier(max_pages=10, checkpoint_path=checkpoint)
+    frontier.add_many([f"https://www.itnb.ch/en/{i}" for i in range(4)])
+    done, in_flight, failed = (frontier.pop()[0] for _ in range(3))
+    frontier.mark_done(done, {"url": done})
+    frontier.mark_failed(failed, "timeout")
+    frontier.save()
+
+    resumed = Frontier.load(checkpoint)
+    assert resumed.max_pages == 10
+    assert resumed.results() == [{"url": done}]
+    pending = []
+    while (entry := resumed.pop()) is not None:
+        pending.append(entry[0])
+    assert pending == [in_flight, failed, "https://www.itnb.ch/en/3"]
+    assert not resumed.add(done)
+
+
+def test_load_missing_or_corrupt_checkpoint(tmp_path):
+    assert len(Frontier.load(tmp_path / "missing.json")) == 0
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text("{", encoding="utf-8")
+    assert Frontier.load(corrupt, max_pages=5).max_pages == 5
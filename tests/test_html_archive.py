@@ -0,0 +1,73 @@
+import gzip
+
+import pytest
+
+from html_archive import HTMLArchive, zstandard
+
+PAGE_V1 = "<html><body><h1>Sovereign Cloud</h1><p>Zürich</p></body></html>".encode("utf-8")
+PAGE_V2 = b"<html><body><h1>Sovereign Cloud 2</h1></body></html>"
+
+
+def fill(archive):
+    archive.add("https://www.itnb.ch/en/cloud", PAGE_V1, headers={"Content-Type": "text/html", "Set-Cookie": "x"},
+                encoding="utf-8", fetched_at=100.0)
+    archive.add("https://www.itnb.ch/en/cloud/", PAGE_V2, fetched_at=200.0)
+    archive.add("https://www.itnb.ch/en/about", b"", status_code=404, fetched_at=150.0)
+    archive.add("https://www.itnb.ch/de/cloud", PAGE_V1, fetched_at=300.0)
+
+
+@pytest.mark.parametrize("compression", [
+    "gzip",
+    pytest.param("zstd", marks=pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")),
+])
+def test_roundtrip(tmp_path, compression):
+    archive = HTMLArchive(tmp_path, compression=compression)
+    fill(archive)
+
+    latest = archive.get("https://www.itnb.ch/en/cloud")
+    assert latest.content == PAGE_V2 and latest.status_code == 200
+    first = archive.get("https://www.itnb.ch/en/cloud#top", at=150.0)
+    assert first.text == PAGE_V1.decode("utf-8")
+    assert first.headers == {"Content-Type": "text/html"}
+    assert archive.get("https://www.itnb.ch/en/cloud", at=50.0) is None
+    assert archive.get("https://www.itnb.ch/en/about").status_code == 404
+    assert [entry["type"] for entry in archive.versions("https://www.itnb.ch/en/cloud")] == ["response", "response"]
+
+    # Identical bodies are stored once
+    assert archive.versions("https://www.itnb.ch/de/cloud")[0]["type"] == "revisit"
+    assert archive.get("https://www.itnb.ch/de/cloud").content == PAGE_V1
+    assert archive.stats()["revisits"] == 1
+
+    reopened = HTMLArchive(tmp_path)
+    assert reopened.compression == compression
+    assert {page.url: page.content for page in reopened.iter_pages()} == {
+        "https://www.itnb.ch/en/cloud/": PAGE_V2,
+        "https://www.itnb.ch/en/about": b"",
+        "https://www.itnb.ch/de/cloud": PAGE_V1,
+    }
+    assert [page.content for page in reopened] == [PAGE_V1, PAGE_V2, b"", PAGE_V1]
+
+
+def test_rebuild_index_from_data_file(tmp_path):
+    archive = HTMLArchive(tmp_path, compression="gzip")
+    fill(archive)
+    archive.index_path.unlink()
+
+    rebuilt = HTMLArchive(tmp_path)
+    assert rebuilt.rebuild_index() == 4
+    assert rebuilt.get("https://www.itnb.ch/de/cloud").content == PAGE_V1
+    assert sorted(rebuilt.urls()) == sorted(archive.urls())
+
+
+def test_gzip_archive_is_standard_warc(tmp_path):
+    archive = HTMLArchive(tmp_path, compression="gzip")
+    fill(archive)
+    with gzip.open(archive.data_path, "rb") as f:
+        data = f.read()
+    assert data.count(b"WARC/1.1\r\n") == 4
+    assert b"WARC-Type: revisit" in data
+
+
+def test_unknown_compression(tmp_path):
+    with pytest.raises(ValueError):
+        HTMLArchive(tmp_path, compression="bz2")
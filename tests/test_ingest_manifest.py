@@ -0,0 +1,62 @@
+import hashlib
+
+from ingest_manifest import IngestManifest, file_sha256
+
+
+def write(directory, name, content):
+    path = directory / name
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_file_sha256(tmp_path):
+    path = write(tmp_path, "a.json", "{}")
+    assert file_sha256(path) == hashlib.sha256(b"{}").hexdigest()
+
+
+def test_plan_classifies_files(tmp_path):
+    local = {
+        "new.json": write(tmp_path, "new.json", "new"),
+        "same.json": write(tmp_path, "same.json", "same"),
+        "edited.json": write(tmp_path, "edited.json", "edited v2"),
+        "legacy.json": write(tmp_path, "legacy.json", "legacy"),
+    }
+    manifest = IngestManifest(tmp_path / "manifest.json", bucket_id=70)
+    manifest.record("same.json", file_sha256(local["same.json"]), "doc-same")
+    manifest.record("edited.json", hashlib.sha256(b"edited v1").hexdigest(), "doc-edited")
+    manifest.record("gone.json", "0" * 64, "doc-gone")
+    remote = {
+        "same.json": ["doc-same", "doc-same-dup"],
+        "edited.json": ["doc-edited"],
+        "legacy.json": ["doc-legacy"],
+        "gone.json": ["doc-gone"],
+    }
+
+    plan = manifest.plan(local, remote)
+    assert plan["new"] == ["new.json"]
+    assert plan["unchanged"] == ["same.json"]
+    assert plan["changed"] == ["edited.json", "legacy.json"]
+    assert plan["removed"] == ["gone.json"]
+    assert sorted(plan["delete_ids"]) == ["doc-edited", "doc-gone", "doc-legacy", "doc-same-dup"]
+    assert set(plan["hashes"]) == set(local)
+
+
+def test_plan_reuploads_document_missing_from_bucket(tmp_path):
+    path = write(tmp_path, "a.json", "a")
+    manifest = IngestManifest(tmp_path / "manifest.json")
+    manifest.record("a.json", file_sha256(path), "doc-a")
+    plan = manifest.plan({"a.json": path}, {})
+    assert plan["changed"] == ["a.json"] and plan["delete_ids"] == []
+
+
+def test_save_and_load_per_bucket(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest = IngestManifest(manifest_path, bucket_id=70)
+    manifest.record("a.json", "abc", "doc-a", language="de")
+    manifest.save()
+
+    assert IngestManifest.stored_bucket_id(manifest_path) == 70
+    assert IngestManifest.load(manifest_path, bucket_id=70).files["a.json"]["document_id"] == "doc-a"
+    assert IngestManifest.load(manifest_path, bucket_id=71).files == {}
+    assert IngestManifest.load(tmp_path / "missing.json").files == {}
+    assert IngestManifest.stored_bucket_id(tmp_path / "missing.json") is None
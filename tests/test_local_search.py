@@ -0,0 +1,64 @@
+import json
+
+from src.snl_poc.tools.local_search import BM25Index, format_hits, load_corpus, tokenize
+
+
+def make_document(file_name, title, body, language="en", meta_description=""):
+    return {
+        "file_name": file_name,
+        "url": f"https://www.itnb.ch/{language}/{file_name}",
+        "language": language,
+        "text": json.dumps({"title": title, "body": body}),
+        "fields": {"title": title, "meta_description": meta_description, "body": body},
+    }
+
+
+DOCUMENTS = [
+    make_document("cloud", "Sovereign Cloud", "Swiss hosted infrastructure as a service for regulated customers."),
+    make_document("finance", "Financial Services", "Banks and insurers run compliant workloads on our cloud."),
+    make_document("about", "About ITNB", "Our team builds sovereign AI and cloud platforms in Switzerland."),
+    make_document("cloud-de", "Souveräne Cloud", "Infrastruktur in der Schweiz für regulierte Kunden.", language="de"),
+]
+
+
+def test_tokenize_drops_stopwords_and_case():
+    assert tokenize("What is the Sovereign Cloud?") == ["sovereign", "cloud"]
+
+
+def test_title_match_outranks_body_match():
+    index = BM25Index().build(DOCUMENTS)
+    hits = index.search("sovereign cloud", k=3)
+    assert [hit["document"]["file_name"] for hit in hits][0] == "cloud"
+    assert hits[0]["score"] > hits[1]["score"]
+
+
+def test_search_respects_k_and_unknown_terms():
+    index = BM25Index().build(DOCUMENTS)
+    assert len(index.search("cloud", k=2)) == 2
+    assert index.search("quantum", k=2) == []
+
+
+def test_language_filter():
+    index = BM25Index().build(DOCUMENTS)
+    hits = index.search("cloud schweiz", k=5, language="de")
+    assert [hit["document"]["file_name"] for hit in hits] == ["cloud-de"]
+
+
+def test_empty_index():
+    assert BM25Index().build([]).search("cloud") == []
+
+
+def test_load_corpus_and_format_hits(tmp_path):
+    page = {"url": "https://www.itnb.ch/en/cloud", "title": "Sovereign Cloud",
+            "meta_description": "Swiss cloud", "sections": [{"heading": "Hosting", "text": "Data stays in Switzerland."}]}
+    (tmp_path / "cloud_extracted.json").write_text(json.dumps(page), encoding="utf-8")
+    (tmp_path / "broken_extracted.json").write_text("{not json", encoding="utf-8")
+
+    documents = load_corpus(tmp_path)
+    assert [doc["file_name"] for doc in documents] == ["cloud_extracted.json"]
+    assert documents[0]["language"] == "en"
+    assert "Data stays in Switzerland." in documents[0]["fields"]["body"]
+    assert "https://www.itnb.ch" not in documents[0]["fields"]["body"]
+
+    hits = BM25Index.from_directory(tmp_path).search("switzerland hosting")
+    assert "[PRIMARY_SOURCE: https://www.itnb.ch/en/cloud]" in format_hits(hits)
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.snl_poc.tools import resilience
+from src.snl_poc.tools.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, SearchCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure(RuntimeError("timeout"))
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure(RuntimeError("timeout"))
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    snapshot = breaker.snapshot()
+    assert snapshot["trips"] == 1 and snapshot["short_circuited"] == 1
+    assert snapshot["last_error"] == "timeout"
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_probe_success_closes_and_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.snapshot()["trips"] == 2
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_cache_fresh_stale_and_expired(clock):
+    cache = SearchCache(ttl=10, stale_ttl=100, negative_ttl=5)
+    assert cache.get("q") == (None, None)
+    cache.put("q", "result")
+    assert cache.get("q") == ("result", "fresh")
+    clock.now += 10
+    assert cache.get("q") == ("result", "stale")
+    clock.now += 90
+    assert cache.get("q") == (None, None)
+    assert cache.snapshot()["entries"] == 0
+
+
+def test_negative_entries_expire_quickly(clock):
+    cache = SearchCache(ttl=10, stale_ttl=100, negative_ttl=5)
+    cache.put("q", "", negative=True)
+    assert cache.get("q") == ("", "negative")
+    clock.now += 5
+    assert cache.get("q") == (None, None)
+
+
+def test_negative_result_keeps_servable_entry(clock):
+    cache = SearchCache(ttl=10, stale_ttl=100)
+    cache.put("q", "result")
+    clock.now += 20
+    cache.put("q", "", negative=True)
+    assert cache.get("q") == ("result", "stale")
+
+
+def test_cache_evicts_least_recently_used(clock):
+    cache = SearchCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") == (None, None)
+    assert cache.get("a") == ("1", "fresh")
+
+
+def test_single_refresh_per_key():
+    cache = SearchCache()
+    assert cache.start_refresh("q")
+    assert not cache.start_refresh("q")
+    cache.finish_refresh("q")
+    assert cache.start_refresh("q")
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from src.snl_poc.tools.vector_index import DenseVectorIndex, HashingEmbedder, chunk_documents, hnswlib
+
+
+class PrecomputedEmbedder:
+    """Feeds fixed vectors into DenseVectorIndex.build()."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.name = "synthetic"
+
+    def embed(self, texts):
+        return self.vectors[: len(texts)]
+
+
+def synthetic_index(tmp_path, n=500, dim=32, dtype="float32", with_hnsw=False):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    chunks = [{"chunk_id": i, "text": str(i), "language": "en"} for i in range(n)]
+    index = DenseVectorIndex.build(chunks, PrecomputedEmbedder(vectors), tmp_path, dtype=dtype, with_hnsw=with_hnsw)
+    queries = vectors[rng.integers(0, n, 20)] + 0.5 * rng.standard_normal((20, dim)).astype(np.float32)
+    return index, vectors, queries
+
+
+def brute_force(vectors, queries, k):
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(queries @ vectors.T), axis=1)[:, :k]
+
+
+@pytest.mark.parametrize("block_size", [65536, 64])
+def test_exact_search_matches_brute_force(tmp_path, block_size):
+    index, vectors, queries = synthetic_index(tmp_path)
+    index.block_size = block_size
+    indices, scores = index.search_vectors(queries, k=10, exact=True)
+    assert indices.shape == scores.shape == (20, 10)
+    np.testing.assert_array_equal(indices, brute_force(vectors, queries, 10))
+    assert np.all(np.diff(scores, axis=1) <= 0)
+
+
+def test_float16_index_keeps_top_hit(tmp_path):
+    index, vectors, queries = synthetic_index(tmp_path, dtype="float16")
+    assert index.vectors.dtype == np.float16
+    assert isinstance(index.vectors, np.memmap)
+    indices, _ = index.search_vectors(queries, k=1, exact=True)
+    np.testing.assert_array_equal(indices[:, 0], brute_force(vectors, queries, 1)[:, 0])
+
+
+@pytest.mark.skipif(hnswlib is None, reason="hnswlib is not installed")
+def test_hnsw_recall(tmp_path):
+    index, vectors, queries = synthetic_index(tmp_path, n=2000, with_hnsw=True)
+    assert index.hnsw_index is not None
+    approx, _ = index.search_vectors(queries, k=10)
+    exact, _ = index.search_vectors(queries, k=10, exact=True)
+    recall = np.mean([len(set(a) & set(e)) / 10 for a, e in zip(approx, exact)])
+    assert recall >= 0.9
+
+
+def test_search_filters_language_and_checks_embedder(tmp_path):
+    documents = [
+        {"file_name": "cloud", "url": "u1", "language": "en",
+         "fields": {"title": "Sovereign Cloud", "body": "Swiss hosted cloud infrastructure"}},
+        {"file_name": "cloud-de", "url": "u2", "language": "de",
+         "fields": {"title": "Souveräne Cloud", "body": "Cloud Infrastruktur in der Schweiz"}},
+    ]
+    embedder = HashingEmbedder(dim=64)
+    index = DenseVectorIndex.build(chunk_documents(documents), embedder, tmp_path)
+
+    hits = index.search(["cloud infrastruktur"], embedder, k=2, language="de")[0]
+    assert [hit["chunk"]["file_name"] for hit in hits] == ["cloud-de"]
+    with pytest.raises(ValueError):
+        index.search(["cloud"], HashingEmbedder(dim=32))
+
+
+def test_chunk_documents_overlap():
+    documents = [{"file_name": "f", "url": "u", "language": "en", "fields": {"title": "T", "body": "x" * 250}}]
+    chunks = chunk_documents(documents, chunk_size=100, overlap=20)
+    assert [chunk["chunk_id"] for chunk in chunks] == [0, 1, 2]
+    assert all(chunk["text"].startswith("T: ") for chunk in chunks)